@@ -0,0 +1,68 @@
+# benchmarks/bench_assignment.py
+"""
+Patient-to-doctor assignment: batch assignment and rebalancing.
+
+A roster of checked-in doctors takes a large batch of patients with
+``assign_many``; then one more doctor joins and ``rebalance`` moves
+patients onto them. Both steps are timed, and after each the loads are
+checked to be within one of each other, failing the run otherwise. A
+small case, three doctors at 3/3/3 joined by a fourth, is checked first:
+it must end at 3/2/2/2 after two moves.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_assignment [patients] [doctors]
+"""
+import sys
+import time
+from datetime import date
+
+from core.assignment import AssignmentEngine
+from models.staff import Staff
+
+
+def doctors(count):
+    roster = [Staff(f"Doctor {i}", date(1970, 1, 1), "Doctor") for i in range(count)]
+    for doctor in roster:
+        doctor.check_in()
+    return roster
+
+
+def check_even(engine, expected_moves=None, moves=None):
+    """Fail if loads differ by more than one or the move count is not the expected one."""
+    loads = engine.loads().values()
+    if max(loads) - min(loads) > 1:
+        raise SystemExit(f"uneven loads after rebalance: {sorted(loads)}")
+    if expected_moves is not None and len(moves) != expected_moves:
+        raise SystemExit(f"expected {expected_moves} moves, got {len(moves)}")
+
+
+def small_case():
+    roster = doctors(4)
+    engine = AssignmentEngine(roster[:3])
+    engine.assign_many(range(9))
+    engine.add_doctor(roster[3])
+    check_even(engine, 2, engine.rebalance())
+
+
+def main(patients=200_000, count=50):
+    small_case()
+    roster = doctors(count + 1)
+    engine = AssignmentEngine(roster[:count])
+    start = time.perf_counter()
+    engine.assign_many(range(patients))
+    assigned = time.perf_counter() - start
+    check_even(engine)
+    engine.add_doctor(roster[count])
+    start = time.perf_counter()
+    moves = engine.rebalance()
+    rebalanced = time.perf_counter() - start
+    check_even(engine)
+    print(f"{patients:,} patients, {count} doctors")
+    print(f"assign_many:          {assigned * 1000:9.1f} ms")
+    print(f"rebalance (+1 doctor): {rebalanced * 1000:8.1f} ms, {len(moves):,} patients moved")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
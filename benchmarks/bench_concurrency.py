@@ -0,0 +1,167 @@
+# benchmarks/bench_concurrency.py
+"""
+Stress test for a hospital driven from many threads at once.
+
+Every thread plays an admission terminal: it admits patients into random
+departments, checks random patients in and out (including patients held
+by two departments), discharges some, reads the reporting totals, runs
+record, name and role searches (now and then dropping the hospital-wide
+indexes so the next search rebuilds them) and adds and removes a staffed
+department of its own. The thread switch interval is shortened to make
+races likely.
+
+Afterwards the hospital is checked against a recount from scratch:
+hospital totals, per-department checked-in counters, open check-in
+intervals and the record and role indexes must all agree. A lock-order
+mistake shows up as the run never finishing. The run is repeated for a growing number of
+threads to show throughput; with the GIL, threads interleave rather than
+run in parallel, so the point is that throughput holds up while
+correctness is kept. ``--unsafe`` runs without ``enable_concurrency`` to
+show the counters drifting.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_concurrency [ops_per_thread] [--unsafe]
+"""
+import random
+import sys
+import threading
+import time
+from datetime import date
+
+from core.department import Department
+from core.hospital import Hospital
+from models.patient import Patient
+from models.staff import Staff
+
+DEPARTMENTS = 8
+SEED_PATIENTS = 200
+DOCTORS = 3
+
+
+def build(concurrent):
+    hospital = Hospital("Stress", "Nowhere")
+    if concurrent:
+        hospital.enable_concurrency()
+    for d in range(DEPARTMENTS):
+        dept = Department(f"Dept {d}")
+        hospital.add_department(dept)
+        dept.add_patients(Patient(f"Seed {d}-{i}", date(1980, 1, 1), "Admitted") for i in range(SEED_PATIENTS))
+        dept.add_staff_members(Staff(f"Doctor {d}-{i}", date(1970, 1, 1), "Doctor") for i in range(DOCTORS))
+    # Patients shared by two departments exercise cross-department check-ins.
+    departments = hospital.departments
+    for i in range(DEPARTMENTS):
+        for patient in list(departments[i].patients)[:20]:
+            departments[(i + 1) % DEPARTMENTS].add_patient(patient)
+    return hospital
+
+
+def terminal(hospital, ops, seed, errors):
+    rng = random.Random(seed)
+    departments = hospital.departments
+    try:
+        for i in range(ops):
+            dept = rng.choice(departments)
+            roll = rng.random()
+            if roll < 0.15:
+                dept.add_patient(Patient(f"T{seed}-{i}", date(1990, 1, 1), "Walk-in"))
+            elif roll < 0.75:
+                # Iterating gives a consistent copy even while other threads add or discharge.
+                patients = list(dept.patients)
+                if not patients:
+                    continue
+                patient = rng.choice(patients)
+                if roll >= 0.70:
+                    dept.discharge_patient(patient.person_id)
+                elif rng.random() < 0.5:
+                    patient.check_in()
+                else:
+                    patient.check_out()
+            elif roll < 0.96:
+                hospital.get_total_patients()
+                hospital.get_checked_in_patients()
+                hospital.totals()
+            elif roll < 0.99:
+                if rng.random() < 0.2:
+                    # Forces the next searches to rebuild the indexes while others churn.
+                    with hospital._rw.write_lock(), hospital._shared:
+                        hospital._record_index = None
+                        hospital._roles = None
+                len(hospital.record_index)
+                hospital.search_records("walk-in")
+                hospital.search_names("seed", 5)
+                hospital.staff_by_role("doctor", checked_in=False)
+            else:
+                name = f"Pop-up {seed}-{i}"
+                dept = Department(name)
+                dept.add_patient(Patient(f"P{seed}-{i}", date(1990, 1, 1), "Pop-up walk-in"))
+                dept.add_staff(Staff(f"D{seed}-{i}", date(1970, 1, 1), "Doctor"))
+                hospital.add_department(dept)
+                hospital.remove_department(name)
+    except Exception as exc:  # reported by the main thread
+        errors.append(exc)
+
+
+def verify(hospital):
+    """Return a list of invariant violations found by recounting from scratch."""
+    problems = []
+    patients = staff = checked_in = 0
+    patient_ids, doctor_ids = set(), set()
+    for dept in hospital.departments:
+        patient_ids.update(p.person_id for p in dept.patients)
+        doctor_ids.update(s.person_id for s in dept.staff)
+        actual = sum(1 for p in dept.patients if p.is_active())
+        if actual != dept.get_checked_in_patient_count():
+            problems.append(f"{dept.name}: counter {dept.get_checked_in_patient_count()} != actual {actual}")
+        open_intervals = len(dept.patient_history._open)
+        if open_intervals != actual:
+            problems.append(f"{dept.name}: {open_intervals} open intervals != {actual} checked in")
+        patients += len(dept.patients)
+        staff += len(dept.staff)
+        checked_in += actual
+    expected = (patients, staff, checked_in, 0)
+    if hospital.totals() != expected:
+        problems.append(f"hospital totals {hospital.totals()} != recount {expected}")
+    indexed = hospital.record_index
+    if len(indexed) != len(patient_ids) or not all(pid in indexed for pid in patient_ids):
+        problems.append(f"record index holds {len(indexed)} patients != {len(patient_ids)} in departments")
+    doctors = {s.person_id for s in hospital.staff_by_role("doctor")}
+    if doctors != doctor_ids:
+        problems.append(f"role index lists {len(doctors)} doctors != {len(doctor_ids)} in departments")
+    return problems
+
+
+def run(threads, ops, concurrent):
+    hospital = build(concurrent)
+    errors = []
+    workers = [
+        threading.Thread(target=terminal, args=(hospital, ops, seed, errors)) for seed in range(threads)
+    ]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    return threads * ops / elapsed, errors, verify(hospital)
+
+
+def main(ops=20_000, concurrent=True):
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        print(f"operations per thread: {ops:,}, concurrency {'enabled' if concurrent else 'DISABLED'}")
+        for threads in (1, 2, 4, 8, 16):
+            rate, errors, problems = run(threads, ops, concurrent)
+            status = "ok" if not errors and not problems else f"{len(errors)} errors, {len(problems)} violations"
+            print(f"{threads:3d} threads: {rate:10,.0f} ops/s  {status}")
+            for problem in (problems + [repr(e) for e in errors])[:5]:
+                print(f"      {problem}")
+    finally:
+        sys.setswitchinterval(interval)
+
+
+if __name__ == "__main__":
+    unsafe = "--unsafe" in sys.argv
+    args = [int(a) for a in sys.argv[1:] if a != "--unsafe"]
+    main(*args[:1], concurrent=not unsafe)
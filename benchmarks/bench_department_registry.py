@@ -0,0 +1,75 @@
+# benchmarks/bench_department_registry.py
+"""
+Scaling benchmark for the hospital department registry.
+
+For a range of department counts, measure the average cost of
+``Hospital.find_department``, ``add_department`` and ``remove_department``
+and compare lookups against a plain linear scan over a list, which is how
+the registry used to work.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_department_registry
+"""
+import contextlib
+import io
+import time
+
+from core.hospital import Hospital
+from core.department import Department
+
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+LOOKUPS = 10_000
+
+
+def _per_op_ns(func, repeat):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) / repeat * 1e9
+
+
+def bench(size):
+    """Return per-operation timings (ns) for a registry of ``size`` departments."""
+    names = [f"Unit-{i:06d}" for i in range(size)]
+    hospital = Hospital("Bench General", "Nowhere")
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in names:
+            hospital.add_department(Department(name))
+
+    probes = [names[(i * 7919) % size] for i in range(LOOKUPS)]
+    linear = list(hospital.departments)
+
+    def indexed_find():
+        for name in probes:
+            hospital.find_department(name)
+
+    def linear_find():
+        for name in probes[:1_000]:
+            next(d for d in linear if d.name == name)
+
+    def churn():
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(1_000):
+                name = f"Churn-{i}"
+                hospital.add_department(Department(name))
+                hospital.remove_department(name)
+
+    return {
+        "find": _per_op_ns(indexed_find, LOOKUPS),
+        "linear_find": _per_op_ns(linear_find, 1_000),
+        "add+remove": _per_op_ns(churn, 1_000),
+    }
+
+
+def main():
+    print(f"{'departments':>12} {'find (ns)':>12} {'add+remove (ns)':>16} {'linear scan (ns)':>17}")
+    for size in SIZES:
+        result = bench(size)
+        print(
+            f"{size:>12,} {result['find']:>12.0f} {result['add+remove']:>16.0f} "
+            f"{result['linear_find']:>17.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
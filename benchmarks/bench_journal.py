@@ -0,0 +1,68 @@
+# benchmarks/bench_journal.py
+"""
+Throughput of the check-in/check-out journal.
+
+Several threads each journal events and wait for them to be durable.
+Group commit (``EventJournal``) is compared with a naive journal that
+writes and fsyncs every event on its own.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_journal [threads] [events_per_thread]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from storage.journal import EventJournal
+
+
+class FsyncPerEventJournal:
+    """Baseline: one write + fsync per event, serialized by a lock."""
+
+    def __init__(self, path):
+        self._file = open(path, "ab")
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def append(self, person_id, active, wait=True):
+        with self._lock:
+            self._seq += 1
+            self._file.write(f"{self._seq} {time.time():.6f} {person_id} {'in' if active else 'out'}\n".encode())
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+
+def run(journal, threads, events):
+    def worker(offset):
+        for i in range(events):
+            journal.append(offset * events + i, i % 2 == 0, wait=True)
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    journal.close()
+    return threads * events / elapsed
+
+
+def main(threads=8, events=500):
+    with tempfile.TemporaryDirectory() as tmp:
+        naive = run(FsyncPerEventJournal(os.path.join(tmp, "naive.log")), threads, events)
+        grouped = run(EventJournal(os.path.join(tmp, "group.log")), threads, events)
+    print(f"threads: {threads}, durable events per thread: {events}")
+    print(f"fsync per event: {naive:10,.0f} events/s")
+    print(f"group commit:    {grouped:10,.0f} events/s ({grouped / naive:.1f}x)")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
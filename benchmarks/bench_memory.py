@@ -0,0 +1,62 @@
+# benchmarks/bench_memory.py
+"""
+Memory benchmark: bytes per resident Patient.
+
+Compares the slotted ``models.Patient`` against ``LegacyPatient``, a copy
+of the previous dict-backed layout that stored ``status`` as a string and
+kept department memberships in a per-instance list.
+Names, dates and record text are created before measuring, so the
+numbers reflect the per-object overhead only.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_memory [count]
+"""
+import sys
+import tracemalloc
+from datetime import date
+
+from models.patient import Patient
+from models.person import Person
+
+
+class LegacyPatient:
+    """Patient layout before __slots__: per-instance __dict__, string status."""
+
+    def __init__(self, name, date_of_birth, medical_record):
+        self.person_id = next(Person._id_counter)
+        self.name = name
+        self.date_of_birth = date_of_birth
+        self.medical_record = medical_record
+        self._memberships = []
+        self.status = "out"
+
+
+def bytes_per_object(factory, names, dobs, record):
+    """Return the traced allocation per object created by ``factory``."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory(name, dob, record) for name, dob in zip(names, dobs)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list holding the objects is not part of the per-object cost.
+    container = sys.getsizeof(objects)
+    return (after - before - container) / len(objects)
+
+
+def main(count=200_000):
+    names = [f"Patient {i}" for i in range(count)]
+    dobs = [date(1950 + i % 70, 1 + i % 12, 1 + i % 28) for i in range(count)]
+    record = "Initial assessment"
+
+    legacy = bytes_per_object(LegacyPatient, names, dobs, record)
+    slotted = bytes_per_object(Patient, names, dobs, record)
+
+    print(f"patients measured:     {count:,}")
+    print(f"before (dict, str):    {legacy:7.1f} bytes/patient")
+    print(f"after (slots, Status): {slotted:7.1f} bytes/patient")
+    print(f"saving:                {legacy - slotted:7.1f} bytes/patient ({1 - slotted / legacy:.0%})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
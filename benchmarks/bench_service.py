@@ -0,0 +1,160 @@
+# benchmarks/bench_service.py
+"""
+Throughput of the JSON service under many concurrent connections.
+
+The service runs in a child process on a free loopback port, in front
+of a hospital with 4 departments of 2,000 patients and 20 doctors each.
+A fixed number of requests (hospital totals, name searches, check-ins
+and check-outs) is spread over a growing number of keep-alive
+connections, first sending one request at a time and then pipelining
+32 requests per round trip.
+
+Finally one client pipelines a few thousand large requests and stops
+reading for a while, to show that backpressure keeps the server's
+memory flat instead of buffering every answer.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_service [total_requests]
+"""
+import asyncio
+import multiprocessing
+import random
+import sys
+import time
+from datetime import date
+
+from core.department import Department
+from core.hospital import Hospital
+from models.patient import Patient
+from models.staff import Staff
+from service import HospitalAPI, HospitalServer, ServiceClient
+
+DEPARTMENTS = 4
+PATIENTS = 2000
+DOCTORS = 20
+CONNECTIONS = (1, 10, 100, 1000, 4000)
+FIRST = ("Ada", "Ben", "Cleo", "Dev", "Eli", "Fay", "Gus", "Hana", "Ivo", "Jun", "Kai", "Lena", "Milo", "Nora")
+LAST = ("Abbott", "Barnes", "Castro", "Dalton", "Ellis", "Fischer", "Garcia", "Hughes", "Ibsen", "Jensen",
+        "Kowalski", "Larsen", "Moreau", "Nakamura", "Okafor", "Petrov", "Quinn", "Rossi", "Sato", "Tanaka")
+
+
+def name(i):
+    return f"{FIRST[i % len(FIRST)]} {LAST[i // len(FIRST) % len(LAST)]}-{i // (len(FIRST) * len(LAST))}"
+
+
+def build():
+    hospital = Hospital("Bench", "Nowhere")
+    for d in range(DEPARTMENTS):
+        dept = Department(f"Dept {d}")
+        hospital.add_department(dept)
+        dept.add_patients(Patient(name(d * PATIENTS + i), date(1980, 1, 1), "Admitted") for i in range(PATIENTS))
+        dept.add_staff_members(Staff(f"Doctor {d}-{i}", date(1970, 1, 1), "Doctor") for i in range(DOCTORS))
+    return hospital
+
+
+def serve(conn):
+    """Child process: build the hospital, serve it and report the bound port."""
+    async def run():
+        server = HospitalServer(HospitalAPI(build()), port=0, idle_timeout=None)
+        await server.start()
+        conn.send(server.address[1])
+        await server.serve_forever()
+
+    asyncio.run(run())
+
+
+def workload(rng, ids, count):
+    requests = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.3:
+            requests.append(("hospital_info", {}))
+        elif roll < 0.35:
+            requests.append(("search_names", {"query": name(rng.randrange(DEPARTMENTS * PATIENTS))[:-2], "k": 5}))
+        else:
+            d = rng.randrange(DEPARTMENTS)
+            op = "check_in" if roll < 0.675 else "check_out"
+            requests.append((op, {"department": f"Dept {d}", "person_id": rng.choice(ids[d])}))
+    return requests
+
+
+async def terminal(port, requests, depth):
+    client = await ServiceClient.connect(port=port)
+    try:
+        for i in range(0, len(requests), depth):
+            for result in await client.pipeline(requests[i:i + depth]):
+                if isinstance(result, Exception):
+                    raise result
+    finally:
+        await client.close()
+
+
+async def run(port, ids, connections, total, depth):
+    rng = random.Random(connections * 100 + depth)
+    per_connection = max(1, total // connections)
+    batches = [workload(rng, ids, per_connection) for _ in range(connections)]
+    start = time.perf_counter()
+    await asyncio.gather(*(terminal(port, batch, depth) for batch in batches))
+    return connections * per_connection / (time.perf_counter() - start)
+
+
+def rss_kib(pid):
+    """Resident memory of a process in KiB, or None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+async def stalled_client(port, pid, requests=3000):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port, limit=1 << 24)
+    line = b'{"id":0,"op":"department_info","params":{"department":"Dept 0","limit":100}}\n'
+    before = rss_kib(pid)
+    writer.write(line * requests)
+    await asyncio.sleep(1.0)
+    during = rss_kib(pid)
+    received = 0
+    for _ in range(requests):
+        received += len(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return received, before, during
+
+
+async def bench(port, pid, total):
+    ids = [list(range(1 + d * (PATIENTS + DOCTORS), 1 + d * (PATIENTS + DOCTORS) + PATIENTS))
+           for d in range(DEPARTMENTS)]
+    print(f"{total:,} requests per run")
+    print(f"{'connections':>12} {'1 in flight':>14} {'32 pipelined':>14}")
+    for connections in CONNECTIONS:
+        single = await run(port, ids, connections, total, 1)
+        pipelined = await run(port, ids, connections, total, 32)
+        print(f"{connections:12,d} {single:10,.0f} r/s {pipelined:10,.0f} r/s")
+    received, before, during = await stalled_client(port, pid)
+    print(f"\nstalled client: {received / 2**20:.0f} MiB of answers pipelined", end="")
+    if before is not None:
+        print(f"; server RSS {before / 1024:.0f} MiB before, {during / 1024:.0f} MiB while not reading")
+    else:
+        print()
+
+
+def main(total=40_000):
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child,), daemon=True)
+    server.start()
+    try:
+        port = parent.recv()
+        asyncio.run(bench(port, server.pid, total))
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:2]]
+    main(*args)
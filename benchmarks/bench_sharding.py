@@ -0,0 +1,92 @@
+# benchmarks/bench_sharding.py
+"""
+Reporting throughput of a process-sharded hospital against a plain one.
+
+16 departments of 25,000 patients each are built once and copied into a
+plain ``Hospital`` and into ``ShardedHospital``s with a growing number
+of shards. Each round runs the CPU-heavy reporting mix: an age
+histogram, a full-text record search and a type-ahead name search. One
+warm-up round builds the indexes first.
+
+Scaling is bounded by the number of cores: with one shard per core the
+shards answer in parallel and rounds get faster almost linearly, beyond
+that they only take turns. The core count is printed with the results.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_sharding [patients_per_department] [rounds]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date
+
+from core.department import Department
+from core.hospital import Hospital
+from core.sharding import ShardedHospital
+from models.patient import Patient
+
+DEPARTMENTS = 16
+FIRST = ("Ada", "Ben", "Cleo", "Dev", "Eli", "Fay", "Gus", "Hana", "Ivo", "Jun", "Kai", "Lena", "Milo", "Nora")
+LAST = ("Abbott", "Barnes", "Castro", "Dalton", "Ellis", "Fischer", "Garcia", "Hughes", "Ibsen", "Jensen")
+WORDS = ("asthma", "diabetes", "fracture", "influenza", "migraine", "hypertension", "allergy", "anemia")
+
+
+def build(patients):
+    rng = random.Random(7)
+    departments = []
+    for d in range(DEPARTMENTS):
+        people = [
+            Patient(
+                f"{rng.choice(FIRST)} {rng.choice(LAST)}",
+                date(rng.randint(1930, 2020), rng.randint(1, 12), rng.randint(1, 28)),
+                " ".join(rng.sample(WORDS, 2)),
+            )
+            for _ in range(patients)
+        ]
+        departments.append((f"Dept {d}", people))
+    return departments
+
+
+def fill(hospital, departments):
+    for name, people in departments:
+        dept = Department(name)
+        dept.add_patients(people)
+        hospital.add_department(dept)
+    return hospital
+
+
+def report(hospital):
+    hospital.age_histogram(10, date(2025, 1, 1))
+    hospital.search_records("diab* -asthma")
+    hospital.search_names("cleo garc", 10)
+
+
+def timed(hospital, rounds):
+    report(hospital)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        report(hospital)
+    return (time.perf_counter() - start) / rounds
+
+
+def main(patients=25_000, rounds=5):
+    cores = os.cpu_count() or 1
+    departments = build(patients)
+    print(f"{DEPARTMENTS} departments x {patients:,} patients, {cores} core(s)")
+    baseline = timed(fill(Hospital("Plain", "Nowhere"), departments), rounds)
+    print(f"{'plain Hospital':>16}: {baseline * 1000:8.1f} ms/round")
+    for shards in sorted({1, 2, 4, 8, cores}):
+        with ShardedHospital("Sharded", "Nowhere", shards=shards) as hospital:
+            start = time.perf_counter()
+            fill(hospital, departments)
+            load = time.perf_counter() - start
+            elapsed = timed(hospital, rounds)
+        print(f"{shards:>9} shard{'s' if shards > 1 else ' '}: {elapsed * 1000:8.1f} ms/round "
+              f"({baseline / elapsed:4.1f}x)  loaded in {load:.1f}s")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,90 @@
+# benchmarks/bench_snapshot.py
+"""
+Cold-start time: SQLite load versus memory-mapped snapshot.
+
+A hospital with several departments is saved both ways, then reloaded.
+The snapshot is timed twice: opening it (counters available, nothing
+decoded) and materializing every department. Every tenth patient is
+checked in, and both reloads are checked to report them in the
+checked-in counters and in the occupancy history alike.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_snapshot [patients_per_department] [departments]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import date
+
+from core.occupancy import timestamp
+
+from core.department import Department
+from core.hospital import Hospital
+from models.patient import Patient
+from storage.snapshot import Snapshot, write_snapshot
+from storage.sqlite_store import SQLiteStore
+
+
+def build(patients, departments):
+    hospital = Hospital("Bench", "Nowhere")
+    for d in range(departments):
+        dept = Department(f"Dept {d}", columnar=d % 2 == 1)
+        dept.add_patients(
+            Patient(f"Patient {d}-{i}", date(1950 + i % 70, 1 + i % 12, 1 + i % 28), "Admitted")
+            for i in range(patients)
+        )
+        hospital.add_departments([dept])
+        for patient in dept.patients[::10]:
+            patient.check_in()
+    return hospital
+
+
+def check_occupancy(hospital, source):
+    """Fail if a department's occupancy history disagrees with its checked-in counter."""
+    now = timestamp()
+    for dept in hospital.departments:
+        present = dept.occupancy_at(now)
+        if present != dept.get_checked_in_patient_count():
+            raise SystemExit(f"{source}: {dept.name} has {dept.get_checked_in_patient_count()} "
+                             f"checked in but occupancy {present}")
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(patients=50_000, departments=4):
+    with contextlib.redirect_stdout(io.StringIO()):
+        hospital = build(patients, departments)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "hospital.db")
+        snap_path = os.path.join(tmp, "hospital.snap")
+        with SQLiteStore(db_path) as store:
+            store.save(hospital)
+        size = write_snapshot(hospital, snap_path)
+
+        with SQLiteStore(db_path) as store:
+            from_sqlite, sqlite_load = timed(store.load)
+        check_occupancy(from_sqlite, "sqlite")
+
+        with Snapshot(snap_path) as snapshot:
+            loaded, snap_open = timed(snapshot.load)
+            total = loaded.get_total_patients()
+            _, snap_full = timed(lambda: [len(list(d.patients)) for d in loaded.departments])
+            check_occupancy(loaded, "snapshot")
+
+    print(f"departments: {departments}, patients: {total:,}, snapshot size: {size / 1e6:.1f} MB")
+    print(f"sqlite load:          {sqlite_load * 1000:9.1f} ms")
+    print(f"snapshot open:        {snap_open * 1000:9.1f} ms ({sqlite_load / snap_open:,.0f}x)")
+    print(f"snapshot materialize: {snap_full * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -1,3 +1,6 @@
 from .hospital import Hospital
-from .department import Department
-
+from .department import Department, MemberIndex
+from .network import HospitalNetwork, MasterPatientIndex
+from .patient_table import PatientTable, PatientView
+from .sharding import RemoteDepartment, ShardedHospital
+from .events import ConsoleSink, Event, EventBus, LogFileSink, RingBufferSink, default_bus
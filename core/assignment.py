@@ -0,0 +1,313 @@
+# core/assignment.py
+"""
+Load-balanced assignment of a department's patients to its doctors.
+
+Doctors sit in a min-heap keyed on ``(load, seq)``, where load is the
+number of patients currently assigned to them, so the least busy doctor
+is always on top. Assigning a patient replaces the top entry with one
+whose load is one higher, O(log d) for d doctors. Releasing a patient or
+taking a doctor off the roster marks their old heap entry dead and, for
+a release, pushes a fresh one (lazy deletion); dead entries are skipped
+when they surface and the heap is rebuilt once they are the majority.
+
+Only doctors who are checked in are on the roster, and with
+``respect_schedule`` a doctor with a schedule must also be on shift at
+the time of assignment. Shift boundaries are not events, so that check
+happens when a doctor reaches the top of the heap: off-shift doctors are
+set aside for that call and pushed back afterwards.
+
+Batch operations check eligibility once per doctor instead of once per
+patient and work on a heap of the eligible doctors only: ``assign_many``
+spreads thousands of patients in O(d + p log d), and ``rebalance`` moves
+patients off off-shift and overloaded doctors until every eligible
+doctor's load is within one of the others.
+"""
+from heapq import heapify, heappop, heappush, heapreplace
+
+_LOAD, _SEQ, _ID, _LIVE = range(4)
+
+
+class AssignmentEngine:
+    """
+    Tracks which doctor each patient is assigned to and every doctor's load.
+
+    Attributes:
+        respect_schedule (bool): Skip doctors whose schedule has them off shift.
+    """
+
+    def __init__(self, doctors=(), respect_schedule=True):
+        """
+        Initialize an engine, optionally with a roster of doctors.
+
+        Args:
+            doctors (iterable[Staff]): Checked-in doctors to put on the roster.
+            respect_schedule (bool): Only assign to doctors on shift, if they have a schedule.
+        """
+        self.respect_schedule = respect_schedule
+        self._heap = []
+        self._entries = {}
+        self._doctors = {}
+        self._patients = {}
+        self._assigned = {}
+        self._seq = 0
+        for doctor in doctors:
+            self.add_doctor(doctor)
+
+    def __len__(self):
+        """Return the number of assigned patients."""
+        return len(self._assigned)
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"AssignmentEngine(doctors={len(self._doctors)}, assigned={len(self._assigned)})"
+
+    def doctor_of(self, person_id):
+        """
+        Return the doctor a patient is assigned to.
+
+        Args:
+            person_id (int): ID of the patient.
+
+        Returns:
+            Staff | None: The doctor, or None if the patient is unassigned.
+        """
+        doctor_id = self._assigned.get(person_id)
+        return None if doctor_id is None else self._doctors[doctor_id]
+
+    def patients_of(self, doctor):
+        """
+        Return the IDs of the patients assigned to a doctor.
+
+        Args:
+            doctor (Staff): The doctor.
+
+        Returns:
+            list[int]: Patient IDs, in no particular order.
+        """
+        return list(self._patients.get(doctor.person_id, ()))
+
+    def loads(self):
+        """
+        Return every rostered doctor's load.
+
+        Returns:
+            dict[int, int]: Number of assigned patients per doctor ID.
+        """
+        return {doctor_id: len(patients) for doctor_id, patients in self._patients.items()}
+
+    def is_eligible(self, doctor, when=None):
+        """
+        Check whether a doctor can take patients right now.
+
+        Args:
+            doctor (Staff): The doctor.
+            when (float | datetime | None): Time of assignment; defaults to now.
+
+        Returns:
+            bool: True if checked in and, when schedules are respected, on
+                shift or without a schedule.
+        """
+        if not doctor.is_active():
+            return False
+        if self.respect_schedule and doctor.schedule is not None:
+            return doctor.is_on_shift(when)
+        return True
+
+    def add_doctor(self, doctor):
+        """
+        Put a doctor on the roster, e.g. after they checked in.
+
+        Args:
+            doctor (Staff): The doctor; ignored if already rostered.
+        """
+        if doctor.person_id in self._doctors:
+            return
+        self._doctors[doctor.person_id] = doctor
+        self._patients[doctor.person_id] = set()
+        self._push(doctor.person_id, 0)
+
+    def remove_doctor(self, doctor, when=None):
+        """
+        Take a doctor off the roster and hand their patients to the others.
+
+        Args:
+            doctor (Staff): The doctor, e.g. after they checked out.
+            when (float | datetime | None): Time of reassignment; defaults to now.
+
+        Returns:
+            list[int]: IDs of the doctor's patients that no other doctor could take.
+        """
+        doctor_id = doctor.person_id
+        if doctor_id not in self._doctors:
+            return []
+        del self._doctors[doctor_id]
+        self._entries.pop(doctor_id)[_LIVE] = False
+        orphans = self._patients.pop(doctor_id)
+        for person_id in orphans:
+            del self._assigned[person_id]
+        self._compact()
+        self.assign_many(orphans, when)
+        return [person_id for person_id in orphans if person_id not in self._assigned]
+
+    def assign(self, person_id, when=None):
+        """
+        Assign a patient to the least loaded eligible doctor.
+
+        Args:
+            person_id (int): ID of the patient.
+            when (float | datetime | None): Time of assignment; defaults to now.
+
+        Returns:
+            Staff | None: The patient's doctor (the existing one if already
+                assigned), or None if no doctor is eligible.
+        """
+        doctor_id = self._assigned.get(person_id)
+        if doctor_id is not None:
+            return self._doctors[doctor_id]
+        heap = self._heap
+        set_aside = []
+        chosen = None
+        while heap:
+            entry = heap[0]
+            if not entry[_LIVE]:
+                heappop(heap)
+            elif self.is_eligible(self._doctors[entry[_ID]], when):
+                chosen = entry
+                break
+            else:
+                set_aside.append(heappop(heap))
+        if chosen is not None:
+            self._link(person_id, chosen[_ID])
+            heapreplace(heap, self._entry(chosen[_ID], chosen[_LOAD] + 1, chosen[_SEQ]))
+        for entry in set_aside:
+            heappush(heap, entry)
+        return None if chosen is None else self._doctors[chosen[_ID]]
+
+    def release(self, person_id):
+        """
+        Unassign a patient, e.g. after they checked out or left the department.
+
+        Args:
+            person_id (int): ID of the patient.
+
+        Returns:
+            bool: True if the patient was assigned.
+        """
+        doctor_id = self._assigned.pop(person_id, None)
+        if doctor_id is None:
+            return False
+        patients = self._patients[doctor_id]
+        patients.discard(person_id)
+        old = self._entries[doctor_id]
+        old[_LIVE] = False
+        self._push(doctor_id, len(patients), old[_SEQ])
+        self._compact()
+        return True
+
+    def assign_many(self, person_ids, when=None):
+        """
+        Assign many patients at once, checking each doctor's eligibility only once.
+
+        Patients already assigned keep their doctor.
+
+        Args:
+            person_ids (iterable[int]): IDs of the patients.
+            when (float | datetime | None): Time of assignment; defaults to now.
+
+        Returns:
+            int: Number of patients newly assigned.
+        """
+        eligible = self._eligible_entries(when)
+        if not eligible:
+            return 0
+        heapify(eligible)
+        assigned = 0
+        for person_id in person_ids:
+            if person_id in self._assigned:
+                continue
+            top = eligible[0]
+            self._link(person_id, top[_ID])
+            heapreplace(eligible, [top[_LOAD] + 1, top[_SEQ], top[_ID], True])
+            assigned += 1
+        if assigned:
+            self._rebuild(eligible)
+        return assigned
+
+    def rebalance(self, when=None):
+        """
+        Even out loads across the eligible doctors.
+
+        Patients of rostered doctors who are off shift, and patients beyond
+        the fair share of overloaded doctors, are moved to the least loaded
+        eligible doctors, leaving every eligible load within one of the others.
+
+        Args:
+            when (float | datetime | None): Time of reassignment; defaults to now.
+
+        Returns:
+            list[tuple[int, int, int]]: (patient ID, old doctor ID, new doctor ID) per move.
+        """
+        eligible = self._eligible_entries(when)
+        if not eligible:
+            return []
+        # Each eligible doctor keeps floor(n / d) patients; the remainder goes
+        # one each to the most loaded ones, so they give up the fewest patients.
+        share, extra = divmod(len(self._assigned), len(eligible))
+        heaviest = sorted(eligible, key=lambda entry: (-entry[_LOAD], entry[_SEQ]))
+        targets = {entry[_ID]: share + (i < extra) for i, entry in enumerate(heaviest)}
+        movable = []
+        for doctor_id, patients in self._patients.items():
+            excess = len(patients) - targets.get(doctor_id, 0)
+            for _ in range(max(0, excess)):
+                movable.append((patients.pop(), doctor_id))
+        for entry in eligible:
+            entry[_LOAD] = len(self._patients[entry[_ID]])
+        heapify(eligible)
+        moves = []
+        for person_id, old_id in movable:
+            top = eligible[0]
+            self._assigned[person_id] = top[_ID]
+            self._patients[top[_ID]].add(person_id)
+            heapreplace(eligible, [top[_LOAD] + 1, top[_SEQ], top[_ID], True])
+            if top[_ID] != old_id:
+                moves.append((person_id, old_id, top[_ID]))
+        self._rebuild(eligible)
+        return moves
+
+    def _eligible_entries(self, when):
+        """Return fresh copies of the live heap entries of eligible doctors."""
+        return [
+            [len(self._patients[doctor_id]), entry[_SEQ], doctor_id, True]
+            for doctor_id, entry in self._entries.items()
+            if self.is_eligible(self._doctors[doctor_id], when)
+        ]
+
+    def _rebuild(self, eligible):
+        """Replace the heap with the updated eligible entries plus every other doctor's."""
+        for entry in eligible:
+            self._entries[entry[_ID]] = entry
+        for doctor_id, entry in self._entries.items():
+            entry[_LOAD] = len(self._patients[doctor_id])
+        self._heap = list(self._entries.values())
+        heapify(self._heap)
+
+    def _link(self, person_id, doctor_id):
+        self._assigned[person_id] = doctor_id
+        self._patients[doctor_id].add(person_id)
+
+    def _entry(self, doctor_id, load, seq):
+        entry = [load, seq, doctor_id, True]
+        self._entries[doctor_id] = entry
+        return entry
+
+    def _push(self, doctor_id, load, seq=None):
+        if seq is None:
+            self._seq += 1
+            seq = self._seq
+        heappush(self._heap, self._entry(doctor_id, load, seq))
+
+    def _compact(self):
+        """Rebuild the heap from live entries once dead ones are the majority."""
+        if len(self._heap) > 2 * len(self._entries) + 32:
+            self._heap = list(self._entries.values())
+            heapify(self._heap)
@@ -0,0 +1,140 @@
+# core/demographics.py
+"""
+Batch age calculations for whole populations of patients or staff.
+
+Ages are computed against a single reference date in one pass, using the
+identity ``age = (YYYYMMDD(as_of) - YYYYMMDD(date_of_birth)) // 10000``,
+which gives completed years without any per-person date arithmetic or
+tuple comparisons. When NumPy is installed the pass is vectorized;
+otherwise the same arithmetic runs over compact ``array`` buffers.
+"""
+from array import array
+from collections import Counter
+from datetime import date
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is an optional fast path
+    np = None
+
+ADULT_AGE = 18
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def date_key(value):
+    """
+    Encode a date as the integer YYYYMMDD.
+
+    Args:
+        value (date): Date to encode.
+
+    Returns:
+        int: The date as YYYYMMDD.
+    """
+    return value.year * 10000 + value.month * 100 + value.day
+
+
+def keys_from_dates(dates):
+    """
+    Encode an iterable of dates as YYYYMMDD keys.
+
+    Args:
+        dates (iterable[date]): Dates of birth.
+
+    Returns:
+        numpy.ndarray | array: int32 keys, one per date.
+    """
+    keys = array("i", (d.year * 10000 + d.month * 100 + d.day for d in dates))
+    if np is not None:
+        return np.frombuffer(keys, dtype=np.int32)
+    return keys
+
+
+def keys_from_ordinals(ordinals):
+    """
+    Encode proleptic Gregorian ordinals (``date.toordinal()``) as YYYYMMDD keys.
+
+    Args:
+        ordinals (sequence[int]): Date ordinals, e.g. an ``array('i')``.
+
+    Returns:
+        numpy.ndarray | array: int32 keys, one per ordinal.
+    """
+    if np is not None:
+        days = np.asarray(ordinals, dtype=np.int64) - _EPOCH_ORDINAL
+        stamps = days.astype("datetime64[D]")
+        years = stamps.astype("datetime64[Y]").astype(np.int64) + 1970
+        months = stamps.astype("datetime64[M]").astype(np.int64) % 12 + 1
+        day_of_month = (stamps - stamps.astype("datetime64[M]")).astype(np.int64) + 1
+        return (years * 10000 + months * 100 + day_of_month).astype(np.int32)
+
+    # Populations share relatively few distinct birth dates, so convert
+    # each distinct ordinal once.
+    cache = {}
+    keys = array("i")
+    for ordinal in ordinals:
+        key = cache.get(ordinal)
+        if key is None:
+            key = cache[ordinal] = date_key(date.fromordinal(ordinal))
+        keys.append(key)
+    return keys
+
+
+def ages_from_keys(keys, as_of):
+    """
+    Compute completed years of age for every YYYYMMDD key.
+
+    Args:
+        keys (sequence[int]): Dates of birth as YYYYMMDD keys.
+        as_of (date): Reference date shared by the whole population.
+
+    Returns:
+        numpy.ndarray | array: int32 ages, one per key.
+    """
+    reference = date_key(as_of)
+    if np is not None:
+        return ((reference - np.asarray(keys, dtype=np.int32)) // 10000).astype(np.int32)
+    return array("i", ((reference - key) // 10000 for key in keys))
+
+
+def adult_flags(ages):
+    """
+    Flag which ages are adult.
+
+    Args:
+        ages (sequence[int]): Ages in years.
+
+    Returns:
+        numpy.ndarray | list[bool]: True where the age is ADULT_AGE or older.
+    """
+    if np is not None:
+        return np.asarray(ages) >= ADULT_AGE
+    return [age >= ADULT_AGE for age in ages]
+
+
+def histogram(ages, bin_width=10):
+    """
+    Count ages per fixed-width bin.
+
+    Args:
+        ages (sequence[int]): Ages in years.
+        bin_width (int): Width of each bin in years.
+
+    Returns:
+        dict[int, int]: Count per bin, keyed by the bin's lower bound, in
+            ascending order. Empty bins are omitted.
+
+    Raises:
+        ValueError: If bin_width is not a positive integer.
+    """
+    if not isinstance(bin_width, int) or bin_width <= 0:
+        raise ValueError("bin_width must be a positive integer.")
+    if np is not None:
+        values = np.asarray(ages, dtype=np.int64)
+        if not values.size:
+            return {}
+        counts = np.bincount(np.clip(values, 0, None) // bin_width)
+        return {int(b) * bin_width: int(c) for b, c in enumerate(counts) if c}
+    counts = Counter(max(age, 0) // bin_width for age in ages)
+    return {b * bin_width: counts[b] for b in sorted(counts)}
@@ -1,4 +1,174 @@
 # core/department.py
+import threading
+from datetime import date
+
+from models.staff import Role
+
+from . import demographics, events
+from .assignment import AssignmentEngine
+from .locks import NO_LOCK, synchronized
+from .names import NameIndex
+from .occupancy import OccupancyIndex, timestamp
+from .patient_table import PatientTable
+from .roles import RoleIndex, role as _role
+from .shifts import ShiftIndex
+from .triage import TriageQueue
+
+
+class MemberIndex:
+    """
+    Insertion-ordered collection of people keyed by their ``person_id``.
+
+    Lookup, membership tests and removal by ID are O(1) dictionary
+    operations. Iteration and positional access (``index[0]``) follow
+    insertion order through a tuple that is built once and cached until
+    the collection changes.
+
+    A trigram ``NameIndex`` over member names is built on the first
+    ``search_names`` call and kept current from then on.
+
+    Attributes:
+        _members (dict): Mapping of person_id to Patient/Staff object.
+    """
+
+    def __init__(self, members=()):
+        """
+        Initialize a MemberIndex, optionally populated from an iterable.
+
+        Args:
+            members (iterable): Patient or Staff objects to add.
+
+        Raises:
+            ValueError: If two members share the same person_id.
+        """
+        self._members = {}
+        self._ordered = None
+        self._names = None
+        for member in members:
+            self.add(member)
+
+    def __len__(self):
+        """Return the number of members."""
+        return len(self._members)
+
+    def __iter__(self):
+        """Iterate over members in insertion order."""
+        return iter(self._snapshot())
+
+    def __getitem__(self, position):
+        """Return the member (or slice of members) at the given position."""
+        return self._snapshot()[position]
+
+    def __contains__(self, item):
+        """Check membership by person_id or by member object."""
+        key = item if isinstance(item, int) else getattr(item, "person_id", None)
+        return key in self._members
+
+    def __repr__(self):
+        """Return a detailed representation for debugging."""
+        return f"MemberIndex({list(self._snapshot())!r})"
+
+    def _snapshot(self):
+        if self._ordered is None:
+            self._ordered = tuple(self._members.values())
+        return self._ordered
+
+    def add(self, member):
+        """
+        Add a member to the index.
+
+        Args:
+            member (Person): Patient or Staff object to add.
+
+        Raises:
+            ValueError: If a member with the same person_id is already present.
+        """
+        if member.person_id in self._members:
+            raise ValueError(f"'{member.name}' (#{member.person_id}) is already a member.")
+        self._members[member.person_id] = member
+        self._ordered = None
+        if self._names is not None:
+            self._names.add(member.person_id, member.name)
+
+    def get(self, person_id, default=None):
+        """
+        Return the member with the given ID.
+
+        Args:
+            person_id (int): ID of the member.
+            default: Value returned if the ID is unknown.
+
+        Returns:
+            Person | None: The member if found, else ``default``.
+        """
+        return self._members.get(person_id, default)
+
+    def pop(self, person_id, default=None):
+        """
+        Remove and return the member with the given ID.
+
+        Args:
+            person_id (int): ID of the member to remove.
+            default: Value returned if the ID is unknown.
+
+        Returns:
+            Person | None: The removed member if found, else ``default``.
+        """
+        member = self._members.pop(person_id, None)
+        if member is None:
+            return default
+        self._ordered = None
+        if self._names is not None:
+            self._names.discard(person_id)
+        return member
+
+    def remove(self, person_id):
+        """
+        Remove and return the member with the given ID.
+
+        Args:
+            person_id (int): ID of the member to remove.
+
+        Returns:
+            Person: The removed member.
+
+        Raises:
+            KeyError: If no member has the given ID.
+        """
+        member = self.pop(person_id)
+        if member is None:
+            raise KeyError(person_id)
+        return member
+
+    def ids(self):
+        """Return a view of the member IDs in insertion order."""
+        return self._members.keys()
+
+    def search_names(self, query, k=10):
+        """
+        Find members by partial or misspelled name.
+
+        Args:
+            query (str): Name or part of a name, as typed so far.
+            k (int): Maximum number of results.
+
+        Returns:
+            list[Person]: Up to k best-matching members, best first.
+        """
+        return [self._members[person_id] for _, person_id in self.name_index().search(query, k)]
+
+    def name_index(self):
+        """
+        Return the trigram index over member names, building it on first use.
+
+        Returns:
+            NameIndex: The index.
+        """
+        if self._names is None:
+            names = NameIndex()
+            names.update((member.person_id, member.name) for member in self)
+            self._names = names
+        return self._names
 
 
 class Department:
@@ -6,25 +176,78 @@ class Department:
     Class representing a department within a hospital.
 
     A department manages its own patients and staff. It provides methods
-    to add patients and staff, and offers string representations for
-    both user-friendly display and debugging.
+    to add, find, remove and discharge patients and staff, and offers
+    string representations for both user-friendly display and debugging.
+
+    The department keeps running counts of checked-in patients and staff.
+    Members report their check-in/check-out transitions back to every
+    department holding them, and the department forwards each change to
+    the hospital it belongs to, so hospital-wide totals never need a scan.
+
+    Very large departments can opt into a columnar ``PatientTable`` for
+    their patients. It offers the same container interface but stores a
+    copy of each patient in compact arrays and yields ``PatientView``
+    objects; changes must then go through those views.
+
+    Adding, removing and discharging members publish events on
+    ``events`` (by default the shared ``core.events.default_bus``)
+    instead of printing.
+
+    Once its hospital has called ``enable_concurrency``, the department's
+    public methods and change hooks run under the department's own
+    reentrant lock.
+
+    Every check-in and check-out while a person is a member is recorded
+    as a time interval in ``patient_history``/``staff_history``, so past
+    occupancy can be queried without replaying events.
+
+    Staff are also indexed by ``Staff.role`` once ``staff_by_role`` is
+    first called, so finding the checked-in doctors is O(k) in the number
+    of matches rather than a scan over all staff. Likewise, staff shifts
+    are compiled into an hour-of-week ``ShiftIndex`` on the first
+    ``on_shift`` call and updated whenever a schedule changes.
+
+    Checked-in patients can wait in the department's ``triage`` queue;
+    patients who check out or leave the department drop out of it.
+
+    Once ``assignment_engine`` has been called, patients who check in are
+    assigned to the least loaded checked-in, on-shift doctor, and doctors
+    who check out or leave hand their patients to the others.
 
     Attributes:
         name (str): The name of the department.
-        patients (list): List of Patient objects assigned to this department.
-        staff (list): List of Staff objects assigned to this department.
+        patients (MemberIndex | PatientTable): Patients assigned to this department, keyed by person_id.
+        staff (MemberIndex): Staff objects assigned to this department, keyed by person_id.
+        events (EventBus): Bus that add/remove/discharge notifications are published on.
+        patient_history (OccupancyIndex): Check-in intervals of the department's patients.
+        staff_history (OccupancyIndex): Check-in intervals of the department's staff.
+        triage (TriageQueue): Waiting list of checked-in patients by acuity and arrival.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, columnar=False):
         """
         Initialize a Department object.
 
         Args:
             name (str): Name of the department.
+            columnar (bool): Store patients in a columnar PatientTable
+                instead of a MemberIndex of Patient objects.
         """
         self.name = name
-        self.patients = []
-        self.staff = []
+        self._columnar = columnar
+        self.patients = PatientTable(self) if columnar else MemberIndex()
+        self.staff = MemberIndex()
+        self._hospital = None
+        self._checked_in_patients = 0
+        self._checked_in_staff = 0
+        self.events = events.default_bus
+        self.patient_history = OccupancyIndex()
+        self.staff_history = OccupancyIndex()
+        self._roles = None
+        self._shifts = None
+        self.triage = TriageQueue()
+        self._assignments = None
+        self._lock = NO_LOCK
 
     def __str__(self):
         """
@@ -45,6 +268,7 @@ class Department:
         """
         return f"Department(name={self.name!r}, staff={self.staff!r}, patients={self.patients!r})"
 
+    @synchronized
     def add_patient(self, patient):
         """
         Add a patient to the department.
@@ -52,12 +276,20 @@ class Department:
         Args:
             patient (Patient): Patient object to add to this department.
 
-        Prints:
-            Confirmation message after adding the patient.
+        Raises:
+            ValueError: If the patient is already in this department.
+
+        Publishes:
+            'patient_added' on ``self.events``.
         """
-        self.patients.append(patient)
-        print(f"Patient '{patient.name}' added to {self.name} department.")
+        self.patients.add(patient)
+        self._track(patient, is_patient=True)
+        if self.events:
+            self.events.publish(
+                "patient_added", f"Patient '{patient.name}' added to {self.name} department.", self.name
+            )
 
+    @synchronized
     def add_staff(self, staff_member):
         """
         Add a staff member to the department.
@@ -65,11 +297,151 @@ class Department:
         Args:
             staff_member (Staff): Staff object to add to this department.
 
-        Prints:
-            Confirmation message after adding the staff member.
+        Raises:
+            ValueError: If the staff member is already in this department.
+
+        Publishes:
+            'staff_added' on ``self.events``.
         """
-        self.staff.append(staff_member)
-        print(f"Staff '{staff_member.name}' added to {self.name} department.")
+        self.staff.add(staff_member)
+        self._track(staff_member, is_patient=False)
+        if self.events:
+            self.events.publish(
+                "staff_added", f"Staff '{staff_member.name}' added to {self.name} department.", self.name
+            )
+
+    @synchronized
+    def add_patients(self, patients):
+        """
+        Add many patients at once, without per-patient events.
+
+        Department and hospital counters are updated once for the whole
+        batch rather than once per patient.
+
+        Args:
+            patients (iterable[Patient]): Patient objects to add.
+
+        Returns:
+            int: Number of patients added.
+
+        Raises:
+            ValueError: If a patient is already in this department. Patients
+                before the duplicate remain added.
+        """
+        return self._add_many(self.patients, patients, is_patient=True)
+
+    @synchronized
+    def add_staff_members(self, staff_members):
+        """
+        Add many staff members at once, without per-member events.
+
+        Args:
+            staff_members (iterable[Staff]): Staff objects to add.
+
+        Returns:
+            int: Number of staff members added.
+
+        Raises:
+            ValueError: If a staff member is already in this department.
+                Members before the duplicate remain added.
+        """
+        return self._add_many(self.staff, staff_members, is_patient=False)
+
+    def get_patient(self, person_id):
+        """
+        Find a patient by ID.
+
+        Args:
+            person_id (int): ID of the patient.
+
+        Returns:
+            Patient | None: The patient if found, else None.
+        """
+        return self.patients.get(person_id)
+
+    def get_staff(self, person_id):
+        """
+        Find a staff member by ID.
+
+        Args:
+            person_id (int): ID of the staff member.
+
+        Returns:
+            Staff | None: The staff member if found, else None.
+        """
+        return self.staff.get(person_id)
+
+    def remove_patient(self, person_id):
+        """
+        Remove a patient from the department by ID.
+
+        Args:
+            person_id (int): ID of the patient to remove.
+
+        Returns:
+            Patient | None: The removed patient, or None if not found.
+        """
+        patient = self._remove(self.patients, person_id, is_patient=True)
+        if patient is None:
+            if self.events:
+                self.events.publish(
+                    "patient_not_found", f"Patient #{person_id} not found in {self.name} department.", self.name
+                )
+            return None
+        if self.events:
+            self.events.publish(
+                "patient_removed", f"Patient '{patient.name}' removed from {self.name} department.", self.name
+            )
+        return patient
+
+    def remove_staff(self, person_id):
+        """
+        Remove a staff member from the department by ID.
+
+        Args:
+            person_id (int): ID of the staff member to remove.
+
+        Returns:
+            Staff | None: The removed staff member, or None if not found.
+        """
+        staff_member = self._remove(self.staff, person_id, is_patient=False)
+        if staff_member is None:
+            if self.events:
+                self.events.publish(
+                    "staff_not_found", f"Staff #{person_id} not found in {self.name} department.", self.name
+                )
+            return None
+        if self.events:
+            self.events.publish(
+                "staff_removed", f"Staff '{staff_member.name}' removed from {self.name} department.", self.name
+            )
+        return staff_member
+
+    def discharge_patient(self, person_id):
+        """
+        Check a patient out and remove them from the department.
+
+        Args:
+            person_id (int): ID of the patient to discharge.
+
+        Returns:
+            Patient | None: The discharged patient, or None if not found.
+        """
+        patient = self._remove(self.patients, person_id, is_patient=True)
+        if patient is None:
+            if self.events:
+                self.events.publish(
+                    "patient_not_found", f"Patient #{person_id} not found in {self.name} department.", self.name
+                )
+            return None
+        # Checked out outside the department lock: check-in locks come first.
+        if patient.is_active():
+            patient.check_out()
+        if self.events:
+            self.events.publish(
+                "patient_discharged", f"Patient '{patient.name}' discharged from {self.name} department.", self.name
+            )
+        return patient
 
     def get_patient_count(self):
         """
@@ -88,3 +460,570 @@ class Department:
             int: Number of staff members.
         """
         return len(self.staff)
+
+    @synchronized
+    def ages(self, as_of=None, staff=False):
+        """
+        Compute the age of every patient (or staff member) in one batch.
+
+        All ages are taken against the same reference date, so the whole
+        department costs a single pass instead of one ``date.today()``
+        call and one comparison per person.
+
+        Args:
+            as_of (date | None): Reference date; defaults to today.
+            staff (bool): Compute staff ages instead of patient ages.
+
+        Returns:
+            numpy.ndarray | array: Ages in years, in member order. A NumPy
+                array when NumPy is installed.
+        """
+        as_of = as_of or date.today()
+        members = self.staff if staff else self.patients
+        if isinstance(members, PatientTable):
+            keys = members.dob_keys()
+        else:
+            keys = demographics.keys_from_dates(m.date_of_birth for m in members)
+        return demographics.ages_from_keys(keys, as_of)
+
+    @synchronized
+    def adult_flags(self, as_of=None, staff=False):
+        """
+        Flag which patients (or staff members) are adults, in one batch.
+
+        Args:
+            as_of (date | None): Reference date; defaults to today.
+            staff (bool): Flag staff members instead of patients.
+
+        Returns:
+            numpy.ndarray | list[bool]: True for adults, in member order.
+        """
+        return demographics.adult_flags(self.ages(as_of, staff))
+
+    @synchronized
+    def occupancy_at(self, when, staff=False):
+        """
+        Count the patients (or staff members) present at a given time.
+
+        Args:
+            when (float | datetime): Unix timestamp or datetime.
+            staff (bool): Count staff members instead of patients.
+
+        Returns:
+            int: Number of people checked in at that time.
+        """
+        return (self.staff_history if staff else self.patient_history).count_at(when)
+
+    @synchronized
+    def present_at(self, when, staff=False):
+        """
+        List the patients (or staff members) present at a given time.
+
+        Args:
+            when (float | datetime): Unix timestamp or datetime.
+            staff (bool): List staff members instead of patients.
+
+        Returns:
+            list[int]: person_ids of everyone checked in at that time,
+                including people who have since left the department.
+        """
+        return (self.staff_history if staff else self.patient_history).present_at(when)
+
+    @synchronized
+    def present_between(self, start, end, staff=False):
+        """
+        List the patients (or staff members) present at any time in a range.
+
+        Args:
+            start (float | datetime): Beginning of the range.
+            end (float | datetime): End of the range (exclusive).
+            staff (bool): List staff members instead of patients.
+
+        Returns:
+            list[int]: person_ids of everyone checked in during the range.
+
+        Raises:
+            ValueError: If end is before start.
+        """
+        return (self.staff_history if staff else self.patient_history).present_between(start, end)
+
+    @synchronized
+    def peak_occupancy(self, start, end, staff=False):
+        """
+        Find the highest number of patients (or staff members) present in a range.
+
+        Args:
+            start (float | datetime): Beginning of the range.
+            end (float | datetime): End of the range (exclusive).
+            staff (bool): Look at staff members instead of patients.
+
+        Returns:
+            tuple[int, float]: Peak count and the Unix timestamp it was first reached.
+
+        Raises:
+            ValueError: If end is before start.
+        """
+        return (self.staff_history if staff else self.patient_history).peak(start, end)
+
+    @synchronized
+    def search_names(self, query, k=10, staff=False):
+        """
+        Find patients (or staff members) by partial or misspelled name.
+
+        Args:
+            query (str): Name or part of a name, as typed so far.
+            k (int): Maximum number of results.
+            staff (bool): Search staff members instead of patients.
+
+        Returns:
+            list[Patient | PatientView | Staff]: Up to k best matches, best first.
+        """
+        return (self.staff if staff else self.patients).search_names(query, k)
+
+    @synchronized
+    def staff_by_role(self, role, checked_in=None):
+        """
+        List the department's staff members holding a role.
+
+        Args:
+            role (Role | str): The role, e.g. ``Role.DOCTOR`` or 'doctor'.
+            checked_in (bool | None): True for only checked-in members,
+                False for only checked-out ones, None for all.
+
+        Returns:
+            list[Staff]: Matching staff members.
+
+        Raises:
+            ValueError: If role is not a known role.
+        """
+        return self.role_index().members(role, checked_in)
+
+    @synchronized
+    def role_index(self):
+        """
+        Return the index of the department's staff by role, building it on first use.
+
+        Returns:
+            RoleIndex: The index.
+        """
+        if self._roles is None:
+            self._roles = RoleIndex(self.staff)
+        return self._roles
+
+    @synchronized
+    def on_shift(self, when=None, role=None):
+        """
+        List the department's staff members whose schedule has them working at a given time.
+
+        Args:
+            when (float | datetime | None): Unix timestamp, local datetime or None for now.
+            role (Role | str | None): Only staff holding this role.
+
+        Returns:
+            list[Staff]: Staff members on shift.
+
+        Raises:
+            ValueError: If role is not a known role.
+        """
+        members = self.shift_index().on_shift(when)
+        if role is None:
+            return members
+        role = _role(role)
+        return [member for member in members if member.role is role]
+
+    @synchronized
+    def shift_index(self):
+        """
+        Return the index of the department's staff shifts, building it on first use.
+
+        Returns:
+            ShiftIndex: The index.
+        """
+        if self._shifts is None:
+            self._shifts = ShiftIndex(self.staff)
+        return self._shifts
+
+    @synchronized
+    def enqueue_patient(self, person_id, acuity, at=None):
+        """
+        Put a checked-in patient on the triage waiting list.
+
+        Args:
+            person_id (int): ID of the patient.
+            acuity (int): Urgency from 1 (most urgent) to 5.
+            at (float | datetime | None): Arrival time; defaults to now.
+
+        Raises:
+            ValueError: If the patient is not in the department, is not
+                checked in, is already waiting, or acuity is not 1-5.
+        """
+        patient = self.patients.get(person_id)
+        if patient is None:
+            raise ValueError(f"Patient #{person_id} is not in {self.name} department.")
+        if not patient.is_active():
+            raise ValueError(f"Patient '{patient.name}' must be checked in before triage.")
+        self.triage.enqueue(person_id, acuity, at)
+        if self.events:
+            self.events.publish(
+                "patient_queued", f"Patient '{patient.name}' queued in {self.name} with acuity {acuity}.", self.name
+            )
+
+    @synchronized
+    def next_patient(self, at=None):
+        """
+        Call in the most urgent waiting patient, removing them from the triage queue.
+
+        Args:
+            at (float | datetime | None): When they are called in; defaults to now.
+
+        Returns:
+            Patient | PatientView | None: The patient, or None if nobody is waiting.
+        """
+        person_id = self.triage.dequeue(at)
+        return None if person_id is None else self.patients.get(person_id)
+
+    @synchronized
+    def assignment_engine(self):
+        """
+        Return the department's patient-to-doctor assignment engine, creating it on first use.
+
+        From then on patients are assigned automatically when they check in.
+
+        Returns:
+            AssignmentEngine: The engine, with the checked-in doctors on its roster.
+        """
+        if self._assignments is None:
+            self._assignments = AssignmentEngine(self.staff_by_role(Role.DOCTOR, checked_in=True))
+        return self._assignments
+
+    @synchronized
+    def assign_patient(self, person_id, when=None):
+        """
+        Assign a checked-in patient to the least loaded eligible doctor.
+
+        Args:
+            person_id (int): ID of the patient.
+            when (float | datetime | None): Time of assignment, for shift checks; defaults to now.
+
+        Returns:
+            Staff | None: The patient's doctor (the existing one if already
+                assigned), or None if no doctor is available.
+
+        Raises:
+            ValueError: If the patient is not in the department or not checked in.
+        """
+        patient = self.patients.get(person_id)
+        if patient is None:
+            raise ValueError(f"Patient #{person_id} is not in {self.name} department.")
+        if not patient.is_active():
+            raise ValueError(f"Patient '{patient.name}' must be checked in to be assigned a doctor.")
+        engine = self.assignment_engine()
+        known = engine.doctor_of(person_id)
+        doctor = known or engine.assign(person_id, when)
+        if doctor is not None and known is None and self.events:
+            self.events.publish(
+                "patient_assigned", f"Patient '{patient.name}' assigned to {doctor.name}.", self.name
+            )
+        return doctor
+
+    @synchronized
+    def assign_patients(self, person_ids=None, when=None):
+        """
+        Assign many patients at once, e.g. for morning rounds.
+
+        Args:
+            person_ids (iterable[int] | None): IDs of patients to assign;
+                None for every checked-in patient of the department.
+            when (float | datetime | None): Time of assignment; defaults to now.
+
+        Returns:
+            int: Number of patients newly assigned.
+        """
+        if person_ids is None:
+            person_ids = [patient.person_id for patient in self.patients if patient.is_active()]
+        return self.assignment_engine().assign_many(person_ids, when)
+
+    @synchronized
+    def rebalance_assignments(self, when=None):
+        """
+        Move patients off off-shift and overloaded doctors so loads differ by at most one.
+
+        Args:
+            when (float | datetime | None): Time of reassignment; defaults to now.
+
+        Returns:
+            list[tuple[int, int, int]]: (patient ID, old doctor ID, new doctor ID) per move.
+        """
+        return self.assignment_engine().rebalance(when)
+
+    @synchronized
+    def assigned_doctor(self, person_id):
+        """
+        Return the doctor a patient is assigned to.
+
+        Args:
+            person_id (int): ID of the patient.
+
+        Returns:
+            Staff | None: The doctor, or None if unassigned.
+        """
+        return None if self._assignments is None else self._assignments.doctor_of(person_id)
+
+    def get_checked_in_patient_count(self):
+        """
+        Get the number of patients currently checked in.
+
+        Returns:
+            int: Number of checked-in patients.
+        """
+        return self._checked_in_patients
+
+    def get_checked_in_staff_count(self):
+        """
+        Get the number of staff members currently checked in.
+
+        Returns:
+            int: Number of checked-in staff members.
+        """
+        return self._checked_in_staff
+
+    def _counts(self):
+        """Return (patients, staff, checked-in patients, checked-in staff)."""
+        return len(self.patients), len(self.staff), self._checked_in_patients, self._checked_in_staff
+
+    def _propagate(self, patients=0, staff=0, checked_in_patients=0, checked_in_staff=0):
+        if self._hospital is not None:
+            self._hospital._adjust_totals(patients, staff, checked_in_patients, checked_in_staff)
+
+    def _track(self, member, is_patient):
+        """Register this department with a newly added member and count them."""
+        if not (is_patient and self._columnar):
+            member._memberships += (self,)
+        active = 1 if member.is_active() else 0
+        if active:
+            (self.patient_history if is_patient else self.staff_history).open(member.person_id)
+        with self._hospital_lock():
+            if is_patient:
+                index = self._record_index()
+                if index is not None:
+                    index.add_member(member.person_id, member.medical_record)
+                master = self._master_index()
+                if master is not None:
+                    master.add(member, self)
+            else:
+                self._index_staff(member)
+        if is_patient:
+            self._checked_in_patients += active
+            self._propagate(patients=1, checked_in_patients=active)
+        else:
+            self._checked_in_staff += active
+            self._propagate(staff=1, checked_in_staff=active)
+
+    def _add_many(self, members, new_members, is_patient):
+        """Add a batch of members and apply their counts in one update."""
+        register = not (is_patient and self._columnar)
+        history = self.patient_history if is_patient else self.staff_history
+        now = timestamp()
+        added = active = 0
+        with self._hospital_lock():
+            index = self._record_index() if is_patient else None
+            master = self._master_index() if is_patient else None
+            try:
+                for member in new_members:
+                    members.add(member)
+                    if register:
+                        member._memberships += (self,)
+                    if index is not None:
+                        index.add_member(member.person_id, member.medical_record)
+                    if master is not None:
+                        master.add(member, self)
+                    if not is_patient:
+                        self._index_staff(member)
+                    added += 1
+                    if member.is_active():
+                        history.open(member.person_id, now)
+                        active += 1
+            finally:
+                if is_patient:
+                    self._checked_in_patients += active
+                    self._propagate(patients=added, checked_in_patients=active)
+                else:
+                    self._checked_in_staff += active
+                    self._propagate(staff=added, checked_in_staff=active)
+        return added
+
+    def _untrack(self, member, is_patient):
+        """Detach a removed member and take them out of the counters."""
+        if not (is_patient and self._columnar):
+            member._memberships = tuple(d for d in member._memberships if d is not self)
+        (self.patient_history if is_patient else self.staff_history).close(member.person_id)
+        if is_patient:
+            self.triage.remove(member.person_id)
+            if self._assignments is not None:
+                self._assignments.release(member.person_id)
+            with self._hospital_lock():
+                index = self._record_index()
+                if index is not None:
+                    index.remove_member(member.person_id)
+                master = self._master_index()
+                if master is not None:
+                    master.remove(member.person_id, self)
+        else:
+            with self._hospital_lock():
+                for roles in self._role_indexes():
+                    roles.remove(member)
+            if self._shifts is not None:
+                self._shifts.remove(member)
+            if self._assignments is not None:
+                self._assignments.remove_doctor(member)
+        active = 1 if member.is_active() else 0
+        if is_patient:
+            self._checked_in_patients -= active
+            self._propagate(patients=-1, checked_in_patients=-active)
+        else:
+            self._checked_in_staff -= active
+            self._propagate(staff=-1, checked_in_staff=-active)
+
+    def _remove(self, members, person_id, is_patient):
+        """
+        Pop and untrack a member, or return None if they are not here.
+
+        The member's check-in lock is taken before the department lock, so
+        a check-in or check-out running on another thread is counted either
+        entirely before the removal or not at all.
+        """
+        member = members.get(person_id)
+        if member is None:
+            return None
+        with member._status_lock(), self._lock:
+            member = members.pop(person_id)
+            if member is not None:
+                self._untrack(member, is_patient)
+        return member
+
+    def _enable_concurrency(self):
+        """Give the department its own lock; called by ``Hospital.enable_concurrency``."""
+        if self._lock is NO_LOCK:
+            self._lock = threading.RLock()
+
+    def _hospital_lock(self):
+        """Return the lock guarding the hospital-wide totals and indexes, or NO_LOCK."""
+        return NO_LOCK if self._hospital is None else self._hospital._shared
+
+    def _record_index(self):
+        """Return the hospital's record index if it has been built, else None."""
+        return None if self._hospital is None else self._hospital._record_index
+
+    def _master_index(self):
+        """Return the master patient index of the hospital's network if it has been built, else None."""
+        network = None if self._hospital is None else self._hospital._network
+        return None if network is None else network._index
+
+    def _index_staff(self, staff_member):
+        """Add a new staff member to the role and shift indexes built so far."""
+        for roles in self._role_indexes():
+            roles.add(staff_member)
+        if self._shifts is not None:
+            self._shifts.add(staff_member)
+        if self._assignments is not None and staff_member.role is Role.DOCTOR and staff_member.is_active():
+            self._assignments.add_doctor(staff_member)
+
+    def _role_indexes(self):
+        """Return the role indexes built so far: this department's and the hospital's."""
+        indexes = () if self._roles is None else (self._roles,)
+        if self._hospital is not None and self._hospital._roles is not None:
+            indexes += (self._hospital._roles,)
+        return indexes
+
+    @synchronized
+    def _on_role_change(self, staff_member, old):
+        """
+        Re-file a staff member whose position changed to a different role.
+
+        Args:
+            staff_member (Staff): The staff member, already carrying the new role.
+            old (Role): Their previous role.
+        """
+        with self._hospital_lock():
+            for roles in self._role_indexes():
+                roles.change_role(staff_member, old)
+        if self._assignments is not None:
+            if old is Role.DOCTOR:
+                self._assignments.remove_doctor(staff_member)
+            elif staff_member.role is Role.DOCTOR and staff_member.is_active():
+                self._assignments.add_doctor(staff_member)
+
+    @synchronized
+    def _on_schedule_change(self, staff_member):
+        """
+        Re-index the shifts of a staff member whose schedule changed.
+
+        Args:
+            staff_member (Staff): The staff member, already carrying the new schedule.
+        """
+        if self._shifts is not None:
+            self._shifts.add(staff_member)
+
+    @synchronized
+    def _on_record_change(self, patient, text, replace=False):
+        """
+        Keep the hospital's record index current after a patient's record changed.
+
+        Args:
+            patient (Patient | PatientView): The patient whose record changed.
+            text (str): The appended entry as rendered ('<Kind>: <text>'), or the whole new record.
+            replace (bool): True if the whole record was replaced.
+        """
+        with self._hospital_lock():
+            index = self._record_index()
+            if index is None:
+                return
+            if replace:
+                index.replace_text(patient.person_id, text)
+            else:
+                index.add_text(patient.person_id, text)
+
+    @synchronized
+    def _on_member_status_change(self, member, active, at=None):
+        """
+        Update check-in counters and history after a member checked in or out.
+
+        Args:
+            member (Person): The patient or staff member whose status changed.
+            active (bool): True on check-in, False on check-out.
+            at (float | datetime | None): When it happened; defaults to now.
+        """
+        at = timestamp(at)
+        delta = 1 if active else -1
+        if member.person_id not in self.patients and member.person_id not in self.staff:
+            # Left the department after the notification began (e.g. discharged meanwhile).
+            return
+        if member.person_id in self.patients:
+            history = self.patient_history
+            self._checked_in_patients += delta
+            self._propagate(checked_in_patients=delta)
+            if not active:
+                self.triage.remove(member.person_id)
+            if self._assignments is not None:
+                if active:
+                    self._assignments.assign(member.person_id, at)
+                else:
+                    self._assignments.release(member.person_id)
+        else:
+            history = self.staff_history
+            self._checked_in_staff += delta
+            self._propagate(checked_in_staff=delta)
+            with self._hospital_lock():
+                for roles in self._role_indexes():
+                    roles.set_active(member, active)
+            if self._assignments is not None and member.role is Role.DOCTOR:
+                if active:
+                    self._assignments.add_doctor(member)
+                else:
+                    self._assignments.remove_doctor(member, at)
+        if active:
+            history.open(member.person_id, at)
+        else:
+            history.close(member.person_id, at)
+        if self._hospital is not None:
+            self._hospital._on_member_status_change(self, member, active, at)
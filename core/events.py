@@ -0,0 +1,273 @@
+# core/events.py
+"""
+Observer bus for notifications from hospitals and departments.
+
+Core objects publish events (a department was added, a patient was
+discharged, ...) instead of printing. Sinks subscribe to a bus and
+decide what to do with them: print, log to a file, keep the most recent
+ones in memory or show them in the GUI. A sink is any callable that
+accepts a list of ``Event`` objects.
+
+Publishers check ``if bus:`` before building a message, so when nothing
+is subscribed an event costs a single truth test. Delivery is batched:
+events are queued and handed to every sink ``batch_size`` at a time, or
+all at once at the end of a ``with bus.batch():`` block. Publishing is
+safe from several threads; sinks are called outside the bus's lock.
+"""
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+class Event:
+    """
+    A single notification.
+
+    Attributes:
+        kind (str): What happened, e.g. 'patient_added'.
+        message (str): Human-readable description.
+        source (str): Name of the hospital or department that published it.
+        timestamp (float): Unix time at which it was published.
+    """
+
+    __slots__ = ("kind", "message", "source", "timestamp")
+
+    def __init__(self, kind, message, source=None, timestamp=None):
+        """
+        Initialize an Event.
+
+        Args:
+            kind (str): What happened.
+            message (str): Human-readable description.
+            source (str | None): Name of the publisher.
+            timestamp (float | None): Unix time; defaults to now.
+        """
+        self.kind = kind
+        self.message = message
+        self.source = source
+        self.timestamp = time.time() if timestamp is None else timestamp
+
+    def __str__(self):
+        """Return the event message."""
+        return self.message
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"Event(kind={self.kind!r}, message={self.message!r}, source={self.source!r})"
+
+
+class EventBus:
+    """
+    Delivers published events to subscribed sinks in batches.
+
+    A bus is truthy only while it has subscribers.
+
+    Attributes:
+        batch_size (int): Events queued before they are delivered.
+    """
+
+    def __init__(self, batch_size=1):
+        """
+        Initialize an EventBus.
+
+        Args:
+            batch_size (int): Events queued before delivery; 1 delivers immediately.
+
+        Raises:
+            ValueError: If batch_size is not a positive integer.
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size must be a positive integer.")
+        self.batch_size = batch_size
+        self._sinks = []
+        self._pending = []
+        self._batching = 0
+        self._lock = threading.Lock()
+
+    def __bool__(self):
+        """Return True if at least one sink is subscribed."""
+        return bool(self._sinks)
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"EventBus(sinks={len(self._sinks)}, pending={len(self._pending)})"
+
+    def subscribe(self, sink, kinds=None):
+        """
+        Subscribe a sink.
+
+        Args:
+            sink (callable): Called with a list of events.
+            kinds (iterable[str] | None): Only deliver these event kinds; None for all.
+
+        Returns:
+            callable: The sink, so it can later be passed to ``unsubscribe``.
+
+        Raises:
+            TypeError: If sink is not callable.
+        """
+        if not callable(sink):
+            raise TypeError("Event sink must be callable.")
+        self._sinks.append((sink, None if kinds is None else frozenset(kinds)))
+        return sink
+
+    def unsubscribe(self, sink):
+        """
+        Remove a sink after delivering any events still queued for it.
+
+        Args:
+            sink (callable): A previously subscribed sink.
+
+        Returns:
+            bool: True if the sink was subscribed.
+        """
+        for i, (subscribed, _) in enumerate(self._sinks):
+            if subscribed is sink:
+                self.flush()
+                del self._sinks[i]
+                return True
+        return False
+
+    def publish(self, kind, message, source=None):
+        """
+        Queue an event, delivering the queue once it reaches ``batch_size``.
+
+        Args:
+            kind (str): What happened.
+            message (str): Human-readable description.
+            source (str | None): Name of the publisher.
+        """
+        if not self._sinks:
+            return
+        event = Event(kind, message, source)
+        with self._lock:
+            self._pending.append(event)
+            due = not self._batching and len(self._pending) >= self.batch_size
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Deliver every queued event to the sinks."""
+        with self._lock:
+            if not self._pending:
+                return
+            events, self._pending = self._pending, []
+        for sink, kinds in self._sinks:
+            selected = events if kinds is None else [e for e in events if e.kind in kinds]
+            if selected:
+                sink(selected)
+
+    @contextmanager
+    def batch(self):
+        """Hold delivery until the end of the ``with`` block, then flush once."""
+        self._batching += 1
+        try:
+            yield self
+        finally:
+            self._batching -= 1
+            if not self._batching:
+                self.flush()
+
+
+class ConsoleSink:
+    """Print each event's message on its own line, one write per batch."""
+
+    def __init__(self, stream=None):
+        """
+        Initialize a ConsoleSink.
+
+        Args:
+            stream (file | None): Text stream to write to; defaults to sys.stdout.
+        """
+        self._stream = stream
+
+    def __call__(self, events):
+        stream = self._stream or sys.stdout
+        stream.write("".join(f"{event.message}\n" for event in events))
+
+
+class LogFileSink:
+    """
+    Append events to a text file as '<ISO time> <kind> <message>' lines.
+
+    Writes go through a buffer of ``buffer_size`` bytes, so a batch of
+    events usually costs no system call at all. Call ``close`` (or use the
+    sink as a context manager) to flush the tail.
+    """
+
+    def __init__(self, path, buffer_size=64 * 1024):
+        """
+        Open the log file for appending.
+
+        Args:
+            path (str): Path of the log file.
+            buffer_size (int): Size of the write buffer in bytes.
+        """
+        self.path = str(path)
+        self._file = open(self.path, "a", encoding="utf-8", buffering=buffer_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __call__(self, events):
+        self._file.write("".join(
+            f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(e.timestamp))} {e.kind} {e.message}\n"
+            for e in events
+        ))
+
+    def flush(self):
+        """Write buffered lines to the file."""
+        self._file.flush()
+
+    def close(self):
+        """Flush and close the file."""
+        self._file.close()
+
+
+class RingBufferSink:
+    """Keep the most recent ``capacity`` events in memory."""
+
+    def __init__(self, capacity=1000):
+        """
+        Initialize a RingBufferSink.
+
+        Args:
+            capacity (int): Number of events to keep.
+
+        Raises:
+            ValueError: If capacity is not a positive integer.
+        """
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("capacity must be a positive integer.")
+        self._events = deque(maxlen=capacity)
+
+    def __call__(self, events):
+        self._events.extend(events)
+
+    def __len__(self):
+        return len(self._events)
+
+    def events(self, kind=None):
+        """
+        Return the kept events, oldest first.
+
+        Args:
+            kind (str | None): Only events of this kind; None for all.
+
+        Returns:
+            list[Event]: The events.
+        """
+        return [e for e in self._events if kind is None or e.kind == kind]
+
+    def clear(self):
+        """Forget all kept events."""
+        self._events.clear()
+
+
+# Bus used by hospitals and departments unless they are given their own.
+default_bus = EventBus()
@@ -1,5 +1,15 @@
 # Hospital_system/core/hospital.py
+import threading
+from contextlib import ExitStack
+from datetime import date
+
+from models.person import Person
+
+from . import demographics, events
 from .department import Department
+from .locks import NO_LOCK, RWLock, reads, writes
+from .roles import RoleIndex
+from .search import RecordIndex
 
 class Hospital:
     """
@@ -9,10 +19,23 @@ class Hospital:
     add, remove, search, and list departments. It also calculates
     aggregated information about total patients and staff.
 
+    Departments are kept in a name-keyed dictionary, so adding, finding
+    and removing a department are O(1) while iteration still follows the
+    order in which departments were added.
+
+    Hospital-wide totals (patients, staff and how many of each are checked
+    in) are maintained incrementally: departments report every change to
+    the hospital they belong to, so reading a total is O(1).
+
+    A hospital is not thread-safe until ``enable_concurrency`` is called;
+    see ``core.locks`` for the locking scheme it switches on.
+
     Attributes:
         name (str): Name of the hospital.
         location (str): Physical location of the hospital.
-        departments (list): List of Department objects belonging to the hospital.
+        departments (tuple): Departments belonging to the hospital, in insertion order.
+        journal (EventJournal | None): Journal receiving every check-in/check-out, if attached.
+        events (EventBus): Bus that department add/remove notifications are published on.
     """
 
     def __init__(self, name, location):
@@ -33,7 +56,57 @@ class Hospital:
 
         self.name = name.strip()
         self.location = location.strip()
-        self.departments = []
+        self._departments = {}
+        self._department_list = None
+        self._total_patients = 0
+        self._total_staff = 0
+        self._checked_in_patients = 0
+        self._checked_in_staff = 0
+        self.journal = None
+        self.events = events.default_bus
+        self._record_index = None
+        self._roles = None
+        self._network = None
+        self._rw = NO_LOCK
+        self._shared = NO_LOCK
+
+    def enable_concurrency(self):
+        """
+        Make the hospital safe to drive from several threads.
+
+        Installs a reader/writer lock over the department registry, a lock
+        per department (including departments added later), a lock over
+        the hospital-wide totals and indexes, and striped check-in locks.
+        Call it before other threads start using the hospital.
+        """
+        if self._rw is not NO_LOCK:
+            return
+        self._shared = threading.RLock()
+        for department in self._departments.values():
+            department._enable_concurrency()
+        Person._enable_status_locks()
+        self._rw = RWLock()
+
+    @property
+    def concurrent(self):
+        """bool: True once ``enable_concurrency`` has been called."""
+        return self._rw is not NO_LOCK
+
+    @property
+    @reads
+    def departments(self):
+        """
+        Ordered, read-only view of the hospital's departments.
+
+        The tuple is built once and cached until the registry changes, so
+        repeated iteration or positional access does not copy the registry.
+
+        Returns:
+            tuple: Department objects in insertion order.
+        """
+        if self._department_list is None:
+            self._department_list = tuple(self._departments.values())
+        return self._department_list
 
     def __str__(self):
         """Return a readable summary of the hospital."""
@@ -43,6 +116,7 @@ class Hospital:
         """Return detailed representation for debugging."""
         return f"Hospital(name={self.name!r}, location={self.location!r}, departments={self.departments!r})"
 
+    @writes
     def add_department(self, department):
         """
         Add a department if valid and not already present.
@@ -52,20 +126,38 @@ class Hospital:
 
         Raises:
             TypeError: If department is not a Department instance.
-            ValueError: If department name is empty or already exists.
+            ValueError: If department name is empty, already exists, or the
+                department already belongs to another hospital.
         """
-       
+        self._register(department)
+        if self.events:
+            self.events.publish(
+                "department_added", f"Department '{department.name}' added to {self.name}.", self.name
+            )
 
-        if not isinstance(department, Department):
-            raise TypeError("department must be a Department instance.")
-        if not department.name or not department.name.strip():
-            raise ValueError("Department must have a non-empty name.")
-        if any(d.name == department.name for d in self.departments):
-            raise ValueError(f"Department '{department.name}' already exists in {self.name}.")
+    @writes
+    def add_departments(self, departments):
+        """
+        Add many departments at once, without per-department events.
 
-        self.departments.append(department)
-        print(f"Department '{department.name}' added to {self.name}.")
+        Args:
+            departments (iterable[Department]): Department objects to add.
+
+        Returns:
+            int: Number of departments added.
 
+        Raises:
+            TypeError: If an item is not a Department instance.
+            ValueError: If a department is invalid or a duplicate, as for
+                ``add_department``. Departments before it remain added.
+        """
+        added = 0
+        for department in departments:
+            self._register(department)
+            added += 1
+        return added
+
+    @writes
     def remove_department(self, department_name):
         """
         Remove a department by its name.
@@ -82,14 +174,34 @@ class Hospital:
         if not department_name or not isinstance(department_name, str):
             raise ValueError("Department name must be a non-empty string.")
 
-        for dept in self.departments:
-            if dept.name == department_name:
-                self.departments.remove(dept)
-                print(f"Department '{department_name}' removed from {self.name}.")
-                return True
-        print(f"Department '{department_name}' not found in {self.name}.")
+        department = self._departments.pop(department_name, None)
+        if department is not None:
+            self._department_list = None
+            with department._lock, self._shared:
+                department._hospital = None
+                if self._record_index is not None:
+                    for patient in department.patients:
+                        self._record_index.remove_member(patient.person_id)
+                if self._network is not None and self._network._index is not None:
+                    for patient in department.patients:
+                        self._network._index.remove(patient.person_id, department)
+                if self._roles is not None:
+                    for staff_member in department.staff:
+                        self._roles.remove(staff_member)
+                patients, staff, checked_in_patients, checked_in_staff = department._counts()
+                self._adjust_totals(-patients, -staff, -checked_in_patients, -checked_in_staff)
+            if self.events:
+                self.events.publish(
+                    "department_removed", f"Department '{department_name}' removed from {self.name}.", self.name
+                )
+            return True
+        if self.events:
+            self.events.publish(
+                "department_not_found", f"Department '{department_name}' not found in {self.name}.", self.name
+            )
         return False
 
+    @reads
     def find_department(self, department_name):
         """
         Find and return a department by name.
@@ -105,11 +217,9 @@ class Hospital:
         """
         if not department_name or not isinstance(department_name, str):
             raise ValueError("Department name must be a non-empty string.")
-        for dept in self.departments:
-            if dept.name == department_name:
-                return dept
-        return None
+        return self._departments.get(department_name)
 
+    @reads
     def list_departments(self):
         """
         Print an enumerated list of department names.
@@ -118,29 +228,293 @@ class Hospital:
             int: Number of departments.
         """
         print(f"\nDepartments in {self.name}:")
-        if not self.departments:
+        if not self._departments:
             print("  No departments available.")
         else:
-            for idx, dept in enumerate(self.departments, 1):
-                print(f"  {idx}. {dept.name}")
-        return len(self.departments)
+            for idx, name in enumerate(self._departments, 1):
+                print(f"  {idx}. {name}")
+        return len(self._departments)
 
+    @reads
     def get_total_patients(self):
         """Return total number of patients across all departments."""
-        return sum(dept.get_patient_count() for dept in self.departments)
+        return self._total_patients
 
+    @reads
     def get_total_staff(self):
         """Return total number of staff across all departments."""
-        return sum(dept.get_staff_count() for dept in self.departments)
+        return self._total_staff
+
+    @reads
+    def get_checked_in_patients(self):
+        """Return number of patients currently checked in across all departments."""
+        return self._checked_in_patients
+
+    @reads
+    def get_checked_in_staff(self):
+        """Return number of staff currently checked in across all departments."""
+        return self._checked_in_staff
+
+    def totals(self):
+        """
+        Read all four hospital-wide totals as one consistent snapshot.
+
+        Returns:
+            tuple[int, int, int, int]: Patients, staff, checked-in patients
+                and checked-in staff.
+        """
+        with self._shared:
+            return self._total_patients, self._total_staff, self._checked_in_patients, self._checked_in_staff
+
+    @reads
+    def age_histogram(self, bin_width=10, as_of=None, staff=False):
+        """
+        Count patients (or staff) per age bracket across all departments.
+
+        Every department's ages are computed in one batch against a single
+        reference date shared by the whole hospital.
+
+        Args:
+            bin_width (int): Width of each age bracket in years.
+            as_of (date | None): Reference date; defaults to today.
+            staff (bool): Count staff members instead of patients.
+
+        Returns:
+            dict[int, int]: Count per bracket, keyed by the bracket's lower
+                bound, in ascending order.
+
+        Raises:
+            ValueError: If bin_width is not a positive integer.
+        """
+        as_of = as_of or date.today()
+        totals = {}
+        for dept in self.departments:
+            ages = dept.ages(as_of, staff)
+            for lower, count in demographics.histogram(ages, bin_width).items():
+                totals[lower] = totals.get(lower, 0) + count
+        return dict(sorted(totals.items()))
+
+    @property
+    @reads
+    def record_index(self):
+        """
+        Inverted index over every patient's medical record.
+
+        Built from all departments on first access; from then on it is kept
+        current as patients join or leave departments and records change.
+
+        Returns:
+            RecordIndex: The index.
+        """
+        with self._departments_locked(), self._shared:
+            if self._record_index is None:
+                index = RecordIndex()
+                for dept in self._departments.values():
+                    for patient in dept.patients:
+                        index.add_member(patient.person_id, patient.medical_record)
+                self._record_index = index
+            return self._record_index
+
+    @reads
+    def search_records(self, query):
+        """
+        Find patients whose medical record matches a query.
+
+        Args:
+            query (str): Terms combined with implicit AND, 'OR', 'NOT'/'-'
+                and trailing '*' for prefixes, e.g. ``"diab* -type1"``.
+
+        Returns:
+            list[tuple[Department, Patient]]: Every matching patient with
+                each department holding them, ordered by person_id.
+
+        Raises:
+            ValueError: If the query has no terms.
+        """
+        index = self.record_index
+        with self._shared:
+            found = index.search(query)
+        matches = []
+        for person_id in found:
+            for dept in self.departments:
+                patient = dept.patients.get(person_id)
+                if patient is not None:
+                    matches.append((dept, patient))
+        return matches
+
+    @reads
+    def search_names(self, query, k=10, staff=False):
+        """
+        Find patients (or staff members) by name across all departments.
+
+        Each department answers from its own name index; the best k of
+        all departments' results are returned.
+
+        Args:
+            query (str): Name or part of a name, as typed so far.
+            k (int): Maximum number of results.
+            staff (bool): Search staff members instead of patients.
+
+        Returns:
+            list[tuple[Department, Person]]: Up to k (department, member)
+                pairs, best match first.
+        """
+        scored = []
+        for dept in self.departments:
+            members = dept.staff if staff else dept.patients
+            with dept._lock:
+                found = members.name_index().search(query, k)
+            scored.extend((score, -person_id, dept, members) for score, person_id in found)
+        scored.sort(key=lambda item: item[:2], reverse=True)
+        return [(dept, members.get(-neg_id)) for _, neg_id, dept, members in scored[:k]]
+
+    @reads
+    def role_index(self):
+        """
+        Return the index of all departments' staff by role, building it on first use.
+
+        From then on it is kept current as staff join or leave departments,
+        check in or out, or change position.
+
+        Returns:
+            RoleIndex: The index; a staff member in several departments is listed once.
+        """
+        with self._departments_locked(), self._shared:
+            if self._roles is None:
+                roles = RoleIndex()
+                for dept in self._departments.values():
+                    for staff_member in dept.staff:
+                        roles.add(staff_member)
+                self._roles = roles
+            return self._roles
+
+    def staff_by_role(self, role, checked_in=None):
+        """
+        List the hospital's staff members holding a role, across all departments.
+
+        Args:
+            role (Role | str): The role, e.g. ``Role.DOCTOR`` or 'doctor'.
+            checked_in (bool | None): True for only checked-in members,
+                False for only checked-out ones, None for all.
+
+        Returns:
+            list[Staff]: Matching staff members, each listed once.
+
+        Raises:
+            ValueError: If role is not a known role.
+        """
+        index = self.role_index()
+        with self._shared:
+            return index.members(role, checked_in)
+
+    @reads
+    def on_shift(self, when=None, role=None):
+        """
+        List the staff members on shift at a given time, department by department.
+
+        Args:
+            when (float | datetime | None): Unix timestamp, local datetime or None for now.
+            role (Role | str | None): Only staff holding this role.
+
+        Returns:
+            list[tuple[Department, Staff]]: A (department, staff member) pair
+                for every department where the member is on shift.
+
+        Raises:
+            ValueError: If role is not a known role.
+        """
+        return [(dept, member) for dept in self.departments for member in dept.on_shift(when, role)]
+
+    def attach_journal(self, journal):
+        """
+        Record every check-in and check-out of the hospital's members in a journal.
+
+        Args:
+            journal (EventJournal | None): Journal to append to, or None to detach.
+        """
+        self.journal = journal
+
+    def _departments_locked(self):
+        """
+        Hold every department's lock, in registry order, e.g. while building a hospital-wide index.
+
+        The caller must hold the registry lock (read or write) first, as
+        the lock order requires; the registry then cannot change under the
+        walk, so the departments must be read from ``self._departments``
+        and not through the ``departments`` property. No other thread holds
+        two department locks at once, so taking them all in a fixed order
+        cannot deadlock.
+
+        Returns:
+            ExitStack: Context manager releasing the locks on exit.
+        """
+        stack = ExitStack()
+        if self.concurrent:
+            for department in self._departments.values():
+                stack.enter_context(department._lock)
+        return stack
+
+    def _on_member_status_change(self, department, member, active, at=None):
+        """Journal a member's check-in/check-out once, even if several departments hold them."""
+        if self.journal is None:
+            return
+        for holder in getattr(member, "_memberships", ()):
+            if holder._hospital is self:
+                if holder is not department:
+                    return
+                break
+        self.journal.append(member.person_id, active, timestamp=at)
+
+    def _register(self, department):
+        """Validate a department and add it to the registry and the totals."""
+        if not isinstance(department, Department):
+            raise TypeError("department must be a Department instance.")
+        if not department.name or not department.name.strip():
+            raise ValueError("Department must have a non-empty name.")
+        if department.name in self._departments:
+            raise ValueError(f"Department '{department.name}' already exists in {self.name}.")
+        if department._hospital is not None:
+            raise ValueError(
+                f"Department '{department.name}' already belongs to {department._hospital.name}."
+            )
+
+        if self.concurrent:
+            department._enable_concurrency()
+        self._departments[department.name] = department
+        self._department_list = None
+        with department._lock, self._shared:
+            department._hospital = self
+            self._adjust_totals(*department._counts())
+            if self._record_index is not None:
+                for patient in department.patients:
+                    self._record_index.add_member(patient.person_id, patient.medical_record)
+            if self._network is not None and self._network._index is not None:
+                for patient in department.patients:
+                    self._network._index.add(patient, department)
+            if self._roles is not None:
+                for staff_member in department.staff:
+                    self._roles.add(staff_member)
+
+    def _adjust_totals(self, patients=0, staff=0, checked_in_patients=0, checked_in_staff=0):
+        """Apply a change reported by one of the departments to the running totals."""
+        with self._shared:
+            self._total_patients += patients
+            self._total_staff += staff
+            self._checked_in_patients += checked_in_patients
+            self._checked_in_staff += checked_in_staff
 
+    @reads
     def view_hospital_info(self):
         """Print full hospital information including departments, patients, and staff."""
+        patients, staff, checked_in_patients, checked_in_staff = self.totals()
         print("\n" + "=" * 50)
         print(f"HOSPITAL: {self.name}")
         print(f"Location: {self.location}")
         print(f"Total Departments: {len(self.departments)}")
-        print(f"Total Patients: {self.get_total_patients()}")
-        print(f"Total Staff: {self.get_total_staff()}")
+        print(f"Total Patients: {patients}")
+        print(f"Total Staff: {staff}")
+        print(f"Checked-in Patients: {checked_in_patients}")
+        print(f"Checked-in Staff: {checked_in_staff}")
         for dept in self.departments:
             print(f"\nDepartment: {dept.name} | Staff: {len(dept.staff)} | Patients: {len(dept.patients)}")
         print("=" * 50)
@@ -0,0 +1,202 @@
+# core/locks.py
+"""
+Locks for driving a hospital from several threads at once.
+
+Concurrency is opt-in through ``Hospital.enable_concurrency()``. Until
+then every lock used by hospitals and departments is ``NO_LOCK``, whose
+acquire and release do nothing, so single-threaded use pays only for an
+empty ``with`` block.
+
+With concurrency enabled:
+
+- the hospital's department registry is guarded by a ``RWLock``: adding
+  and removing departments write, listing and reporting read, so any
+  number of reporting threads run side by side;
+- each department has its own reentrant lock, so terminals working in
+  different departments do not wait for each other;
+- the hospital-wide totals and indexes that every department feeds are
+  guarded by one short-held lock;
+- check-in and check-out of a person are atomic under one of a fixed set
+  of striped locks chosen by ``person_id`` (see ``Person``).
+
+Locks are always taken in that order: a person's stripe, then a
+department, then the hospital-wide lock. The registry lock is never
+requested while a department lock is held.
+"""
+import threading
+from functools import wraps
+
+
+class _NoLock:
+    """Stand-in for a lock or RWLock when concurrency is off; every operation is a no-op."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def read_lock(self):
+        return self
+
+    def write_lock(self):
+        return self
+
+    def __repr__(self):
+        return "NO_LOCK"
+
+
+NO_LOCK = _NoLock()
+
+
+class RWLock:
+    """
+    Reentrant reader/writer lock that prefers writers.
+
+    Any number of threads may hold the read lock together; the write lock
+    is exclusive. New readers wait while a writer is waiting, so a steady
+    stream of reports cannot starve registry changes. A thread that
+    already holds the read or write lock may take the read lock again, and
+    a writer may re-enter the write lock; upgrading a read lock to a write
+    lock is refused because two upgrading readers would deadlock.
+    """
+
+    def __init__(self):
+        """Initialize an unlocked RWLock."""
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = {}
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._read = _Guard(self.acquire_read, self.release_read)
+        self._write = _Guard(self.acquire_write, self.release_write)
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return (
+            f"RWLock(readers={sum(self._readers.values())}, writer={self._writer is not None}, "
+            f"waiting_writers={self._waiting_writers})"
+        )
+
+    def read_lock(self):
+        """Return a context manager holding the read lock."""
+        return self._read
+
+    def write_lock(self):
+        """Return a context manager holding the write lock."""
+        return self._write
+
+    def acquire_read(self):
+        """Block until the read lock is held by the calling thread."""
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me or me in self._readers:
+                self._readers[me] = self._readers.get(me, 0) + 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers[me] = 1
+
+    def release_read(self):
+        """
+        Release one hold of the read lock.
+
+        Raises:
+            RuntimeError: If the calling thread does not hold the read lock.
+        """
+        me = threading.get_ident()
+        with self._cond:
+            count = self._readers.get(me)
+            if count is None:
+                raise RuntimeError("Cannot release a read lock that is not held.")
+            if count > 1:
+                self._readers[me] = count - 1
+                return
+            del self._readers[me]
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self):
+        """
+        Block until the write lock is held by the calling thread.
+
+        Raises:
+            RuntimeError: If the calling thread holds only the read lock.
+        """
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a read lock to a write lock.")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_write(self):
+        """
+        Release one hold of the write lock.
+
+        Raises:
+            RuntimeError: If the calling thread does not hold the write lock.
+        """
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError("Cannot release a write lock that is not held.")
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+
+class _Guard:
+    """Reusable context manager calling an acquire and a release function."""
+
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._release()
+        return False
+
+
+def synchronized(method):
+    """Run a department method while holding the department's lock (``self._lock``)."""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+
+def reads(method):
+    """Run a hospital method under the read side of its registry lock (``self._rw``)."""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._rw.read_lock():
+            return method(self, *args, **kwargs)
+    return locked
+
+
+def writes(method):
+    """Run a hospital method under the write side of its registry lock (``self._rw``)."""
+    @wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._rw.write_lock():
+            return method(self, *args, **kwargs)
+    return locked
@@ -0,0 +1,180 @@
+# core/names.py
+"""
+Fuzzy name lookup for type-ahead member selection.
+
+Each word of a name is padded (``"  ann "``) and cut into trigrams; every
+trigram maps to the set of person_ids whose name contains it. A query is
+cut the same way, candidates are counted over the query's trigrams only,
+and each is scored by the Dice coefficient of the two trigram sets, so
+typos and partial words still match. Names with a word starting with
+every query word get a bonus, which a sorted word list answers with a
+binary search per query word, so typing a prefix ranks those names first.
+"""
+from bisect import bisect_left, insort
+from heapq import nlargest
+
+PREFIX_BONUS = 1.0
+
+
+def normalize(name):
+    """
+    Lower-case a name and collapse its whitespace.
+
+    Args:
+        name (str): Name to normalize.
+
+    Returns:
+        str: The normalized name.
+    """
+    return " ".join(name.lower().split())
+
+
+def trigrams(text):
+    """
+    Return the trigrams of every word of an already normalized text.
+
+    Args:
+        text (str): Normalized text.
+
+    Returns:
+        set[str]: Trigrams, with words padded by two leading spaces and one trailing.
+    """
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class NameIndex:
+    """
+    Trigram and word-prefix index over the names of one group of members.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._names = {}
+        self._gram_counts = {}
+        self._postings = {}
+        self._words = []
+
+    def __len__(self):
+        """Return the number of indexed names."""
+        return len(self._names)
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"NameIndex(names={len(self._names)}, trigrams={len(self._postings)})"
+
+    def add(self, person_id, name):
+        """
+        Index a member's name, replacing any earlier entry for the same ID.
+
+        Args:
+            person_id (int): ID of the member.
+            name (str): The member's name.
+        """
+        if person_id in self._names:
+            self.discard(person_id)
+        for word in self._insert(person_id, name):
+            insort(self._words, (word, person_id))
+
+    def update(self, members):
+        """
+        Index many names at once, sorting the word list once at the end.
+
+        Args:
+            members (iterable[tuple[int, str]]): (person_id, name) pairs of
+                members not indexed yet.
+        """
+        words = self._words
+        for person_id, name in members:
+            if person_id in self._names:
+                self.discard(person_id)
+            words.extend((word, person_id) for word in self._insert(person_id, name))
+        words.sort()
+
+    def discard(self, person_id):
+        """
+        Remove a member's name if it is indexed.
+
+        Args:
+            person_id (int): ID of the member.
+        """
+        text = self._names.pop(person_id, None)
+        if text is None:
+            return
+        del self._gram_counts[person_id]
+        for gram in trigrams(text):
+            posting = self._postings[gram]
+            posting.discard(person_id)
+            if not posting:
+                del self._postings[gram]
+        for word in set(text.split()):
+            del self._words[bisect_left(self._words, (word, person_id))]
+
+    def search(self, query, k=10):
+        """
+        Return the best-matching members for a partial or misspelled name.
+
+        Args:
+            query (str): What the operator typed so far.
+            k (int): Maximum number of results.
+
+        Returns:
+            list[tuple[float, int]]: (score, person_id) pairs, best first.
+                Scores are between 0 and 1, plus PREFIX_BONUS for names with
+                a word starting with every query word.
+        """
+        text = normalize(query)
+        if not text or k <= 0:
+            return []
+        query_grams = trigrams(text)
+        shared = {}
+        postings = self._postings
+        for gram in query_grams:
+            for person_id in postings.get(gram, ()):
+                shared[person_id] = shared.get(person_id, 0) + 1
+        prefixed = self._prefixed(text.split())
+        for person_id in prefixed:
+            shared.setdefault(person_id, 0)
+
+        size = len(query_grams)
+        counts = self._gram_counts
+        scored = (
+            (2 * n / (size + counts[person_id]) + (PREFIX_BONUS if person_id in prefixed else 0), person_id)
+            for person_id, n in shared.items()
+        )
+        best = nlargest(k, scored, key=lambda item: (item[0], -item[1]))
+        return [(round(score, 4), person_id) for score, person_id in best]
+
+    def _insert(self, person_id, name):
+        """Add a name's trigrams and return its distinct words for the word list."""
+        text = normalize(name)
+        grams = trigrams(text)
+        self._names[person_id] = text
+        self._gram_counts[person_id] = len(grams)
+        postings = self._postings
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {person_id}
+            else:
+                posting.add(person_id)
+        return set(text.split())
+
+    def _prefixed(self, query_words):
+        """IDs whose name has, for every query word, a word starting with it."""
+        words = self._words
+        result = None
+        for prefix in query_words:
+            matches = set()
+            for i in range(bisect_left(words, (prefix,)), len(words)):
+                word, person_id = words[i]
+                if not word.startswith(prefix):
+                    break
+                matches.add(person_id)
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result
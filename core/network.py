@@ -0,0 +1,375 @@
+# core/network.py
+"""
+Group of hospitals sharing a master patient index.
+
+A ``HospitalNetwork`` holds many ``Hospital`` instances and a master
+patient index (MPI): a hash map from a patient's match key to every
+department, at every site, holding a patient with that key. The key is
+the patient's name folded to a canonical form (case, accents,
+punctuation and spacing ignored) together with their date of birth, so
+"José  O'Neil" and "jose oneil" born the same day meet in one bucket.
+
+Finding a patient across the network, or checking whether a new patient
+is already registered somewhere, is one hash lookup instead of a scan of
+every hospital, department and patient. Two different person IDs under
+the same key are likely duplicates; those keys are tracked as they
+appear, so listing them does not scan the index either.
+
+The index is built on first use and from then on kept current by the
+member hospitals and their departments as patients join or leave.
+"""
+import re
+import threading
+import unicodedata
+from contextlib import ExitStack
+
+from .hospital import Hospital
+
+# Apostrophes are dropped ("O'Neil" == "ONeil"); other punctuation separates words.
+_ELIDED = str.maketrans("", "", "'\u2019`")
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def match_key(name, date_of_birth):
+    """
+    Return the key under which a patient is filed in the master index.
+
+    Args:
+        name (str): The patient's name.
+        date_of_birth (date): The patient's date of birth.
+
+    Returns:
+        tuple[str, date]: The folded name and the date of birth.
+    """
+    folded = name.casefold()
+    if not folded.isascii():
+        folded = "".join(ch for ch in unicodedata.normalize("NFKD", folded) if not unicodedata.combining(ch))
+    if not folded.replace(" ", "").isalnum():
+        folded = _SEPARATORS.sub(" ", folded.translate(_ELIDED))
+    return " ".join(folded.split()), date_of_birth
+
+
+class MasterPatientIndex:
+    """
+    Hash index from match key to the departments holding matching patients.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._buckets = {}
+        self._keys = {}
+        self._conflicts = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of distinct patients (person IDs) indexed."""
+        return len(self._keys)
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"MasterPatientIndex(patients={len(self._keys)}, duplicate_keys={len(self._conflicts)})"
+
+    def add(self, patient, department):
+        """
+        File a patient as held by a department.
+
+        Args:
+            patient (Patient | PatientView): The patient.
+            department (Department): The department holding them; filing
+                the same pair again changes nothing.
+        """
+        person_id = patient.person_id
+        with self._lock:
+            key = self._keys.get(person_id)
+            if key is None:
+                key = self._keys[person_id] = match_key(patient.name, patient.date_of_birth)
+            bucket = self._buckets.setdefault(key, {})
+            holders = bucket.setdefault(person_id, [])
+            if department not in holders:
+                holders.append(department)
+            if len(bucket) > 1:
+                self._conflicts.add(key)
+
+    def remove(self, person_id, department):
+        """
+        Forget that a department holds a patient.
+
+        Args:
+            person_id (int): ID of the patient.
+            department (Department): The department that no longer holds them.
+        """
+        with self._lock:
+            key = self._keys.get(person_id)
+            if key is None:
+                return
+            bucket = self._buckets[key]
+            holders = bucket[person_id]
+            if department in holders:
+                holders.remove(department)
+            if holders:
+                return
+            del bucket[person_id]
+            del self._keys[person_id]
+            if len(bucket) < 2:
+                self._conflicts.discard(key)
+            if not bucket:
+                del self._buckets[key]
+
+    def lookup(self, name, date_of_birth):
+        """
+        Return the patients filed under a name and date of birth.
+
+        Args:
+            name (str): Name in any spelling that folds to the same key.
+            date_of_birth (date): Date of birth.
+
+        Returns:
+            dict[int, list[Department]]: Departments holding each matching person ID.
+        """
+        with self._lock:
+            bucket = self._buckets.get(match_key(name, date_of_birth), {})
+            return {person_id: list(holders) for person_id, holders in bucket.items()}
+
+    def conflicts(self):
+        """
+        Return every key shared by more than one person ID.
+
+        Returns:
+            list[dict[int, list[Department]]]: One mapping per key, as ``lookup`` returns.
+        """
+        with self._lock:
+            return [
+                {person_id: list(holders) for person_id, holders in self._buckets[key].items()}
+                for key in self._conflicts
+            ]
+
+
+class HospitalNetwork:
+    """
+    Group of hospitals with a shared master patient index.
+
+    Attributes:
+        name (str): Name of the network.
+        hospitals (tuple): Member hospitals, in the order they joined.
+    """
+
+    def __init__(self, name):
+        """
+        Initialize an empty network.
+
+        Args:
+            name (str): Name of the network. Must be non-empty string.
+
+        Raises:
+            ValueError: If name is empty or not a string.
+        """
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Network name must be a non-empty string.")
+        self.name = name.strip()
+        self._hospitals = {}
+        self._index = None
+        self._lock = threading.Lock()
+
+    def __str__(self):
+        """Return a readable summary of the network."""
+        return f"Network: {self.name} | Hospitals: {len(self._hospitals)}"
+
+    def __repr__(self):
+        """Return detailed representation for debugging."""
+        return f"HospitalNetwork(name={self.name!r}, hospitals={list(self._hospitals)!r})"
+
+    @property
+    def hospitals(self):
+        """tuple[Hospital]: Member hospitals, in the order they joined."""
+        with self._lock:
+            return tuple(self._hospitals.values())
+
+    def add_hospital(self, hospital):
+        """
+        Add a hospital to the network.
+
+        Args:
+            hospital (Hospital): Hospital to add.
+
+        Raises:
+            TypeError: If hospital is not a Hospital instance.
+            ValueError: If a hospital with that name is already in the
+                network or it belongs to another network.
+        """
+        if not isinstance(hospital, Hospital):
+            raise TypeError("hospital must be a Hospital instance.")
+        with self._lock, _locked(hospital):
+            if hospital.name in self._hospitals:
+                raise ValueError(f"Hospital '{hospital.name}' already exists in {self.name}.")
+            if hospital._network is not None:
+                raise ValueError(f"Hospital '{hospital.name}' already belongs to {hospital._network.name}.")
+            self._hospitals[hospital.name] = hospital
+            hospital._network = self
+            if self._index is not None:
+                for dept in hospital._departments.values():
+                    for patient in dept.patients:
+                        self._index.add(patient, dept)
+
+    def remove_hospital(self, hospital_name):
+        """
+        Remove a hospital from the network by name.
+
+        Args:
+            hospital_name (str): Name of the hospital.
+
+        Returns:
+            bool: True if removed, False if not found.
+        """
+        with self._lock:
+            hospital = self._hospitals.pop(hospital_name, None)
+            if hospital is None:
+                return False
+            with _locked(hospital):
+                hospital._network = None
+                if self._index is not None:
+                    for dept in hospital._departments.values():
+                        for patient in dept.patients:
+                            self._index.remove(patient.person_id, dept)
+        return True
+
+    def find_hospital(self, hospital_name):
+        """
+        Find a member hospital by name.
+
+        Args:
+            hospital_name (str): Name of the hospital.
+
+        Returns:
+            Hospital | None: The hospital if found, else None.
+        """
+        with self._lock:
+            return self._hospitals.get(hospital_name)
+
+    @property
+    def master_index(self):
+        """
+        Master patient index over every patient of every member hospital.
+
+        Built on first access; from then on kept current as patients join
+        or leave departments and departments or hospitals are added or removed.
+
+        Returns:
+            MasterPatientIndex: The index.
+        """
+        with self._lock:
+            if self._index is None:
+                # Published first so departments report changes made while
+                # later hospitals are still being read; filing twice is harmless.
+                self._index = MasterPatientIndex()
+                for hospital in self._hospitals.values():
+                    with _locked(hospital):
+                        for dept in hospital._departments.values():
+                            for patient in dept.patients:
+                                self._index.add(patient, dept)
+            return self._index
+
+    def find_patient(self, name, date_of_birth):
+        """
+        Find every record of a patient across the network.
+
+        Args:
+            name (str): The patient's name; case, accents, punctuation and
+                spacing do not matter.
+            date_of_birth (date): The patient's date of birth.
+
+        Returns:
+            list[tuple[Hospital, Department, Patient]]: One entry per department
+                holding a matching patient, ordered by person_id.
+        """
+        return _resolve(self.master_index.lookup(name, date_of_birth))
+
+    def duplicates_of(self, patient):
+        """
+        Find records of other patients with the same name and date of birth.
+
+        Use it before registering a new patient to catch someone already
+        known at another site.
+
+        Args:
+            patient (Patient): The patient to check; need not be in any department.
+
+        Returns:
+            list[tuple[Hospital, Department, Patient]]: Matching records with
+                a different person_id, ordered by person_id.
+        """
+        found = self.master_index.lookup(patient.name, patient.date_of_birth)
+        found.pop(patient.person_id, None)
+        return _resolve(found)
+
+    def duplicate_groups(self):
+        """
+        List the groups of different patients sharing a name and date of birth.
+
+        Returns:
+            list[list[tuple[Hospital, Department, Patient]]]: One group per
+                shared key, each as ``find_patient`` returns it.
+        """
+        return [_resolve(group) for group in self.master_index.conflicts()]
+
+    def add_patient(self, hospital_name, department_name, patient, allow_duplicates=False):
+        """
+        Register a patient at a site after checking the whole network for duplicates.
+
+        Args:
+            hospital_name (str): Name of the member hospital.
+            department_name (str): Name of the department in that hospital.
+            patient (Patient): The patient to add.
+            allow_duplicates (bool): Add even if another patient with the
+                same name and date of birth is registered somewhere.
+
+        Raises:
+            ValueError: If the hospital or department does not exist, or a
+                likely duplicate exists and ``allow_duplicates`` is False.
+        """
+        hospital = self.find_hospital(hospital_name)
+        if hospital is None:
+            raise ValueError(f"Hospital '{hospital_name}' not found in {self.name}.")
+        department = hospital.find_department(department_name)
+        if department is None:
+            raise ValueError(f"Department '{department_name}' not found in {hospital_name}.")
+        if not allow_duplicates:
+            duplicates = self.duplicates_of(patient)
+            if duplicates:
+                where = ", ".join(f"#{p.person_id} at {h.name}/{d.name}" for h, d, p in duplicates)
+                raise ValueError(f"'{patient.name}' may already be registered: {where}.")
+        department.add_patient(patient)
+
+    def totals(self):
+        """
+        Add up the totals of every member hospital.
+
+        Returns:
+            tuple[int, int, int, int]: Patients, staff, checked-in patients
+                and checked-in staff.
+        """
+        return tuple(map(sum, zip((0, 0, 0, 0), *(h.totals() for h in self.hospitals))))
+
+
+def _locked(hospital):
+    """
+    Hold a hospital's registry read lock, every department lock and its shared lock, in lock order.
+
+    Returns:
+        ExitStack: Context manager releasing the locks on exit.
+    """
+    stack = ExitStack()
+    stack.enter_context(hospital._rw.read_lock())
+    stack.enter_context(hospital._departments_locked())
+    stack.enter_context(hospital._shared)
+    return stack
+
+
+def _resolve(found):
+    """Turn ``{person_id: [departments]}`` into (hospital, department, patient) tuples."""
+    resolved = []
+    for person_id in sorted(found):
+        for dept in found[person_id]:
+            patient = dept.patients.get(person_id)
+            if patient is not None:
+                resolved.append((dept._hospital, dept, patient))
+    return resolved
@@ -0,0 +1,292 @@
+# core/occupancy.py
+"""
+Check-in history of one department as an index of time intervals.
+
+Every check-in opens an interval for a person and the matching check-out
+closes it. Closed intervals are kept sorted by start time in parallel
+arrays, with a second sorted array of end times and a max-end segment
+tree over the start order:
+
+- occupancy at an instant is two binary searches (starts so far minus
+  ends so far), O(log n);
+- the people present at an instant or during a range are found by
+  descending the segment tree only into subtrees whose latest end falls
+  after the query start, O(log n + k) for k matching intervals;
+- peak occupancy over a range starts from the occupancy at its beginning
+  and sweeps only the endpoints inside it, O(log n + k).
+
+Check-ins normally arrive in time order, so intervals are appended and
+the tree is updated in O(log n). A back-dated interval is inserted in
+place and the tree is rebuilt on the next query.
+
+Times are Unix timestamps; ``datetime`` values are accepted everywhere
+and converted with ``timestamp()``.
+"""
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from heapq import merge
+
+_NEG_INF = float("-inf")
+_POS_INF = float("inf")
+
+
+def timestamp(value=None):
+    """
+    Normalize a point in time to a Unix timestamp.
+
+    Args:
+        value (float | int | datetime | None): Time to convert; None means now.
+
+    Returns:
+        float: Seconds since the epoch.
+
+    Raises:
+        TypeError: If value is not a number, datetime or None.
+    """
+    if value is None:
+        return time.time()
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    raise TypeError("Time must be a Unix timestamp or a datetime.")
+
+
+class OccupancyIndex:
+    """
+    Interval index over check-in/check-out history.
+
+    A person can have any number of closed intervals but at most one open
+    one (checked in and not yet out). Intervals are half-open: a person
+    checked in at ``start`` and out at ``end`` is present for
+    ``start <= t < end``.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._starts = array("d")
+        self._ends = array("d")
+        self._ids = array("q")
+        self._end_order = array("d")
+        self._open = {}
+        self._open_starts = []
+        self._tree = None
+        self._capacity = 0
+
+    def __len__(self):
+        """Return the number of intervals, open and closed."""
+        return len(self._starts) + len(self._open)
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"OccupancyIndex(closed={len(self._starts)}, open={len(self._open)})"
+
+    def is_open(self, person_id):
+        """
+        Check whether a person currently has an open interval.
+
+        Args:
+            person_id (int): ID of the person.
+
+        Returns:
+            bool: True if checked in and not yet out.
+        """
+        return person_id in self._open
+
+    def open(self, person_id, at=None):
+        """
+        Start an interval for a person.
+
+        Args:
+            person_id (int): ID of the person checking in.
+            at (float | datetime | None): Check-in time; defaults to now.
+
+        Returns:
+            bool: False if the person already had an open interval.
+        """
+        if person_id in self._open:
+            return False
+        start = timestamp(at)
+        self._open[person_id] = start
+        insort(self._open_starts, (start, person_id))
+        return True
+
+    def close(self, person_id, at=None):
+        """
+        End a person's open interval.
+
+        A check-out time earlier than the check-in is treated as the
+        check-in time, giving an empty interval.
+
+        Args:
+            person_id (int): ID of the person checking out.
+            at (float | datetime | None): Check-out time; defaults to now.
+
+        Returns:
+            bool: False if the person had no open interval.
+        """
+        start = self._open.pop(person_id, None)
+        if start is None:
+            return False
+        del self._open_starts[bisect_left(self._open_starts, (start, person_id))]
+        self._add_closed(person_id, start, max(start, timestamp(at)))
+        return True
+
+    def count_at(self, when):
+        """
+        Count the people present at an instant.
+
+        Args:
+            when (float | datetime): Instant to look at.
+
+        Returns:
+            int: Number of open or closed intervals containing ``when``.
+        """
+        t = timestamp(when)
+        closed = bisect_right(self._starts, t) - bisect_right(self._end_order, t)
+        return closed + bisect_right(self._open_starts, (t, _POS_INF))
+
+    def present_at(self, when):
+        """
+        List the people present at an instant.
+
+        Args:
+            when (float | datetime): Instant to look at.
+
+        Returns:
+            list[int]: IDs of people present, without duplicates.
+        """
+        t = timestamp(when)
+        return self._overlapping(bisect_right(self._starts, t), t, (t, _POS_INF))
+
+    def present_between(self, start, end):
+        """
+        List the people present at any time during ``[start, end)``.
+
+        Args:
+            start (float | datetime): Beginning of the range.
+            end (float | datetime): End of the range (exclusive).
+
+        Returns:
+            list[int]: IDs of people present, without duplicates.
+
+        Raises:
+            ValueError: If end is before start.
+        """
+        t0, t1 = _range(start, end)
+        if t0 == t1:
+            return self.present_at(t0)
+        return self._overlapping(bisect_left(self._starts, t1), t0, (t1, _NEG_INF))
+
+    def peak(self, start, end):
+        """
+        Find the highest occupancy during ``[start, end)``.
+
+        Args:
+            start (float | datetime): Beginning of the range.
+            end (float | datetime): End of the range (exclusive).
+
+        Returns:
+            tuple[int, float]: Peak number of people present and the first
+                time it was reached.
+
+        Raises:
+            ValueError: If end is before start.
+        """
+        t0, t1 = _range(start, end)
+        current = best = self.count_at(t0)
+        best_at = t0
+        starts = self._starts
+        opens = self._open_starts
+        ends = self._end_order
+        arrivals = merge(
+            (starts[i] for i in range(bisect_right(starts, t0), bisect_left(starts, t1))),
+            (opens[i][0] for i in range(
+                bisect_right(opens, (t0, _POS_INF)), bisect_left(opens, (t1, _NEG_INF)))),
+        )
+        departures = (ends[i] for i in range(bisect_right(ends, t0), bisect_left(ends, t1)))
+        # At equal times departures sort first: intervals are half-open.
+        events = merge(((t, -1) for t in departures), ((t, 1) for t in arrivals))
+        pending_at = None
+        for t, delta in events:
+            if pending_at is not None and t != pending_at and current > best:
+                best, best_at = current, pending_at
+            current += delta
+            pending_at = t
+        if pending_at is not None and current > best:
+            best, best_at = current, pending_at
+        return best, best_at
+
+    def _add_closed(self, person_id, start, end):
+        starts = self._starts
+        if not starts or start >= starts[-1]:
+            position = len(starts)
+            starts.append(start)
+            self._ends.append(end)
+            self._ids.append(person_id)
+            if self._tree is not None:
+                if position < self._capacity:
+                    self._update(position, end)
+                else:
+                    self._tree = None
+        else:
+            position = bisect_right(starts, start)
+            starts.insert(position, start)
+            self._ends.insert(position, end)
+            self._ids.insert(position, person_id)
+            self._tree = None
+        insort(self._end_order, end)
+
+    def _build(self):
+        """Rebuild the max-end segment tree with room to grow."""
+        n = len(self._ends)
+        capacity = 1
+        while capacity < max(n, 1) * 2:
+            capacity *= 2
+        tree = array("d", [_NEG_INF]) * (2 * capacity)
+        tree[capacity:capacity + n] = self._ends
+        for node in range(capacity - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            tree[node] = left if left > right else right
+        self._tree = tree
+        self._capacity = capacity
+
+    def _update(self, position, end):
+        tree = self._tree
+        node = position + self._capacity
+        tree[node] = end
+        node >>= 1
+        while node and tree[node] < end:
+            tree[node] = end
+            node >>= 1
+
+    def _overlapping(self, prefix, after, open_bound):
+        """IDs with a closed interval among the first ``prefix`` starts ending after ``after``, plus open ones."""
+        if self._tree is None:
+            self._build()
+        tree, capacity, ids = self._tree, self._capacity, self._ids
+        found = {}
+        stack = [(1, 0, capacity)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= prefix or tree[node] <= after:
+                continue
+            if node >= capacity:
+                found[ids[low]] = None
+                continue
+            mid = (low + high) // 2
+            stack.append((2 * node + 1, mid, high))
+            stack.append((2 * node, low, mid))
+        opens = self._open_starts
+        for i in range(bisect_left(opens, open_bound)):
+            found[opens[i][1]] = None
+        return list(found)
+
+
+def _range(start, end):
+    t0, t1 = timestamp(start), timestamp(end)
+    if t1 < t0:
+        raise ValueError("end must not be before start.")
+    return t0, t1
@@ -0,0 +1,641 @@
+# core/patient_table.py
+from array import array
+from datetime import date
+
+from .demographics import keys_from_ordinals
+from .locks import NO_LOCK
+from .names import NameIndex
+from models.medical_record import MedicalRecord
+from models.patient import Patient
+from models.person import Status
+
+
+class PatientView:
+    """
+    Lightweight, Patient-like view of one row of a PatientTable.
+
+    Views hold only the table and the patient's ID; every attribute is
+    read from (or written to) the table's columns on access, so creating
+    one per row while iterating costs no per-patient storage.
+
+    Attributes:
+        person_id (int): ID of the patient this view refers to.
+    """
+
+    __slots__ = ("_table", "person_id")
+
+    def __init__(self, table, person_id):
+        """
+        Initialize a view.
+
+        Args:
+            table (PatientTable): Table holding the patient's row.
+            person_id (int): ID of the patient.
+        """
+        self._table = table
+        self.person_id = person_id
+
+    @property
+    def _row(self):
+        return self._table._row_of[self.person_id]
+
+    @property
+    def name(self):
+        """str: Full name of the patient."""
+        table = self._table
+        return table._strings[table._name_refs[self._row]]
+
+    @name.setter
+    def name(self, value):
+        if not value or not value.strip():
+            raise ValueError("Name cannot be empty")
+        self._table._name_refs[self._row] = self._table._intern(value)
+        if self._table._names is not None:
+            self._table._names.add(self.person_id, value)
+
+    @property
+    def date_of_birth(self):
+        """date: Date of birth of the patient."""
+        return date.fromordinal(self._table._dobs[self._row])
+
+    @property
+    def medical_record(self):
+        """str: The patient's medical record text."""
+        log = self._table._logs.get(self.person_id)
+        if log is not None:
+            return log.render()
+        return self._table._read_record(self._row)
+
+    @medical_record.setter
+    def medical_record(self, value):
+        if not value or not value.strip():
+            raise ValueError("Medical record cannot be empty")
+        self._table._logs.pop(self.person_id, None)
+        self._table._write_record(self._row, value)
+        if self._table._department is not None:
+            self._table._department._on_record_change(self, value, replace=True)
+
+    @property
+    def _record(self):
+        """MedicalRecord | str: The record log if one exists, else the stored text."""
+        log = self._table._logs.get(self.person_id)
+        return log if log is not None else self._table._read_record(self._row)
+
+    @property
+    def record(self):
+        """MedicalRecord: Append-only log of the patient's record entries."""
+        return self._table._log(self.person_id)
+
+    @property
+    def status(self):
+        """str: 'in' if the patient is checked in, 'out' otherwise."""
+        return Status.IN.value if self._table._is_active(self._row) else Status.OUT.value
+
+    @status.setter
+    def status(self, value):
+        with self._status_lock():
+            self._table._set_active(self._row, Status(value) is Status.IN)
+
+    def __str__(self):
+        """Return a readable string including name, age, medical record, and status."""
+        return (
+            f"Name: {self.name}, Age: {self.get_age()}, "
+            f"Medical Record: {self.medical_record}, Status: {self.status}"
+        )
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return (
+            f"PatientView(person_id={self.person_id!r}, name={self.name!r}, "
+            f"date_of_birth={self.date_of_birth!r}, status={self.status!r})"
+        )
+
+    def __eq__(self, other):
+        """Views are equal when they refer to the same row of the same table."""
+        return (
+            isinstance(other, PatientView)
+            and other._table is self._table
+            and other.person_id == self.person_id
+        )
+
+    def __hash__(self):
+        """Hash consistently with __eq__."""
+        return hash((id(self._table), self.person_id))
+
+    def get_age(self):
+        """
+        Calculate the patient's current age in years.
+
+        Returns:
+            int: The current age of the patient.
+        """
+        today = date.today()
+        dob = self.date_of_birth
+        age = today.year - dob.year
+        if (today.month, today.day) < (dob.month, dob.day):
+            age -= 1
+        return age
+
+    def is_adult(self):
+        """
+        Determine whether the patient is legally an adult.
+
+        Returns:
+            bool: True if the patient is 18 years or older, False otherwise.
+        """
+        return self.get_age() >= 18
+
+    def view_info(self):
+        """
+        Provide a readable summary of the patient's basic information.
+
+        Returns:
+            str: Name and age of the patient in a formatted string.
+        """
+        return f"Name: {self.name}, Age: {self.get_age()}"
+
+    def view_record(self):
+        """
+        View the patient's medical record.
+
+        Returns:
+            str: Formatted medical record string.
+        """
+        return f"Medical Record for {self.name}: {self.medical_record}"
+
+    def add_record_entry(self, kind, text, author=None):
+        """
+        Append an entry to the patient's medical record.
+
+        Args:
+            kind (EntryKind): Type of the entry.
+            text (str): Entry details.
+            author (str | None): Name of the staff member writing it.
+
+        Returns:
+            RecordEntry: The new entry.
+
+        Raises:
+            ValueError: If text is empty.
+        """
+        entry = self.record.append(kind, text, author)
+        if self._table._department is not None:
+            self._table._department._on_record_change(self, str(entry))
+        return entry
+
+    def record_entries(self, offset=0, limit=None):
+        """
+        Read the medical record one page at a time.
+
+        Args:
+            offset (int): Number of entries to skip.
+            limit (int | None): Maximum number of entries; None for all.
+
+        Returns:
+            list[RecordEntry]: The requested entries, oldest first.
+        """
+        return self.record.entries(offset, limit)
+
+    def check_in(self, at=None):
+        """
+        Mark the patient as checked in.
+
+        Args:
+            at (float | datetime | None): When it happened; defaults to now.
+
+        Returns:
+            str: Confirmation message.
+        """
+        with self._status_lock():
+            changed = self._table._set_active(self._row, True, at)
+        if not changed:
+            return f"{self.name} is already checked in."
+        return f"{self.name} has checked in."
+
+    def check_out(self, at=None):
+        """
+        Mark the patient as checked out.
+
+        Args:
+            at (float | datetime | None): When it happened; defaults to now.
+
+        Returns:
+            str: Confirmation message.
+        """
+        with self._status_lock():
+            changed = self._table._set_active(self._row, False, at)
+        if not changed:
+            return f"{self.name} is already checked out."
+        return f"{self.name} has checked out."
+
+    def _status_lock(self):
+        """Return the lock guarding this row's check-in state: the owning department's."""
+        return self._table._guard()
+
+    def is_active(self):
+        """
+        Check if the patient is currently active (checked in).
+
+        Returns:
+            bool: True if checked in, False otherwise.
+        """
+        return self._table._is_active(self._row)
+
+
+class PatientTable:
+    """
+    Columnar (struct-of-arrays) store for the patients of one department.
+
+    Instead of one Python object per patient, each field lives in its own
+    compact column:
+
+    - names are interned in a string table and stored as ``uint32`` refs;
+    - dates of birth are stored as ``int32`` proleptic Gregorian ordinals;
+    - check-in status is a bitmap, one bit per row;
+    - medical records are UTF-8 bytes in one shared buffer, addressed by
+      per-row offset and length. A patient only gets a ``MedicalRecord``
+      log object once an entry is appended to their record.
+
+    The table offers the same container interface as ``MemberIndex``
+    (``add``, ``get``, ``pop``, ``remove``, ``len``, iteration and
+    positional access), yielding ``PatientView`` objects, so a
+    ``Department`` can use it as a drop-in ``patients`` store. Status and
+    age filters run directly over the columns.
+
+    Patients added as ``Patient`` objects are copied into the table; later
+    changes must go through the views, not the original objects.
+
+    Attributes:
+        _row_of (dict): Mapping of person_id to row number.
+    """
+
+    def __init__(self, department=None):
+        """
+        Initialize an empty table.
+
+        Args:
+            department (Department | None): Department notified of check-in
+                and check-out transitions made through the views.
+        """
+        self._department = department
+        self._row_of = {}
+        self._ids = array("q")
+        self._name_refs = array("I")
+        self._dobs = array("i")
+        self._active_bits = bytearray()
+        self._deleted_bits = bytearray()
+        self._record_start = array("Q")
+        self._record_len = array("I")
+        self._records = bytearray()
+        self._logs = {}
+        self._strings = []
+        self._string_refs = {}
+        self._deleted = 0
+        self._live_rows = None
+        self._names = None
+
+    def __len__(self):
+        """Return the number of live patients."""
+        return len(self._row_of)
+
+    def __iter__(self):
+        """Yield a PatientView per live patient, in insertion order."""
+        ids = self._ids
+        for row in self._live():
+            yield PatientView(self, ids[row])
+
+    def __getitem__(self, position):
+        """Return the view (or list of views) at the given position."""
+        rows = self._live()
+        if isinstance(position, slice):
+            return [PatientView(self, self._ids[row]) for row in rows[position]]
+        return PatientView(self, self._ids[rows[position]])
+
+    def __contains__(self, item):
+        """Check membership by person_id or by patient/view object."""
+        key = item if isinstance(item, int) else getattr(item, "person_id", None)
+        return key in self._row_of
+
+    def __repr__(self):
+        """Return a short representation; rows are not expanded."""
+        return f"PatientTable(rows={len(self)}, checked_in={self.count_checked_in()})"
+
+    def add(self, patient):
+        """
+        Copy a patient into the table.
+
+        Args:
+            patient (Patient): Patient object to store.
+
+        Returns:
+            PatientView: View of the new row.
+
+        Raises:
+            ValueError: If the patient is already in the table.
+        """
+        view = self.add_row(
+            patient.name,
+            patient.date_of_birth,
+            patient.medical_record,
+            patient.is_active(),
+            patient.person_id,
+        )
+        record = patient._record
+        if not isinstance(record, str) and len(record) > 1:
+            self._logs[view.person_id] = record
+        return view
+
+    def add_row(self, name, date_of_birth, medical_record, checked_in=False, person_id=None):
+        """
+        Append a patient row from already-validated field values.
+
+        This is the low-level insert used by the table itself; it does not
+        update department or hospital counters. Add patients through the
+        owning ``Department`` to keep those totals current.
+
+        Args:
+            name (str): Full name of the patient.
+            date_of_birth (date): Date of birth.
+            medical_record (str): Medical record text.
+            checked_in (bool): Initial check-in state.
+            person_id (int | None): Existing ID; a new one is drawn if None.
+
+        Returns:
+            PatientView: View of the new row.
+
+        Raises:
+            ValueError: If a row with the same person_id already exists.
+        """
+        if person_id is None:
+            person_id = next(Patient._id_counter)
+        elif person_id in self._row_of:
+            raise ValueError(f"'{name}' (#{person_id}) is already a member.")
+
+        row = len(self._ids)
+        if row % 8 == 0:
+            self._active_bits.append(0)
+            self._deleted_bits.append(0)
+        self._ids.append(person_id)
+        self._name_refs.append(self._intern(name))
+        self._dobs.append(date_of_birth.toordinal())
+        self._record_start.append(0)
+        self._record_len.append(0)
+        self._write_record(row, medical_record)
+        if checked_in:
+            self._active_bits[row >> 3] |= 1 << (row & 7)
+        self._row_of[person_id] = row
+        if self._live_rows is not None:
+            self._live_rows.append(row)
+        if self._names is not None:
+            self._names.add(person_id, name)
+        return PatientView(self, person_id)
+
+    def get(self, person_id, default=None):
+        """
+        Return a view of the patient with the given ID.
+
+        Args:
+            person_id (int): ID of the patient.
+            default: Value returned if the ID is unknown.
+
+        Returns:
+            PatientView | None: A view if found, else ``default``.
+        """
+        if person_id not in self._row_of:
+            return default
+        return PatientView(self, person_id)
+
+    def pop(self, person_id, default=None):
+        """
+        Remove a patient and return them as a detached Patient object.
+
+        Args:
+            person_id (int): ID of the patient to remove.
+            default: Value returned if the ID is unknown.
+
+        Returns:
+            Patient | None: The removed patient if found, else ``default``.
+        """
+        row = self._row_of.pop(person_id, None)
+        if row is None:
+            return default
+        patient = self._materialize(row)
+        self._logs.pop(person_id, None)
+        self._active_bits[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+        self._deleted_bits[row >> 3] |= 1 << (row & 7)
+        self._deleted += 1
+        self._live_rows = None
+        if self._names is not None:
+            self._names.discard(person_id)
+        if self._deleted > 1024 and self._deleted * 2 > len(self._ids):
+            self.compact()
+        return patient
+
+    def remove(self, person_id):
+        """
+        Remove a patient and return them as a detached Patient object.
+
+        Args:
+            person_id (int): ID of the patient to remove.
+
+        Returns:
+            Patient: The removed patient.
+
+        Raises:
+            KeyError: If no patient has the given ID.
+        """
+        patient = self.pop(person_id)
+        if patient is None:
+            raise KeyError(person_id)
+        return patient
+
+    def ids(self):
+        """Return a view of the patient IDs."""
+        return self._row_of.keys()
+
+    def search_names(self, query, k=10):
+        """
+        Find patients by partial or misspelled name.
+
+        Args:
+            query (str): Name or part of a name, as typed so far.
+            k (int): Maximum number of results.
+
+        Returns:
+            list[PatientView]: Up to k best-matching patients, best first.
+        """
+        return [PatientView(self, person_id) for _, person_id in self.name_index().search(query, k)]
+
+    def name_index(self):
+        """
+        Return the trigram index over patient names, building it on first use.
+
+        Returns:
+            NameIndex: The index.
+        """
+        if self._names is None:
+            names = NameIndex()
+            names.update((view.person_id, view.name) for view in self)
+            self._names = names
+        return self._names
+
+    def count_checked_in(self):
+        """
+        Count checked-in patients by counting set bits in the status bitmap.
+
+        Returns:
+            int: Number of checked-in patients.
+        """
+        return int.from_bytes(self._active_bits, "little").bit_count()
+
+    def select(self, checked_in=None, min_age=None, max_age=None, as_of=None):
+        """
+        Return the IDs of patients matching status and age filters.
+
+        Age bounds are translated into a date-of-birth ordinal range once,
+        so the scan compares plain integers per row.
+
+        Args:
+            checked_in (bool | None): Required check-in state, or None for any.
+            min_age (int | None): Minimum age in whole years, inclusive.
+            max_age (int | None): Maximum age in whole years, inclusive.
+            as_of (date | None): Reference date for ages; defaults to today.
+
+        Returns:
+            list[int]: Matching person IDs in insertion order.
+        """
+        as_of = as_of or date.today()
+        low = -(2**31)
+        high = 2**31 - 1
+        if min_age is not None:
+            high = _years_before(as_of, min_age).toordinal()
+        if max_age is not None:
+            low = _years_before(as_of, max_age + 1).toordinal() + 1
+
+        ids, dobs, bits = self._ids, self._dobs, self._active_bits
+        result = []
+        for row in self._live():
+            if not low <= dobs[row] <= high:
+                continue
+            if checked_in is not None and bool(bits[row >> 3] >> (row & 7) & 1) != checked_in:
+                continue
+            result.append(ids[row])
+        return result
+
+    def dob_keys(self):
+        """
+        Return the live rows' dates of birth as YYYYMMDD keys.
+
+        Returns:
+            numpy.ndarray | array: int32 keys in insertion order.
+        """
+        if self._deleted:
+            dobs = array("i", (self._dobs[row] for row in self._live()))
+        else:
+            dobs = self._dobs
+        return keys_from_ordinals(dobs)
+
+    def compact(self):
+        """Drop removed rows and unreferenced record bytes, rebuilding the columns."""
+        rows = self._live()
+        old_ids, old_names, old_dobs = self._ids, self._name_refs, self._dobs
+        old_bits = self._active_bits
+        records = [self._read_record(row) for row in rows]
+
+        self._row_of = {}
+        self._ids = array("q")
+        self._name_refs = array("I")
+        self._dobs = array("i")
+        self._active_bits = bytearray((len(rows) + 7) // 8)
+        self._deleted_bits = bytearray((len(rows) + 7) // 8)
+        self._record_start = array("Q")
+        self._record_len = array("I")
+        self._records = bytearray()
+        for new_row, (row, record) in enumerate(zip(rows, records)):
+            self._ids.append(old_ids[row])
+            self._name_refs.append(old_names[row])
+            self._dobs.append(old_dobs[row])
+            self._record_start.append(0)
+            self._record_len.append(0)
+            self._write_record(new_row, record)
+            if old_bits[row >> 3] >> (row & 7) & 1:
+                self._active_bits[new_row >> 3] |= 1 << (new_row & 7)
+            self._row_of[old_ids[row]] = new_row
+        self._deleted = 0
+        self._live_rows = None
+        self._names = None
+
+    def _live(self):
+        """Return live row numbers in insertion order."""
+        if not self._deleted:
+            return range(len(self._ids))
+        if self._live_rows is None:
+            deleted = self._deleted_bits
+            self._live_rows = array(
+                "q", (row for row in range(len(self._ids)) if not deleted[row >> 3] >> (row & 7) & 1)
+            )
+        return self._live_rows
+
+    def _intern(self, text):
+        ref = self._string_refs.get(text)
+        if ref is None:
+            ref = len(self._strings)
+            self._strings.append(text)
+            self._string_refs[text] = ref
+        return ref
+
+    def _log(self, person_id):
+        """Return the patient's record log, creating it from the buffer on first use."""
+        log = self._logs.get(person_id)
+        if log is None:
+            log = self._logs[person_id] = MedicalRecord(self._read_record(self._row_of[person_id]))
+        return log
+
+    def _read_record(self, row):
+        start = self._record_start[row]
+        return self._records[start:start + self._record_len[row]].decode("utf-8")
+
+    def _write_record(self, row, text):
+        data = text.encode("utf-8")
+        self._record_start[row] = len(self._records)
+        self._record_len[row] = len(data)
+        self._records += data
+
+    def _is_active(self, row):
+        return bool(self._active_bits[row >> 3] >> (row & 7) & 1)
+
+    def _guard(self):
+        """Return the owning department's lock, which guards rows shared with neighbours in a status byte."""
+        return NO_LOCK if self._department is None else self._department._lock
+
+    def _set_active(self, row, active, at=None):
+        """Set a row's status bit; return True if it changed."""
+        if self._is_active(row) == active:
+            return False
+        if active:
+            self._active_bits[row >> 3] |= 1 << (row & 7)
+        else:
+            self._active_bits[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+        if self._department is not None:
+            self._department._on_member_status_change(PatientView(self, self._ids[row]), active, at)
+        return True
+
+    def _materialize(self, row):
+        """Build a detached Patient object from a row."""
+        person_id = self._ids[row]
+        log = self._logs.get(person_id)
+        return Patient._restore(
+            person_id,
+            self._strings[self._name_refs[row]],
+            date.fromordinal(self._dobs[row]),
+            Status.IN if self._is_active(row) else Status.OUT,
+            record=log if log is not None else self._read_record(row),
+        )
+
+
+def _years_before(as_of, years):
+    """Return the date ``years`` years before ``as_of`` (Feb 29 maps to Feb 28)."""
+    try:
+        return as_of.replace(year=as_of.year - years)
+    except ValueError:
+        return as_of.replace(year=as_of.year - years, day=28)
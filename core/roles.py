@@ -0,0 +1,158 @@
+# core/roles.py
+"""
+Index of staff members by normalized role.
+
+Each role maps to the staff members holding it, and a second mapping
+holds only those currently checked in, so "which doctors are on site" is
+a dictionary lookup plus O(k) to copy out the k matches instead of a
+scan over every staff member's name and position.
+
+Departments keep one index over their own staff; the hospital keeps one
+over all departments and counts memberships, so a staff member working
+in several departments is listed once and forgotten when the last
+department lets them go.
+"""
+from models.staff import Role
+
+
+def role(value):
+    """
+    Normalize a role argument.
+
+    Args:
+        value (Role | str): A Role member or its value, e.g. 'doctor'.
+
+    Returns:
+        Role: The role.
+
+    Raises:
+        ValueError: If value is not a known role.
+    """
+    return value if isinstance(value, Role) else Role(value)
+
+
+class RoleIndex:
+    """
+    Staff members grouped by role, with a checked-in subset per role.
+    """
+
+    def __init__(self, members=()):
+        """
+        Initialize an index, optionally populated from an iterable of staff.
+
+        Args:
+            members (iterable[Staff]): Staff members to index.
+        """
+        self._members = {}
+        self._active = {}
+        self._refs = {}
+        for member in members:
+            self.add(member)
+
+    def __len__(self):
+        """Return the number of indexed staff members."""
+        return len(self._refs)
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"RoleIndex({self.counts()!r})"
+
+    def add(self, member):
+        """
+        Index a staff member, or count one more membership.
+
+        Args:
+            member (Staff): The staff member.
+        """
+        refs = self._refs.get(member.person_id, 0)
+        self._refs[member.person_id] = refs + 1
+        if not refs:
+            self._members.setdefault(member.role, {})[member.person_id] = member
+            if member.is_active():
+                self._active.setdefault(member.role, {})[member.person_id] = member
+
+    def remove(self, member):
+        """
+        Count one membership less; drop the staff member when none are left.
+
+        Args:
+            member (Staff): The staff member.
+        """
+        refs = self._refs.get(member.person_id)
+        if refs is None:
+            return
+        if refs > 1:
+            self._refs[member.person_id] = refs - 1
+            return
+        del self._refs[member.person_id]
+        for groups in (self._members, self._active):
+            group = groups.get(member.role)
+            if group is not None:
+                group.pop(member.person_id, None)
+
+    def set_active(self, member, active):
+        """
+        Move an indexed staff member in or out of the checked-in subset.
+
+        Args:
+            member (Staff): The staff member who checked in or out.
+            active (bool): True if they are now checked in.
+        """
+        if member.person_id not in self._refs:
+            return
+        if active:
+            self._active.setdefault(member.role, {})[member.person_id] = member
+        else:
+            group = self._active.get(member.role)
+            if group is not None:
+                group.pop(member.person_id, None)
+
+    def change_role(self, member, old):
+        """
+        Re-file an indexed staff member whose role changed.
+
+        Args:
+            member (Staff): The staff member, already carrying the new role.
+            old (Role): The role they were indexed under.
+        """
+        for groups in (self._members, self._active):
+            group = groups.get(old)
+            if group is not None and group.pop(member.person_id, None) is not None:
+                groups.setdefault(member.role, {})[member.person_id] = member
+
+    def members(self, value, checked_in=None):
+        """
+        Return the staff members holding a role.
+
+        Args:
+            value (Role | str): The role.
+            checked_in (bool | None): True for only checked-in members,
+                False for only checked-out ones, None for all.
+
+        Returns:
+            list[Staff]: Matching staff members in the order they were indexed.
+
+        Raises:
+            ValueError: If value is not a known role.
+        """
+        value = role(value)
+        if checked_in:
+            return list(self._active.get(value, {}).values())
+        members = self._members.get(value, {})
+        if checked_in is None:
+            return list(members.values())
+        active = self._active.get(value, {})
+        return [member for person_id, member in members.items() if person_id not in active]
+
+    def counts(self, checked_in=False):
+        """
+        Count staff members per role.
+
+        Args:
+            checked_in (bool): Count only checked-in members.
+
+        Returns:
+            dict[Role, int]: Number of members per role, omitting empty roles.
+        """
+        groups = self._active if checked_in else self._members
+        return {value: len(group) for value, group in groups.items() if group}
@@ -0,0 +1,204 @@
+# core/search.py
+"""
+Inverted full-text index over patients' medical records.
+
+Record text is split into lower-case word tokens. Each token maps to the
+set of person_ids whose record contains it, and the vocabulary is also
+kept as a sorted list so prefix queries are a binary search plus a walk
+over the matching terms.
+
+Query syntax:
+
+- ``flu fever``        both terms (AND is implicit)
+- ``flu OR cold``      either term; OR binds loosest
+- ``-cold``, ``NOT cold``  exclude patients with the term
+- ``diab*``            any term starting with ``diab``
+
+A patient is indexed once no matter how many departments hold them; the
+index counts memberships and forgets the patient when the last one goes.
+Appended record entries only add postings; replacing a record re-indexes
+the patient.
+"""
+import re
+from bisect import bisect_left, insort
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """
+    Split text into distinct lower-case word tokens.
+
+    Args:
+        text (str): Text to split.
+
+    Returns:
+        set[str]: The tokens.
+    """
+    return set(_TOKEN.findall(text.lower()))
+
+
+class RecordIndex:
+    """
+    Incrementally maintained inverted index of medical record terms.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self._postings = {}
+        self._terms = []
+        self._doc_terms = {}
+        self._refs = {}
+
+    def __len__(self):
+        """Return the number of indexed patients."""
+        return len(self._refs)
+
+    def __contains__(self, person_id):
+        """Return True if the patient is indexed."""
+        return person_id in self._refs
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"RecordIndex(patients={len(self._refs)}, terms={len(self._terms)})"
+
+    def add_member(self, person_id, text):
+        """
+        Index a patient who joined a department, or count one more membership.
+
+        Args:
+            person_id (int): ID of the patient.
+            text (str): Their medical record text.
+        """
+        refs = self._refs.get(person_id, 0)
+        self._refs[person_id] = refs + 1
+        if not refs:
+            self._add_terms(person_id, tokenize(text))
+
+    def remove_member(self, person_id):
+        """
+        Count one membership less; drop the patient when none are left.
+
+        Args:
+            person_id (int): ID of the patient.
+        """
+        refs = self._refs.get(person_id)
+        if refs is None:
+            return
+        if refs > 1:
+            self._refs[person_id] = refs - 1
+            return
+        del self._refs[person_id]
+        self._drop_terms(person_id)
+
+    def add_text(self, person_id, text):
+        """
+        Index text appended to an indexed patient's record.
+
+        Args:
+            person_id (int): ID of the patient.
+            text (str): The new entry's text.
+        """
+        if person_id in self._refs:
+            self._add_terms(person_id, tokenize(text))
+
+    def replace_text(self, person_id, text):
+        """
+        Re-index an indexed patient whose whole record was replaced.
+
+        Args:
+            person_id (int): ID of the patient.
+            text (str): The new record text.
+        """
+        if person_id in self._refs:
+            self._drop_terms(person_id)
+            self._add_terms(person_id, tokenize(text))
+
+    def lookup(self, term):
+        """
+        Return the patients whose record contains a term or, for ``term*``, a prefix.
+
+        Args:
+            term (str): A single word, optionally ending with '*'.
+
+        Returns:
+            set[int]: Matching person_ids.
+        """
+        term = term.lower()
+        if term.endswith("*"):
+            prefix = term[:-1]
+            terms = self._terms
+            matches = set()
+            for i in range(bisect_left(terms, prefix), len(terms)):
+                if not terms[i].startswith(prefix):
+                    break
+                matches |= self._postings[terms[i]]
+            return matches
+        return set(self._postings.get(term, ()))
+
+    def search(self, query):
+        """
+        Evaluate a boolean query.
+
+        Args:
+            query (str): Terms combined with implicit AND, 'OR', 'NOT'/'-'
+                and trailing '*' for prefixes.
+
+        Returns:
+            list[int]: Matching person_ids in ascending order.
+
+        Raises:
+            ValueError: If the query has no terms.
+        """
+        groups = [[]]
+        negate = False
+        for word in query.split():
+            if word == "OR":
+                groups.append([])
+            elif word == "NOT":
+                negate = True
+            else:
+                if word.startswith("-") and len(word) > 1:
+                    negate, word = True, word[1:]
+                # 'covid-19' is indexed as 'covid' and '19'; require both.
+                tokens = _TOKEN.findall(word.rstrip("*"))
+                if tokens and word.endswith("*"):
+                    tokens[-1] += "*"
+                groups[-1].extend((token, negate) for token in tokens)
+                negate = False
+        if not any(groups):
+            raise ValueError("Search query must contain at least one term.")
+
+        result = set()
+        for group in groups:
+            if not group:
+                continue
+            include = [self.lookup(term) for term, negated in group if not negated]
+            exclude = [self.lookup(term) for term, negated in group if negated]
+            if include:
+                include.sort(key=len)
+                matches = include[0].intersection(*include[1:])
+            else:
+                matches = set(self._refs)
+            result |= matches.difference(*exclude)
+        return sorted(result)
+
+    def _add_terms(self, person_id, terms):
+        known = self._doc_terms.setdefault(person_id, set())
+        postings = self._postings
+        for term in terms - known:
+            posting = postings.get(term)
+            if posting is None:
+                posting = postings[term] = set()
+                insort(self._terms, term)
+            posting.add(person_id)
+        known |= terms
+
+    def _drop_terms(self, person_id):
+        postings = self._postings
+        for term in self._doc_terms.pop(person_id, ()):
+            posting = postings[term]
+            posting.discard(person_id)
+            if not posting:
+                del postings[term]
+                del self._terms[bisect_left(self._terms, term)]
@@ -0,0 +1,671 @@
+# core/sharding.py
+"""
+Hospital whose departments are spread over worker processes.
+
+One interpreter runs Python code on one core at a time, so reporting,
+search and age analytics over a large hospital cannot use more than one
+core. ``ShardedHospital`` partitions the departments over worker
+processes (shards), each holding an ordinary ``Hospital`` with its share
+of the departments. The coordinator in the calling process only keeps
+the department-to-shard map:
+
+- calls about one department (adding patients, check-in, discharge, ...)
+  are routed to the shard owning it;
+- hospital-wide aggregates (totals, age histogram, record and name
+  search) are sent to every shard at once and the partial results are
+  merged, so the shards work in parallel.
+
+Messages are pickled tuples of plain values. People travel as compact
+rows (ID, name, date of birth as an ordinal, status, record or position
+and schedule) and come back as light ``(department, person_id, name)``
+tuples, never as objects. Person IDs are drawn in the coordinating
+process, so they stay unique across shards.
+
+A department is copied to its shard when added; later changes to the
+local ``Department`` object are not seen. A person added to departments
+on two different shards becomes two independent copies, so check-ins do
+not carry over between them. The coordinator is not thread-safe; use it
+from one thread.
+
+Every request gets exactly one reply, read even when another shard of
+the same broadcast failed, so the pipes never fall out of step. When a
+broadcast is cut short (e.g. by Ctrl+C), replies still owed by the other
+shards are read and discarded before their next request; the shard
+whose pipe was being read or written at that moment may hold half a
+message, so it is restarted empty and its departments are dropped from
+the hospital. Workers are spawned, so a script creating a
+``ShardedHospital`` must do so under ``if __name__ == "__main__":``.
+"""
+import multiprocessing
+import os
+import pickle
+from datetime import date
+
+from models.patient import Patient
+from models.staff import Staff
+
+from . import events
+from .department import Department
+from .hospital import Hospital
+
+_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+# Exceptions re-raised in the coordinator with their own type; others become RuntimeError.
+_ERRORS = {cls.__name__: cls for cls in (ValueError, TypeError, KeyError)}
+
+
+class ShardedHospital:
+    """
+    Coordinator of a hospital partitioned over worker processes.
+
+    Usable as a context manager that shuts the workers down.
+
+    Attributes:
+        name (str): Name of the hospital.
+        location (str): Physical location of the hospital.
+        shards (int): Number of worker processes.
+        events (EventBus): Bus that department add/remove notifications are published on.
+    """
+
+    def __init__(self, name, location, shards=None):
+        """
+        Initialize the coordinator and start the workers.
+
+        Args:
+            name (str): Name of the hospital. Must be non-empty string.
+            location (str): Physical location. Must be non-empty string.
+            shards (int | None): Number of worker processes; defaults to the number of CPUs.
+
+        Raises:
+            ValueError: If name or location is empty or shards is not positive.
+        """
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Hospital name must be a non-empty string.")
+        if not isinstance(location, str) or not location.strip():
+            raise ValueError("Hospital location must be a non-empty string.")
+        shards = shards or os.cpu_count() or 1
+        if not isinstance(shards, int) or shards <= 0:
+            raise ValueError("shards must be a positive integer.")
+        self.name = name.strip()
+        self.location = location.strip()
+        self.shards = shards
+        self.events = events.default_bus
+        self._owner = {}
+        self._per_shard = [0] * shards
+        self._pipes = [None] * shards
+        self._owed = [0] * shards
+        self._workers = [None] * shards
+        for shard in range(shards):
+            self._start(shard)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __str__(self):
+        """Return a readable summary of the hospital."""
+        return f"Hospital: {self.name} | Location: {self.location} | Departments: {len(self._owner)}"
+
+    def __repr__(self):
+        """Return detailed representation for debugging."""
+        return f"ShardedHospital(name={self.name!r}, location={self.location!r}, shards={self.shards})"
+
+    def close(self):
+        """Stop the worker processes; the departments they hold are discarded."""
+        for pipe in self._pipes:
+            try:
+                pipe.send_bytes(pickle.dumps(("stop", ()), _PROTOCOL))
+            except OSError:
+                pass
+            pipe.close()
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        self._pipes = []
+        self._workers = []
+        self._owed = []
+
+    @property
+    def departments(self):
+        """tuple[RemoteDepartment]: Handles of the departments, in insertion order."""
+        return tuple(RemoteDepartment(self, name) for name in self._owner)
+
+    def add_department(self, department):
+        """
+        Copy a department, with its patients and staff, to the least busy shard.
+
+        Args:
+            department (Department): Department to add; it is not kept here.
+
+        Returns:
+            RemoteDepartment: Handle routing calls to the department's shard.
+
+        Raises:
+            TypeError: If department is not a Department instance.
+            ValueError: If department name is empty or already exists.
+        """
+        if not isinstance(department, Department):
+            raise TypeError("department must be a Department instance.")
+        if not department.name or not department.name.strip():
+            raise ValueError("Department must have a non-empty name.")
+        if department.name in self._owner:
+            raise ValueError(f"Department '{department.name}' already exists in {self.name}.")
+        shard = min(range(self.shards), key=self._per_shard.__getitem__)
+        self._call(shard, "add_department", department.name, department._columnar,
+                   [_pack(p) for p in department.patients], [_pack(s) for s in department.staff])
+        self._owner[department.name] = shard
+        self._per_shard[shard] += 1
+        if self.events:
+            self.events.publish(
+                "department_added", f"Department '{department.name}' added to {self.name}.", self.name
+            )
+        return RemoteDepartment(self, department.name)
+
+    def remove_department(self, department_name):
+        """
+        Remove a department by name.
+
+        Args:
+            department_name (str): Name of the department to remove.
+
+        Returns:
+            bool: True if removed, False if not found.
+        """
+        shard = self._owner.pop(department_name, None)
+        if shard is None:
+            return False
+        self._call(shard, "remove_department", department_name)
+        self._per_shard[shard] -= 1
+        if self.events:
+            self.events.publish(
+                "department_removed", f"Department '{department_name}' removed from {self.name}.", self.name
+            )
+        return True
+
+    def find_department(self, department_name):
+        """
+        Find a department by name.
+
+        Args:
+            department_name (str): Name of the department to find.
+
+        Returns:
+            RemoteDepartment | None: Handle of the department if found, else None.
+
+        Raises:
+            ValueError: If department_name is empty.
+        """
+        if not department_name or not isinstance(department_name, str):
+            raise ValueError("Department name must be a non-empty string.")
+        return RemoteDepartment(self, department_name) if department_name in self._owner else None
+
+    def shard_of(self, department_name):
+        """
+        Return the index of the shard holding a department.
+
+        Args:
+            department_name (str): Name of the department.
+
+        Returns:
+            int: Shard index, from 0 to ``shards - 1``.
+
+        Raises:
+            KeyError: If the department does not exist.
+        """
+        return self._owner[department_name]
+
+    def totals(self):
+        """
+        Add up the totals of every shard.
+
+        Returns:
+            tuple[int, int, int, int]: Patients, staff, checked-in patients
+                and checked-in staff.
+        """
+        return tuple(map(sum, zip(*self._broadcast("totals"))))
+
+    def get_total_patients(self):
+        """Return total number of patients across all departments."""
+        return self.totals()[0]
+
+    def get_total_staff(self):
+        """Return total number of staff across all departments."""
+        return self.totals()[1]
+
+    def get_checked_in_patients(self):
+        """Return number of patients currently checked in across all departments."""
+        return self.totals()[2]
+
+    def get_checked_in_staff(self):
+        """Return number of staff currently checked in across all departments."""
+        return self.totals()[3]
+
+    def age_histogram(self, bin_width=10, as_of=None, staff=False):
+        """
+        Count patients (or staff) per age bracket across all departments.
+
+        Args:
+            bin_width (int): Width of each age bracket in years.
+            as_of (date | None): Reference date shared by all shards; defaults to today.
+            staff (bool): Count staff members instead of patients.
+
+        Returns:
+            dict[int, int]: Count per bracket, keyed by the bracket's lower
+                bound, in ascending order.
+
+        Raises:
+            ValueError: If bin_width is not a positive integer.
+        """
+        totals = {}
+        for partial in self._broadcast("age_histogram", bin_width, as_of or date.today(), staff):
+            for lower, count in partial.items():
+                totals[lower] = totals.get(lower, 0) + count
+        return dict(sorted(totals.items()))
+
+    def search_records(self, query):
+        """
+        Find patients whose medical record matches a query.
+
+        Args:
+            query (str): Terms as for ``Hospital.search_records``.
+
+        Returns:
+            list[tuple[str, int, str]]: (department name, person_id, name)
+                per match, ordered by person_id.
+
+        Raises:
+            ValueError: If the query has no terms.
+        """
+        matches = [match for partial in self._broadcast("search_records", query) for match in partial]
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+    def search_names(self, query, k=10, staff=False):
+        """
+        Find patients (or staff members) by name across all departments.
+
+        Args:
+            query (str): Name or part of a name, as typed so far.
+            k (int): Maximum number of results.
+            staff (bool): Search staff members instead of patients.
+
+        Returns:
+            list[tuple[str, int, str]]: Up to k (department name, person_id,
+                name) tuples, best match first.
+        """
+        scored = [hit for partial in self._broadcast("search_names", query, k, staff) for hit in partial]
+        scored.sort(key=lambda hit: (hit[0], -hit[1]), reverse=True)
+        return [(dept, person_id, name) for _, person_id, dept, name in scored[:k]]
+
+    def view_hospital_info(self):
+        """Print the hospital's totals and every department's counts."""
+        patients, staff, checked_in_patients, checked_in_staff = self.totals()
+        counts = {}
+        for partial in self._broadcast("department_counts"):
+            counts.update(partial)
+        print("\n" + "=" * 50)
+        print(f"HOSPITAL: {self.name}")
+        print(f"Location: {self.location}")
+        print(f"Total Departments: {len(self._owner)}")
+        print(f"Total Patients: {patients}")
+        print(f"Total Staff: {staff}")
+        print(f"Checked-in Patients: {checked_in_patients}")
+        print(f"Checked-in Staff: {checked_in_staff}")
+        for name in self._owner:
+            dept_patients, dept_staff = counts[name][:2]
+            print(f"\nDepartment: {name} | Staff: {dept_staff} | Patients: {dept_patients}")
+        print("=" * 50)
+
+    def _route(self, department_name, op, *args):
+        """Run an operation on the shard owning a department."""
+        shard = self._owner.get(department_name)
+        if shard is None:
+            raise KeyError(f"Department '{department_name}' not found in {self.name}.")
+        return self._call(shard, op, department_name, *args)
+
+    def _call(self, shard, op, *args):
+        return self._exchange([shard], op, args)[0]
+
+    def _broadcast(self, op, *args):
+        """Run an operation on every shard in parallel and return their results in shard order."""
+        return self._exchange(range(self.shards), op, args)
+
+    def _exchange(self, shards, op, args):
+        """
+        Send one request to each of the given shards and collect every reply.
+
+        All replies are read before any error is raised, so no reply is
+        left queued for a later call. If the exchange is interrupted, the
+        shard being talked to is restarted and the others' owed replies
+        are discarded on their next exchange.
+
+        Raises:
+            Exception: The first shard error, re-raised in shard order.
+        """
+        message = pickle.dumps((op, args), _PROTOCOL)
+        shards = list(shards)
+        replies = []
+        current = None
+        try:
+            for current in shards:
+                pipe = self._pipes[current]
+                while self._owed[current]:
+                    pipe.recv_bytes()
+                    self._owed[current] -= 1
+                pipe.send_bytes(message)
+                self._owed[current] += 1
+            for current in shards:
+                replies.append(self._pipes[current].recv_bytes())
+                self._owed[current] -= 1
+        except BaseException:
+            if current is not None:
+                self._restart(current)
+            raise
+        return [_unwrap(reply) for reply in replies]
+
+    def _start(self, shard):
+        # Spawned rather than forked: a forked worker would inherit, and slowly
+        # copy on write, the whole heap of the coordinating process.
+        context = multiprocessing.get_context("spawn")
+        parent, child = context.Pipe()
+        worker = context.Process(target=_serve, args=(child,), daemon=True)
+        worker.start()
+        child.close()
+        self._pipes[shard] = parent
+        self._workers[shard] = worker
+        self._owed[shard] = 0
+
+    def _restart(self, shard):
+        """Replace a shard whose pipe is out of step with an empty one, dropping its departments."""
+        self._workers[shard].terminate()
+        self._workers[shard].join()
+        self._pipes[shard].close()
+        for name in [name for name, owner in self._owner.items() if owner == shard]:
+            del self._owner[name]
+        self._per_shard[shard] = 0
+        self._start(shard)
+
+
+class RemoteDepartment:
+    """
+    Handle of a department held by a shard; every call is routed to it.
+
+    Attributes:
+        name (str): Name of the department.
+    """
+
+    __slots__ = ("_hospital", "name")
+
+    def __init__(self, hospital, name):
+        """
+        Initialize a handle; obtain one from ``ShardedHospital`` instead.
+
+        Args:
+            hospital (ShardedHospital): The coordinator.
+            name (str): Name of the department.
+        """
+        self._hospital = hospital
+        self.name = name
+
+    def __eq__(self, other):
+        return isinstance(other, RemoteDepartment) and (other._hospital, other.name) == (self._hospital, self.name)
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"RemoteDepartment(name={self.name!r}, shard={self._hospital._owner.get(self.name)})"
+
+    def add_patient(self, patient):
+        """
+        Add a patient to the department.
+
+        Args:
+            patient (Patient): Patient to copy to the shard.
+
+        Raises:
+            TypeError: If patient is not a Patient instance.
+        """
+        self.add_patients([patient])
+
+    def add_staff(self, staff_member):
+        """
+        Add a staff member to the department.
+
+        Args:
+            staff_member (Staff): Staff member to copy to the shard.
+
+        Raises:
+            TypeError: If staff_member is not a Staff instance.
+        """
+        self.add_staff_members([staff_member])
+
+    def add_patients(self, patients):
+        """
+        Add many patients in one message.
+
+        Args:
+            patients (iterable[Patient]): Patients to copy to the shard.
+
+        Returns:
+            int: Number of patients added.
+
+        Raises:
+            TypeError: If an item is not a Patient instance.
+            ValueError: If one is already in the department; those before
+                it remain added.
+        """
+        rows = []
+        for patient in patients:
+            if not isinstance(patient, Patient):
+                raise TypeError("patient must be a Patient instance.")
+            rows.append(_pack(patient))
+        return self._hospital._route(self.name, "add_people", rows, False)
+
+    def add_staff_members(self, staff_members):
+        """
+        Add many staff members in one message.
+
+        Args:
+            staff_members (iterable[Staff]): Staff members to copy to the shard.
+
+        Returns:
+            int: Number of staff members added.
+
+        Raises:
+            TypeError: If an item is not a Staff instance.
+            ValueError: If one is already in the department; those before
+                it remain added.
+        """
+        rows = []
+        for staff_member in staff_members:
+            if not isinstance(staff_member, Staff):
+                raise TypeError("staff_member must be a Staff instance.")
+            rows.append(_pack(staff_member))
+        return self._hospital._route(self.name, "add_people", rows, True)
+
+    def check_in(self, person_id):
+        """
+        Check a patient or staff member of the department in.
+
+        Args:
+            person_id (int): ID of the person.
+
+        Returns:
+            str: Confirmation message.
+
+        Raises:
+            KeyError: If the person is not in the department.
+        """
+        return self._hospital._route(self.name, "set_status", person_id, True)
+
+    def check_out(self, person_id):
+        """
+        Check a patient or staff member of the department out.
+
+        Args:
+            person_id (int): ID of the person.
+
+        Returns:
+            str: Confirmation message.
+
+        Raises:
+            KeyError: If the person is not in the department.
+        """
+        return self._hospital._route(self.name, "set_status", person_id, False)
+
+    def discharge_patient(self, person_id):
+        """
+        Check a patient out and remove them from the department.
+
+        Args:
+            person_id (int): ID of the patient.
+
+        Returns:
+            bool: True if discharged, False if not found.
+        """
+        return self._hospital._route(self.name, "discharge", person_id)
+
+    def counts(self):
+        """
+        Return the department's counters in one message.
+
+        Returns:
+            tuple[int, int, int, int]: Patients, staff, checked-in patients
+                and checked-in staff.
+        """
+        return self._hospital._route(self.name, "counts")
+
+    def get_patient_count(self):
+        """Return the number of patients in the department."""
+        return self.counts()[0]
+
+    def get_staff_count(self):
+        """Return the number of staff members in the department."""
+        return self.counts()[1]
+
+    def get_checked_in_patient_count(self):
+        """Return the number of checked-in patients in the department."""
+        return self.counts()[2]
+
+    def get_checked_in_staff_count(self):
+        """Return the number of checked-in staff members in the department."""
+        return self.counts()[3]
+
+
+def _pack(member):
+    """Encode a patient or staff member as a row of plain values."""
+    head = (member.person_id, member.name, member.date_of_birth.toordinal(), member.status)
+    if isinstance(member, Staff):
+        return head + (member.position, member.schedule and str(member.schedule))
+    record = member._record if isinstance(member, Patient) else member.medical_record
+    return head + (record,)
+
+
+def _unpack(row):
+    """Rebuild a person from a row made by ``_pack``, keeping their ID."""
+    person_id, name, ordinal, status = row[:4]
+    dob = date.fromordinal(ordinal)
+    if len(row) == 6:
+        return Staff._restore(person_id, name, dob, status, position=row[4], schedule=row[5])
+    return Patient._restore(person_id, name, dob, status, _record=row[4])
+
+
+def _unwrap(payload):
+    ok, value = pickle.loads(payload)
+    if ok:
+        return value
+    kind, message = value
+    raise _ERRORS.get(kind, RuntimeError)(message)
+
+
+# --- worker side -------------------------------------------------------------
+
+def _serve(conn):
+    """Worker process: hold a share of the departments and answer the coordinator."""
+    hospital = Hospital("Shard", "Worker")
+    hospital.events = events.EventBus()
+    while True:
+        try:
+            op, args = pickle.loads(conn.recv_bytes())
+        except (EOFError, OSError):
+            return
+        if op == "stop":
+            return
+        try:
+            reply = (True, _OPS[op](hospital, *args))
+        except Exception as e:
+            # str() of a KeyError is the repr of its key; send the plain message.
+            message = str(e.args[0]) if isinstance(e, KeyError) and e.args else str(e)
+            reply = (False, (type(e).__name__, message))
+        try:
+            conn.send_bytes(pickle.dumps(reply, _PROTOCOL))
+        except OSError:
+            # The coordinator closed the pipe (closed or restarted this shard).
+            return
+
+
+def _add_department(hospital, name, columnar, patients, staff):
+    department = Department(name, columnar=columnar)
+    department.events = hospital.events
+    department.add_patients(_unpack(row) for row in patients)
+    department.add_staff_members(_unpack(row) for row in staff)
+    hospital.add_department(department)
+
+
+def _add_people(hospital, name, rows, staff):
+    department = hospital.find_department(name)
+    people = (_unpack(row) for row in rows)
+    return department.add_staff_members(people) if staff else department.add_patients(people)
+
+
+def _set_status(hospital, name, person_id, active):
+    department = hospital.find_department(name)
+    member = department.get_patient(person_id)
+    if member is None:
+        member = department.get_staff(person_id)
+    if member is None:
+        raise KeyError(f"Person #{person_id} not found in {name}.")
+    return member.check_in() if active else member.check_out()
+
+
+def _department_counts(hospital):
+    return {dept.name: _counts(dept) for dept in hospital.departments}
+
+
+def _counts(department):
+    return (department.get_patient_count(), department.get_staff_count(),
+            department.get_checked_in_patient_count(), department.get_checked_in_staff_count())
+
+
+def _search_names(hospital, query, k, staff):
+    hits = []
+    for dept in hospital.departments:
+        members = dept.staff if staff else dept.patients
+        for score, person_id in members.name_index().search(query, k):
+            hits.append((score, person_id, dept.name, members.get(person_id).name))
+    return hits
+
+
+_OPS = {
+    "add_department": _add_department,
+    "remove_department": lambda hospital, name: hospital.remove_department(name),
+    "add_people": _add_people,
+    "set_status": _set_status,
+    "discharge": lambda hospital, name, person_id: (
+        hospital.find_department(name).discharge_patient(person_id) is not None
+    ),
+    "counts": lambda hospital, name: _counts(hospital.find_department(name)),
+    "department_counts": _department_counts,
+    "totals": lambda hospital: hospital.totals(),
+    "age_histogram": lambda hospital, bin_width, as_of, staff: hospital.age_histogram(bin_width, as_of, staff),
+    "search_records": lambda hospital, query: [
+        (dept.name, patient.person_id, patient.name) for dept, patient in hospital.search_records(query)
+    ],
+    "search_names": _search_names,
+}
@@ -0,0 +1,103 @@
+# core/shifts.py
+"""
+Index of staff shifts for "who is on shift right now" queries.
+
+Schedules repeat weekly, so every shift is a range of minutes since
+Monday 00:00 (one that runs past Sunday midnight is split in two). The
+week is cut into 168 hour buckets, and each bucket lists the staff
+members with a shift overlapping that hour together with the ranges
+concerned. Finding who is on shift at an instant means locating its
+bucket and checking only the entries in it, so the cost depends on how
+many people work around that hour, not on the size of the department.
+
+Changing a staff member's schedule removes their entries from the buckets
+of the old shifts and adds the new ones; nothing else is rebuilt.
+"""
+from models.schedule import MINUTES_PER_WEEK, minute_of_week
+
+BUCKET_MINUTES = 60
+BUCKETS = MINUTES_PER_WEEK // BUCKET_MINUTES
+
+
+class ShiftIndex:
+    """
+    Hour-of-week buckets over the scheduled shifts of a group of staff.
+    """
+
+    def __init__(self, members=()):
+        """
+        Initialize an index, optionally populated from an iterable of staff.
+
+        Args:
+            members (iterable[Staff]): Staff members to index; those without
+                a schedule are skipped.
+        """
+        self._buckets = [{} for _ in range(BUCKETS)]
+        self._members = {}
+        self._placed = {}
+        for member in members:
+            self.add(member)
+
+    def __len__(self):
+        """Return the number of staff members with indexed shifts."""
+        return len(self._members)
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"ShiftIndex(staff={len(self._members)})"
+
+    def add(self, member):
+        """
+        Index a staff member's shifts, replacing any indexed earlier.
+
+        Args:
+            member (Staff): The staff member; nothing is indexed without a schedule.
+        """
+        self.remove(member)
+        schedule = member.schedule
+        if not schedule:
+            return
+        person_id = member.person_id
+        buckets = self._buckets
+        placed = set()
+        for start, end in schedule.week_intervals():
+            for bucket in range(start // BUCKET_MINUTES, (end - 1) // BUCKET_MINUTES + 1):
+                buckets[bucket].setdefault(person_id, []).append((start, end))
+                placed.add(bucket)
+        self._members[person_id] = member
+        self._placed[person_id] = placed
+
+    def remove(self, member):
+        """
+        Drop a staff member's shifts if they are indexed.
+
+        Args:
+            member (Staff): The staff member.
+        """
+        person_id = member.person_id
+        placed = self._placed.pop(person_id, None)
+        if placed is None:
+            return
+        del self._members[person_id]
+        for bucket in placed:
+            del self._buckets[bucket][person_id]
+
+    def on_shift(self, when=None):
+        """
+        List the staff members whose schedule has them working at an instant.
+
+        Args:
+            when (float | datetime | None): Unix timestamp, local datetime or
+                None for now.
+
+        Returns:
+            list[Staff]: Staff members on shift, in no particular order.
+        """
+        minute = minute_of_week(when)
+        bucket = self._buckets[int(minute // BUCKET_MINUTES)]
+        members = self._members
+        return [
+            members[person_id]
+            for person_id, intervals in bucket.items()
+            if any(start <= minute < end for start, end in intervals)
+        ]
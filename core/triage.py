@@ -0,0 +1,229 @@
+# core/triage.py
+"""
+Per-department triage queue ordered by acuity, then arrival.
+
+Waiting patients sit in a binary heap keyed on ``(acuity, arrival, seq)``,
+so the most urgent patient who arrived first is always on top and
+enqueueing or dequeueing is O(log n). Removing a patient who checked out
+or changing their acuity does not search the heap: the old heap entry is
+only marked dead (lazy deletion) and skipped when it reaches the top; a
+reprioritized patient gets a fresh entry that keeps their arrival time.
+When dead entries outnumber live ones the heaps are rebuilt, so their
+size stays within twice the queue length.
+
+Queue length, counts per acuity level and the sums behind the mean wait
+are kept up to date on every operation, so dashboard statistics are O(1).
+The longest current wait comes from a second heap on arrival time whose
+top is valid almost always, making it amortized O(1) as well.
+"""
+from heapq import heapify, heappop, heappush
+
+from .occupancy import timestamp
+
+# Emergency Severity Index levels: 1 is resuscitation, 5 is non-urgent.
+ACUITY_LEVELS = (1, 2, 3, 4, 5)
+
+_ACUITY, _ARRIVAL, _SEQ, _ID, _LIVE = range(5)
+
+
+class TriageQueue:
+    """
+    Waiting list of patient IDs, most urgent first, first come first served within a level.
+    """
+
+    def __init__(self):
+        """Initialize an empty queue."""
+        self._heap = []
+        self._by_arrival = []
+        self._entries = {}
+        self._seq = 0
+        self._by_acuity = dict.fromkeys(ACUITY_LEVELS, 0)
+        self._arrival_sum = 0.0
+        self._served = 0
+        self._served_wait = 0.0
+
+    def __len__(self):
+        """Return the number of waiting patients."""
+        return len(self._entries)
+
+    def __contains__(self, person_id):
+        """Return True if the patient is waiting."""
+        return person_id in self._entries
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"TriageQueue(waiting={len(self._entries)}, heap={len(self._heap)})"
+
+    def enqueue(self, person_id, acuity, at=None):
+        """
+        Add a patient to the queue.
+
+        Args:
+            person_id (int): ID of the patient.
+            acuity (int): Urgency from 1 (most urgent) to 5.
+            at (float | datetime | None): Arrival time; defaults to now.
+
+        Raises:
+            ValueError: If acuity is not 1-5 or the patient is already waiting.
+        """
+        _check_acuity(acuity)
+        if person_id in self._entries:
+            raise ValueError(f"Patient #{person_id} is already in the triage queue.")
+        arrival = timestamp(at)
+        self._seq += 1
+        entry = [acuity, arrival, self._seq, person_id, True]
+        self._entries[person_id] = entry
+        heappush(self._heap, entry)
+        heappush(self._by_arrival, (arrival, self._seq, entry))
+        self._by_acuity[acuity] += 1
+        self._arrival_sum += arrival
+
+    def dequeue(self, at=None):
+        """
+        Remove and return the most urgent waiting patient.
+
+        Args:
+            at (float | datetime | None): When the patient is called in, for
+                the served-wait statistics; defaults to now.
+
+        Returns:
+            int | None: ID of the patient, or None if the queue is empty.
+        """
+        entry = self._top()
+        if entry is None:
+            return None
+        heappop(self._heap)
+        self._discard(entry)
+        self._served += 1
+        self._served_wait += max(0.0, timestamp(at) - entry[_ARRIVAL])
+        self._compact()
+        return entry[_ID]
+
+    def peek(self):
+        """
+        Return the most urgent waiting patient without removing them.
+
+        Returns:
+            int | None: ID of the patient, or None if the queue is empty.
+        """
+        entry = self._top()
+        return None if entry is None else entry[_ID]
+
+    def reprioritize(self, person_id, acuity):
+        """
+        Change a waiting patient's acuity, keeping their place by arrival time.
+
+        Args:
+            person_id (int): ID of the patient.
+            acuity (int): New urgency from 1 (most urgent) to 5.
+
+        Raises:
+            ValueError: If acuity is not 1-5.
+            KeyError: If the patient is not waiting.
+        """
+        _check_acuity(acuity)
+        old = self._entries[person_id]
+        if old[_ACUITY] == acuity:
+            return
+        old[_LIVE] = False
+        entry = [acuity, old[_ARRIVAL], old[_SEQ], person_id, True]
+        self._entries[person_id] = entry
+        heappush(self._heap, entry)
+        self._by_acuity[old[_ACUITY]] -= 1
+        self._by_acuity[acuity] += 1
+        # The arrival heap holds the old entry; point it at the live one.
+        heappush(self._by_arrival, (entry[_ARRIVAL], entry[_SEQ], entry))
+        self._compact()
+
+    def remove(self, person_id):
+        """
+        Take a patient out of the queue if they are waiting, e.g. after check-out.
+
+        Args:
+            person_id (int): ID of the patient.
+
+        Returns:
+            bool: True if the patient was waiting.
+        """
+        entry = self._entries.get(person_id)
+        if entry is None:
+            return False
+        self._discard(entry)
+        self._compact()
+        return True
+
+    def acuity_of(self, person_id):
+        """
+        Return a waiting patient's acuity.
+
+        Args:
+            person_id (int): ID of the patient.
+
+        Returns:
+            int | None: The acuity, or None if the patient is not waiting.
+        """
+        entry = self._entries.get(person_id)
+        return None if entry is None else entry[_ACUITY]
+
+    def stats(self, now=None):
+        """
+        Summarize the queue for a dashboard.
+
+        Args:
+            now (float | datetime | None): Reference time for waits; defaults to now.
+
+        Returns:
+            dict: ``waiting`` (int), ``by_acuity`` (dict[int, int]),
+                ``mean_wait`` and ``longest_wait`` (seconds, of patients
+                still waiting), ``served`` (int) and ``mean_served_wait``
+                (seconds from arrival to dequeue).
+        """
+        now = timestamp(now)
+        waiting = len(self._entries)
+        oldest = self._oldest()
+        return {
+            "waiting": waiting,
+            "by_acuity": dict(self._by_acuity),
+            "mean_wait": max(0.0, now - self._arrival_sum / waiting) if waiting else 0.0,
+            "longest_wait": max(0.0, now - oldest) if oldest is not None else 0.0,
+            "served": self._served,
+            "mean_served_wait": self._served_wait / self._served if self._served else 0.0,
+        }
+
+    def _top(self):
+        """Drop dead entries from the top of the heap and return the live top, if any."""
+        heap = self._heap
+        while heap and not heap[0][_LIVE]:
+            heappop(heap)
+        return heap[0] if heap else None
+
+    def _oldest(self):
+        """Return the earliest arrival among waiting patients, or None."""
+        heap = self._by_arrival
+        while heap and not heap[0][2][_LIVE]:
+            heappop(heap)
+        return heap[0][0] if heap else None
+
+    def _discard(self, entry):
+        entry[_LIVE] = False
+        del self._entries[entry[_ID]]
+        self._by_acuity[entry[_ACUITY]] -= 1
+        self._arrival_sum -= entry[_ARRIVAL]
+        if not self._entries:
+            # Reset so floating-point error cannot accumulate across busy days.
+            self._arrival_sum = 0.0
+
+    def _compact(self):
+        """Rebuild both heaps from live entries once dead ones are the majority."""
+        if max(len(self._heap), len(self._by_arrival)) <= 2 * len(self._entries) + 32:
+            return
+        live = list(self._entries.values())
+        self._heap = live
+        heapify(live)
+        self._by_arrival = [(entry[_ARRIVAL], entry[_SEQ], entry) for entry in live]
+        heapify(self._by_arrival)
+
+
+def _check_acuity(acuity):
+    if acuity not in ACUITY_LEVELS or isinstance(acuity, bool):
+        raise ValueError("Acuity must be an integer from 1 (most urgent) to 5.")
@@ -1,27 +1,217 @@
+import argparse
+import os
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, simpledialog
 from datetime import datetime, date
 from core.hospital import Hospital
-from core.department import Department
+from core.department import Department, MemberIndex
+from core.events import default_bus
 from models.patient import Patient
-from models.staff import Staff
+from models.staff import Role, Staff
+from storage import EventJournal, Snapshot, SQLiteStore, write_snapshot
+
+class StatusBarSink:
+    """Event sink that shows the latest event of each batch in a status bar."""
+
+    def __init__(self, status_bar):
+        self.status_bar = status_bar
+
+    def __call__(self, events):
+        self.status_bar.config(text=f"Status: {events[-1].message}")
+
+
+class VirtualTree:
+    """
+    Scrollable single-selection Treeview that only holds the rows in view.
+
+    Rows come from a ``fetch(start, stop)`` callable. The tree keeps
+    exactly one screenful of items; scrolling (scrollbar, mouse wheel,
+    arrow and page keys) moves a window over the data and refills those
+    items, so a department of tens of thousands of members costs the same
+    as one of a dozen. The selection is remembered by item id while its
+    row is scrolled out of view.
+    """
+
+    def __init__(self, parent, columns, height=12):
+        """
+        Build the tree and its scrollbar inside a new frame.
+
+        Args:
+            parent (tk.Widget): Container for the frame.
+            columns (list[tuple[str, int]]): Heading and pixel width of each column.
+            height (int): Number of visible rows.
+        """
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(
+            self.frame, columns=[str(i) for i in range(len(columns))],
+            show="headings", selectmode="browse", height=height,
+        )
+        for i, (heading, width) in enumerate(columns):
+            self.tree.heading(str(i), text=heading, anchor=tk.W)
+            self.tree.column(str(i), width=width, stretch=i == len(columns) - 1)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.height = height
+        self._fetch = None
+        self._row = None
+        self._total = 0
+        self._offset = 0
+        self._shown = []
+        self._selected = None
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda event: self._scroll_to(self._offset - 3))
+        self.tree.bind("<Button-5>", lambda event: self._scroll_to(self._offset + 3))
+        self.tree.bind("<Up>", lambda event: self._step(-1))
+        self.tree.bind("<Down>", lambda event: self._step(1))
+        self.tree.bind("<Prior>", lambda event: self._step(-height))
+        self.tree.bind("<Next>", lambda event: self._step(height))
+
+    def show(self, fetch, total, row):
+        """
+        Replace the contents of the tree and scroll to the top.
+
+        Args:
+            fetch (callable): ``fetch(start, stop)`` returns the items in that range.
+            total (int): Number of items ``fetch`` can return.
+            row (callable): Turns an item into ``(iid, values)``.
+        """
+        self._fetch, self._total, self._row = fetch, total, row
+        self._offset = 0
+        self._selected = None
+        self._render()
+
+    def reveal(self, iid, position):
+        """
+        Select a row and scroll it into view.
+
+        Args:
+            iid (str): Item id of the row.
+            position (int): Index of the row in the current contents.
+        """
+        self._selected = iid
+        self._offset = self._clamp(position - self.height // 2)
+        self._render()
+
+    def selected(self):
+        """
+        Return the iid of the selected row.
+
+        With nothing selected, a list of exactly one row counts as that row
+        being selected; otherwise None, so a longer list is never picked
+        from on the user's behalf.
+        """
+        if self._selected is None and self._total == 1:
+            return self._row(self._fetch(0, 1)[0])[0]
+        return self._selected
+
+    def _clamp(self, offset):
+        return max(0, min(offset, self._total - self.height))
+
+    def _scroll_to(self, offset):
+        offset = self._clamp(offset)
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _render(self):
+        """Refill the visible items from the current window of the data."""
+        self.tree.delete(*self.tree.get_children())
+        self._shown = []
+        for item in self._fetch(self._offset, min(self._offset + self.height, self._total)):
+            iid, values = self._row(item)
+            self.tree.insert("", tk.END, iid=iid, values=values)
+            self._shown.append(iid)
+        if self._selected in self._shown:
+            self.tree.selection_set(self._selected)
+            self.tree.focus(self._selected)
+        if self._total:
+            self.scrollbar.set(self._offset / self._total, (self._offset + len(self._shown)) / self._total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_select(self, event):
+        # Items of rows scrolled away are deleted; that empties the selection
+        # but must not forget which row was picked.
+        picked = self.tree.selection()
+        if picked:
+            self._selected = picked[0]
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(int(float(amount) * self._total))
+        else:
+            self._scroll_to(self._offset + int(amount) * (self.height if unit == "pages" else 1))
+
+    def _on_wheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas.
+        notches = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self._scroll_to(self._offset - 3 * notches)
+
+    def _step(self, delta):
+        """Move the selection by ``delta`` rows, scrolling to keep it in view."""
+        if not self._total:
+            return "break"
+        if self._selected in self._shown:
+            position = self._offset + self._shown.index(self._selected) + delta
+        else:
+            position = self._offset
+        position = max(0, min(position, self._total - 1))
+        if not self._offset <= position < self._offset + self.height:
+            if delta > 0:
+                self._offset = self._clamp(position - self.height + 1)
+            else:
+                self._offset = self._clamp(position)
+        self._selected = None
+        self._render()
+        self._selected = self._shown[position - self._offset]
+        self.tree.selection_set(self._selected)
+        self.tree.focus(self._selected)
+        self.tree.see(self._selected)
+        return "break"
+
 
 class HospitalManagementGUI:
-    def __init__(self, root):
+    def __init__(self, root, db_path=None, journal_path=None, snapshot_path=None):
         self.root = root
         self.root.title("Hospital Management System")
         self.root.geometry("1200x700")
         
         self.hospital = None
+        self.db_path = db_path
+        self.store = SQLiteStore(db_path) if db_path else None
+        self.snapshot_path = snapshot_path
+        self.snapshot = None
+        self.journal = None
         self.current_department = None
         self.current_doctor = None
         self.current_patient = None
+        self.last_department = None  # name of the department picked last
         
         # Configure style
         self.style = ttk.Style()
         self.style.theme_use('clam')
         
         self.setup_gui()
+        # Core notifications go to the status bar instead of the terminal.
+        self.status_sink = default_bus.subscribe(StatusBarSink(self.status_bar))
+        
+        if snapshot_path and os.path.exists(snapshot_path):
+            self.snapshot = Snapshot(snapshot_path)
+            self.hospital = self.snapshot.load()
+            self.update_status(f"Loaded hospital '{self.hospital.name}' from {snapshot_path}")
+        elif self.store:
+            self.hospital = self.store.load()
+            if self.hospital:
+                self.update_status(f"Loaded hospital '{self.hospital.name}' from {db_path}")
+        if journal_path:
+            if self.hospital:
+                changed = EventJournal.apply(journal_path, self.hospital)
+                self.output(f"Replayed journal {journal_path}: {changed} status change(s).")
+            self.journal = EventJournal(journal_path)
+            if self.hospital:
+                self.hospital.attach_journal(self.journal)
         
     def setup_gui(self):
         # Create main frame with sidebar and content area
@@ -49,6 +239,7 @@ class HospitalManagementGUI:
             ("View Hospital Info", self.view_hospital_info),
             ("Check In/Out", self.check_in_out_window),
             ("Diagnose/Prescribe", self.diagnose_window),
+            ("Search Records", self.search_records_window),
             ("Exit", self.exit_app)
         ]
         
@@ -98,6 +289,7 @@ class HospitalManagementGUI:
             if name and location:
                 try:
                     self.hospital = Hospital(name, location)
+                    self.hospital.attach_journal(self.journal)
                     self.update_status(f"Hospital '{name}' created at {location}")
                     self.output(f"Hospital '{name}' created at {location}.")
                     window.destroy()
@@ -127,7 +319,6 @@ class HospitalManagementGUI:
                 try:
                     dept = Department(name)
                     self.hospital.add_department(dept)
-                    self.update_status(f"Department '{name}' added")
                     self.output(f"Department '{name}' added.")
                     window.destroy()
                 except Exception as e:
@@ -187,7 +378,6 @@ class HospitalManagementGUI:
                 
                 patient = Patient(name, dob, record)
                 dept.add_patient(patient)
-                self.update_status(f"Patient '{name}' added")
                 self.output(f"Patient '{name}' added to {dept.name}.")
                 window.destroy()
             except Exception as e:
@@ -206,7 +396,7 @@ class HospitalManagementGUI:
             
         window = tk.Toplevel(self.root)
         window.title("Add Staff")
-        window.geometry("500x250")
+        window.geometry("500x320")
         
         ttk.Label(window, text="Name:").pack(pady=5)
         name_entry = ttk.Entry(window, width=40)
@@ -220,6 +410,10 @@ class HospitalManagementGUI:
         position_entry = ttk.Entry(window, width=40)
         position_entry.pack(pady=5)
         
+        ttk.Label(window, text="Schedule (optional, e.g. Mon-Fri 08:00-16:00):").pack(pady=5)
+        schedule_entry = ttk.Entry(window, width=40)
+        schedule_entry.pack(pady=5)
+        
         def add():
             try:
                 name = name_entry.get().strip()
@@ -242,8 +436,8 @@ class HospitalManagementGUI:
                     return
                 
                 staff = Staff(name, dob, position)
+                staff.set_schedule(schedule_entry.get().strip() or None)
                 dept.add_staff(staff)
-                self.update_status(f"Staff '{name}' added")
                 self.output(f"Staff '{name}' added to {dept.name}.")
                 window.destroy()
             except Exception as e:
@@ -262,10 +456,17 @@ class HospitalManagementGUI:
         self.output(f"Total Departments: {len(self.hospital.departments)}")
         self.output(f"Total Patients: {self.hospital.get_total_patients()}")
         self.output(f"Total Staff: {self.hospital.get_total_staff()}")
+        self.output(f"Checked-in Patients: {self.hospital.get_checked_in_patients()}")
+        self.output(f"Checked-in Staff: {self.hospital.get_checked_in_staff()}")
         
         for dept in self.hospital.departments:
             self.output(f"\nDepartment: {dept.name}")
             self.output(f"  Staff: {len(dept.staff)} | Patients: {len(dept.patients)}")
+            stats = dept.triage.stats()
+            self.output(
+                f"  Triage: {stats['waiting']} waiting | Mean wait: {stats['mean_wait'] / 60:.0f} min"
+                f" | Longest: {stats['longest_wait'] / 60:.0f} min"
+            )
             
             if dept.patients:
                 self.output("  Patients:")
@@ -287,7 +488,7 @@ class HospitalManagementGUI:
             
         window = tk.Toplevel(self.root)
         window.title("Check In/Out")
-        window.geometry("400x250")
+        window.geometry("400x290")
         
         ttk.Label(window, text="Select Action:", font=('Arial', 10, 'bold')).pack(pady=10)
         
@@ -299,6 +500,10 @@ class HospitalManagementGUI:
             self.check_in_out_action("patient", "out")
             window.destroy()
         
+        def patient_discharge():
+            self.check_in_out_action("patient", "discharge")
+            window.destroy()
+        
         def staff_check_in():
             self.check_in_out_action("staff", "in")
             window.destroy()
@@ -309,6 +514,7 @@ class HospitalManagementGUI:
         
         ttk.Button(window, text="Patient Check-in", command=patient_check_in, width=25).pack(pady=5)
         ttk.Button(window, text="Patient Check-out", command=patient_check_out, width=25).pack(pady=5)
+        ttk.Button(window, text="Patient Discharge", command=patient_discharge, width=25).pack(pady=5)
         ttk.Button(window, text="Staff Check-in", command=staff_check_in, width=25).pack(pady=5)
         ttk.Button(window, text="Staff Check-out", command=staff_check_out, width=25).pack(pady=5)
     
@@ -317,20 +523,11 @@ class HospitalManagementGUI:
             messagebox.showwarning("Warning", "Create a hospital first.")
             return
             
-        # Select department, doctor, and patient
+        # Select department and patient; checked-in patients get the assigned doctor
         dept = self.select_department("Select department:")
         if not dept:
             return
             
-        doctors = [s for s in dept.staff if "Dr" in s.name or "doctor" in s.position.lower()]
-        if not doctors:
-            messagebox.showinfo("Info", "No doctors available in this department.")
-            return
-            
-        doctor = self.select_member(doctors, "doctor")
-        if not doctor:
-            return
-            
         if not dept.patients:
             messagebox.showinfo("Info", "No patients available in this department.")
             return
@@ -338,6 +535,16 @@ class HospitalManagementGUI:
         patient = self.select_member(dept.patients, "patient")
         if not patient:
             return
+            
+        doctor = dept.assign_patient(patient.person_id) if patient.is_active() else None
+        if not doctor:
+            doctors = MemberIndex(dept.staff_by_role(Role.DOCTOR, checked_in=True))
+            if not doctors:
+                messagebox.showinfo("Info", "No checked-in doctors available in this department.")
+                return
+            doctor = self.select_member(doctors, "doctor")
+            if not doctor:
+                return
         
         window = tk.Toplevel(self.root)
         window.title("Diagnose & Prescribe")
@@ -361,12 +568,10 @@ class HospitalManagementGUI:
             if diagnosis:
                 result = doctor.diagnose_patient(patient, diagnosis)
                 self.output(result)
-                patient.medical_record += f" | Diagnosis: {diagnosis}"
             
             if treatment:
                 result = doctor.prescribe_treatment(patient, treatment)
                 self.output(result)
-                patient.medical_record += f", Treatment: {treatment}"
             
             if diagnosis or treatment:
                 self.update_status(f"{doctor.name} treated {patient.name}")
@@ -396,8 +601,20 @@ class HospitalManagementGUI:
         if not member:
             return
             
+        if action == "discharge":
+            dept.discharge_patient(member.person_id)
+            self.output(f"{member.name} discharged from {dept.name}.")
+            return
+            
         if action == "in":
             result = member.check_in()
+            if member_type == "patient" and member.person_id not in dept.triage:
+                acuity = simpledialog.askinteger(
+                    "Triage", "Acuity 1-5 (1 = most urgent); cancel to skip:",
+                    parent=self.root, minvalue=1, maxvalue=5,
+                )
+                if acuity:
+                    dept.enqueue_patient(member.person_id, acuity)
         else:
             result = member.check_out()
             
@@ -411,66 +628,149 @@ class HospitalManagementGUI:
             
         window = tk.Toplevel(self.root)
         window.title(title)
-        window.geometry("300x200")
+        window.geometry("420x360")
         
         ttk.Label(window, text="Select Department:", font=('Arial', 10, 'bold')).pack(pady=10)
         
-        selected_dept = tk.StringVar()
+        # The filter matches anywhere in the name; the department picked
+        # last time starts selected, so Enter repeats the previous choice.
+        search_entry = ttk.Entry(window, width=40)
+        search_entry.pack(pady=5, padx=10)
+        rows = VirtualTree(window, [("Department", 200), ("Patients", 80), ("Staff", 80)])
+        rows.frame.pack(pady=5, padx=10, fill=tk.BOTH, expand=True)
         
-        for i, dept in enumerate(self.hospital.departments):
-            rb = ttk.Radiobutton(window, text=dept.name, variable=selected_dept, value=dept.name)
-            rb.pack(pady=2, padx=20, anchor=tk.W)
+        selected_dept = tk.StringVar()
         
-        def confirm():
-            if selected_dept.get():
+        def row(dept):
+            return dept.name, (dept.name, len(dept.patients), len(dept.staff))
+        
+        def refresh(event=None):
+            query = search_entry.get().strip().casefold()
+            depts = self.hospital.departments
+            if query:
+                depts = [dept for dept in depts if query in dept.name.casefold()]
+            rows.show(lambda start, stop: depts[start:stop], len(depts), row)
+            for position, dept in enumerate(depts):
+                if dept.name == self.last_department:
+                    rows.reveal(dept.name, position)
+                    break
+        
+        def confirm(event=None):
+            name = rows.selected()
+            if name:
+                selected_dept.set(name)
                 window.destroy()
             else:
                 messagebox.showwarning("Warning", "Please select a department.")
         
+        search_entry.bind("<KeyRelease>", lambda event: refresh() if event.keysym != "Return" else None)
+        search_entry.bind("<Return>", confirm)
+        rows.tree.bind("<Double-Button-1>", confirm)
+        rows.tree.bind("<Return>", confirm)
         ttk.Button(window, text="Select", command=confirm).pack(pady=10)
+        refresh()
+        search_entry.focus_set()
         
         # Make window modal
         window.transient(self.root)
         window.grab_set()
         self.root.wait_window(window)
         
-        if selected_dept.get():
-            for dept in self.hospital.departments:
-                if dept.name == selected_dept.get():
-                    return dept
-        return None
+        dept = self.hospital.find_department(selected_dept.get()) if selected_dept.get() else None
+        if dept:
+            self.last_department = dept.name
+        return dept
     
     def select_member(self, members, member_type):
         window = tk.Toplevel(self.root)
         window.title(f"Select {member_type.title()}")
-        window.geometry("300x200")
+        window.geometry("460x400")
         
         ttk.Label(window, text=f"Select {member_type}:", font=('Arial', 10, 'bold')).pack(pady=10)
         
-        selected_member = tk.StringVar()
-        
-        for i, member in enumerate(members):
-            rb = ttk.Radiobutton(window, text=member.name, variable=selected_member, value=member.name)
-            rb.pack(pady=2, padx=20, anchor=tk.W)
-        
-        def confirm():
-            if selected_member.get():
+        # Type-ahead: an empty query lists every member, building only the
+        # rows in view as the list is scrolled; otherwise the best name
+        # matches are shown, or the member whose ID follows a '#'.
+        search_entry = ttk.Entry(window, width=40)
+        search_entry.pack(pady=5, padx=10)
+        rows = VirtualTree(window, [("ID", 60), ("Name", 240), ("Status", 100)])
+        rows.frame.pack(pady=5, padx=10, fill=tk.BOTH, expand=True)
+        
+        selected_member = tk.IntVar(value=0)
+        pending = [None]
+        
+        def row(member):
+            status = "Checked in" if member.is_active() else ""
+            return str(member.person_id), (member.person_id, member.name, status)
+        
+        def refresh():
+            pending[0] = None
+            query = search_entry.get().strip()
+            if query.startswith("#") and query[1:].isdigit():
+                member = members.get(int(query[1:]))
+                matches = [member] if member is not None else []
+            elif query:
+                matches = members.search_names(query, 50)
+            else:
+                rows.show(lambda start, stop: members[start:stop], len(members), row)
+                return
+            rows.show(lambda start, stop: matches[start:stop], len(matches), row)
+        
+        def on_key(event):
+            if event.keysym == "Return":
+                return
+            if pending[0] is not None:
+                window.after_cancel(pending[0])
+            pending[0] = window.after(150, refresh)
+        
+        def confirm(event=None):
+            if pending[0] is not None:
+                window.after_cancel(pending[0])
+                refresh()
+            picked = rows.selected()
+            if picked:
+                selected_member.set(int(picked))
                 window.destroy()
             else:
                 messagebox.showwarning("Warning", f"Please select a {member_type}.")
         
+        search_entry.bind("<KeyRelease>", on_key)
+        search_entry.bind("<Return>", confirm)
+        rows.tree.bind("<Double-Button-1>", confirm)
+        rows.tree.bind("<Return>", confirm)
         ttk.Button(window, text="Select", command=confirm).pack(pady=10)
+        refresh()
+        search_entry.focus_set()
         
         window.transient(self.root)
         window.grab_set()
         self.root.wait_window(window)
         
         if selected_member.get():
-            for member in members:
-                if member.name == selected_member.get():
-                    return member
+            return members.get(selected_member.get())
         return None
     
+    def search_records_window(self):
+        if not self.hospital:
+            messagebox.showwarning("Warning", "Create a hospital first.")
+            return
+
+        query = simpledialog.askstring(
+            "Search Records", "Search terms (AND by default; OR, -term, prefix*):", parent=self.root
+        )
+        if not query:
+            return
+        try:
+            matches = self.hospital.search_records(query)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        self.output(f"\nSearch '{query}': {len(matches)} match(es)")
+        for dept, patient in matches:
+            self.output(f"  [{dept.name}] {patient.name} (#{patient.person_id}): {patient.medical_record}")
+        self.update_status(f"{len(matches)} record(s) found for '{query}'")
+
     def output(self, text):
         self.output_text.insert(tk.END, text + "\n")
         self.output_text.see(tk.END)
@@ -484,11 +784,32 @@ class HospitalManagementGUI:
     
     def exit_app(self):
         if messagebox.askyesno("Exit", "Are you sure you want to exit?"):
+            if self.hospital and (self.store or self.snapshot_path):
+                if self.store:
+                    self.store.save(self.hospital)
+                if self.snapshot_path:
+                    write_snapshot(self.hospital, self.snapshot_path)
+                if self.journal:
+                    self.journal.checkpoint()
+            if self.store:
+                self.store.close()
+            if self.snapshot:
+                self.snapshot.close()
+            if self.journal:
+                self.journal.close()
+            default_bus.unsubscribe(self.status_sink)
             self.root.quit()
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hospital Management System (GUI)")
+    parser.add_argument("--db", help="SQLite file to load the hospital from and save it to on exit")
+    parser.add_argument("--snapshot", help="binary snapshot loaded on start if present (before --db) and written on exit")
+    parser.add_argument("--journal", help="check-in/check-out journal replayed on start (requires --db or --snapshot)")
+    args = parser.parse_args(argv)
+    if args.journal and not (args.db or args.snapshot):
+        parser.error("--journal requires --db or --snapshot")
     root = tk.Tk()
-    app = HospitalManagementGUI(root)
+    app = HospitalManagementGUI(root, db_path=args.db, journal_path=args.journal, snapshot_path=args.snapshot)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,14 +1,30 @@
+import argparse
+import os
 from datetime import datetime
 from core.hospital import Hospital
 from core.department import Department
+from core.events import ConsoleSink, default_bus
 from models.patient import Patient
-from models.staff import Staff
+from models.staff import Role, Staff
 from models.person import Person
+from storage import EventJournal, Snapshot, SQLiteStore, export_records, import_people, write_snapshot
+from storage.bulk_import import FORMATS
+from storage.exporter import FORMATS as EXPORT_FORMATS
 
 
 
 
 
+def format_triage(department):
+    """Summarize a department's triage queue on one line."""
+    stats = department.triage.stats()
+    levels = ", ".join(f"{level}: {count}" for level, count in stats["by_acuity"].items() if count)
+    return (
+        f"Triage: {stats['waiting']} waiting ({levels or 'none'}) | "
+        f"Mean wait: {stats['mean_wait'] / 60:.0f} min | Longest: {stats['longest_wait'] / 60:.0f} min"
+    )
+
+
 def choose_department(hospital):
     """Helper to select a department from the hospital."""
     if not hospital.departments:
@@ -32,15 +48,20 @@ def choose_department(hospital):
         return None
 
 
+TYPE_AHEAD_THRESHOLD = 20
+
+
 def choose_member(members, member_type="Member"):
     """Helper to select a patient or staff member from a list."""
     if not members:
         print(f"No {member_type.lower()}s available.")
         return None
+    if len(members) > TYPE_AHEAD_THRESHOLD and hasattr(members, "search_names"):
+        return search_member(members, member_type)
 
     print(f"\nSelect a {member_type.lower()}:")
     for idx, m in enumerate(members, 1):
-        print(f"{idx}. {m.name}")
+        print(f"{idx}. {m.name} (#{m.person_id})")
 
     choice_str = input(f"Enter {member_type} number: ").strip()
     if not choice_str.isdigit():
@@ -65,10 +86,143 @@ def input_date(prompt="Enter date (YYYY-MM-DD): "):
         return None
 
 
-def main():
+def search_member(members, member_type="Member"):
+    """Helper to find a member of a large group by typing part of their name."""
+    while True:
+        query = input(f"Search {member_type.lower()} by name or #id (blank to cancel): ").strip()
+        if not query:
+            return None
+        if query.startswith("#") and query[1:].isdigit():
+            member = members.get(int(query[1:]))
+            if member is None:
+                print(f"No {member_type.lower()} #{query[1:]}.")
+                continue
+            return member
+
+        matches = members.search_names(query, 10)
+        if not matches:
+            print("No matches. Try again.")
+            continue
+        for idx, m in enumerate(matches, 1):
+            print(f"{idx}. {m.name} (#{m.person_id})")
+        choice_str = input(f"Enter {member_type} number (blank to search again): ").strip()
+        if not choice_str:
+            continue
+        if choice_str.isdigit() and 1 <= int(choice_str) <= len(matches):
+            return matches[int(choice_str) - 1]
+        print("Choice out of range.")
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description="Hospital Management System")
+    parser.add_argument("--db", help="SQLite file to load the hospital from and save it to on exit")
+    parser.add_argument("--snapshot", help="binary snapshot loaded on start if present (before --db) and written on exit")
+    parser.add_argument("--journal", help="check-in/check-out journal replayed on start (requires --db or --snapshot)")
+    commands = parser.add_subparsers(dest="command")
+    importer = commands.add_parser(
+        "import", help="bulk-import patients and staff from CSV/JSONL, save and exit (requires --db or --snapshot)"
+    )
+    importer.add_argument("file", help="CSV or JSON Lines file to import")
+    importer.add_argument("--format", choices=FORMATS, help="file format (default: from the extension)")
+    importer.add_argument("--batch-size", type=int, default=5000, help="rows validated and inserted together")
+    importer.add_argument("--hospital", nargs=2, metavar=("NAME", "LOCATION"),
+                          help="create the hospital if none is stored yet")
+    exporter = commands.add_parser(
+        "export", help="export patients' medical records to CSV/JSONL and exit (requires --db or --snapshot)"
+    )
+    exporter.add_argument("file", help="destination file; a '.gz' suffix compresses it")
+    exporter.add_argument("--format", choices=EXPORT_FORMATS, help="file format (default: from the extension)")
+    exporter.add_argument("--gzip", action="store_true", help="gzip-compress the output")
+    exporter.add_argument("--department", action="append", dest="departments", metavar="NAME",
+                          help="only this department (repeatable)")
+    exporter.add_argument("--status", choices=("in", "out"), help="only checked-in or checked-out patients")
+    args = parser.parse_args(argv)
+    if args.journal and not (args.db or args.snapshot):
+        parser.error("--journal requires --db or --snapshot")
+    if args.command and not (args.db or args.snapshot):
+        parser.error(f"{args.command} requires --db or --snapshot")
+    return args
+
+
+def run_import(args, hospital):
+    """Import a file into ``hospital`` (creating it if asked) and print the report."""
+    if hospital is None:
+        if not args.hospital:
+            print("No hospital stored yet; pass --hospital NAME LOCATION to create one.")
+            return None
+        hospital = Hospital(*args.hospital)
+    report = import_people(hospital, args.file, format=args.format, batch_size=args.batch_size)
+    print(report)
+    return hospital
+
+
+def run_export(args, hospital):
+    """Export ``hospital``'s medical records as asked on the command line."""
+    if hospital is None:
+        print("No hospital stored yet; nothing to export.")
+        return
+    try:
+        count = export_records(
+            hospital, args.file, format=args.format, compress=args.gzip or None,
+            departments=args.departments, status=args.status,
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    print(f"Exported {count} medical record(s) to {args.file}.")
+
+
+def shutdown(args, hospital, store, snapshot, journal, save=True):
+    """Save the hospital wherever it is kept, clear the journal and close everything."""
+    if save and hospital and (store or args.snapshot):
+        if store:
+            store.save(hospital)
+            print(f"Hospital saved to {args.db}.")
+        if args.snapshot:
+            write_snapshot(hospital, args.snapshot)
+            print(f"Snapshot written to {args.snapshot}.")
+        if journal:
+            journal.checkpoint()
+    if store:
+        store.close()
+    if snapshot:
+        snapshot.close()
+    if journal:
+        journal.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    console = default_bus.subscribe(ConsoleSink())
     hospital = None
+    store = SQLiteStore(args.db) if args.db else None
+    snapshot = None
+    journal = None
+    if args.snapshot and os.path.exists(args.snapshot):
+        snapshot = Snapshot(args.snapshot)
+        hospital = snapshot.load()
+        print(f"Loaded hospital '{hospital.name}' from {args.snapshot}.")
+    elif store:
+        hospital = store.load()
+        if hospital:
+            print(f"Loaded hospital '{hospital.name}' from {args.db}.")
+    if args.journal:
+        if hospital:
+            changed = EventJournal.apply(args.journal, hospital)
+            print(f"Replayed journal {args.journal}: {changed} status change(s).")
+        journal = EventJournal(args.journal)
+        if hospital:
+            hospital.attach_journal(journal)
 
-    while True:
+    if args.command == "import":
+        hospital = run_import(args, hospital)
+        shutdown(args, hospital, store, snapshot, journal)
+    elif args.command == "export":
+        run_export(args, hospital)
+        shutdown(args, hospital, store, snapshot, journal, save=False)
+
+    while args.command is None:
         print("\n--- Hospital Management System ---")
         print("1. Create Hospital")
         print("2. Add Department")
@@ -77,11 +231,12 @@ def main():
         print("5. View Hospital Info")
         print("6. Check-in / Check-out")
         print("7. Diagnose / Prescribe")
-        print("8. Exit")
+        print("8. Search Medical Records")
+        print("9. Exit")
 
         choice = input("Enter your choice: ").strip()
         if not choice.isdigit():
-            print("Invalid input. Enter a number 1-8.")
+            print("Invalid input. Enter a number 1-9.")
             continue
 
         if choice == "1":
@@ -92,6 +247,7 @@ def main():
                 location = input("Enter hospital location: ").strip()
                 if name and location:
                     hospital = Hospital(name, location)
+                    hospital.attach_journal(journal)
                     print(f"Hospital '{name}' created at {location}.")
                 else:
                     print("Name and location cannot be empty.")
@@ -139,7 +295,13 @@ def main():
                 if not name or not position:
                     print("Name and position cannot be empty.")
                     continue
+                schedule = input("Enter schedule (optional, e.g. Mon-Fri 08:00-16:00): ").strip()
                 staff_member = Staff(name, dob, position)
+                try:
+                    staff_member.set_schedule(schedule or None)
+                except ValueError as e:
+                    print(e)
+                    continue
                 department.add_staff(staff_member)
                 print(f"Staff '{name}' added to {department.name}.")
 
@@ -150,6 +312,7 @@ def main():
             hospital.view_hospital_info()
             for dept in hospital.departments:
                 print(f"\nDepartment: {dept.name} | Staff: {len(dept.staff)} | Patients: {len(dept.patients)}")
+                print(format_triage(dept))
                 if dept.patients:
                     print("Patients:")
                     for p in dept.patients:
@@ -165,12 +328,19 @@ def main():
                 continue
             department = choose_department(hospital)
             if department:
-                print("\n1. Check-in Patient\n2. Check-out Patient\n3. Check-in Staff\n4. Check-out Staff")
+                print("\n1. Check-in Patient\n2. Check-out Patient\n3. Check-in Staff\n4. Check-out Staff"
+                      "\n5. Discharge Patient")
                 sub_choice = input("Enter choice: ").strip()
                 if sub_choice == "1":
                     member = choose_member(department.patients, "Patient")
                     if member:
                         print(member.check_in())
+                        acuity = input("Triage acuity 1-5 (1 = most urgent, blank to skip): ").strip()
+                        if acuity and member.person_id not in department.triage:
+                            try:
+                                department.enqueue_patient(member.person_id, int(acuity) if acuity.isdigit() else 0)
+                            except ValueError as e:
+                                print(e)
                 elif sub_choice == "2":
                     member = choose_member(department.patients, "Patient")
                     if member:
@@ -183,6 +353,10 @@ def main():
                     member = choose_member(department.staff, "Staff")
                     if member:
                         print(member.check_out())
+                elif sub_choice == "5":
+                    member = choose_member(department.patients, "Patient")
+                    if member:
+                        department.discharge_patient(member.person_id)
                 else:
                     print("Invalid choice.")
 
@@ -192,28 +366,50 @@ def main():
                 continue
             department = choose_department(hospital)
             if department and department.staff and department.patients:
-                doctors = [s for s in department.staff if "Dr" in s.name or "doctor" in s.position.lower()]
-                if not doctors:
-                    print("No doctors available.")
-                    continue
-                doctor = choose_member(doctors, "Doctor")
                 patient = choose_member(department.patients, "Patient")
-                if doctor and patient:
+                if not patient:
+                    continue
+                doctor = department.assign_patient(patient.person_id) if patient.is_active() else None
+                if doctor:
+                    print(f"Assigned doctor: {doctor.name}")
+                else:
+                    doctors = department.staff_by_role(Role.DOCTOR, checked_in=True)
+                    if not doctors:
+                        print("No checked-in doctors available.")
+                        continue
+                    doctor = choose_member(doctors, "Doctor")
+                if doctor:
                     diag = input("Enter diagnosis: ").strip()
                     treat = input("Enter treatment: ").strip()
                     if diag:
                         print(doctor.diagnose_patient(patient, diag))
                     if treat:
                         print(doctor.prescribe_treatment(patient, treat))
-                    if diag or treat:
-                        patient.medical_record += f" | Diagnosis: {diag}, Treatment: {treat}"
 
         elif choice == "8":
+            if not hospital:
+                print("Create a hospital first.")
+                continue
+            query = input("Search terms (AND by default; OR, -term, prefix*): ").strip()
+            try:
+                matches = hospital.search_records(query)
+            except ValueError as e:
+                print(f"Error: {e}")
+                continue
+            if not matches:
+                print("No matching records.")
+            for dept, patient in matches:
+                print(f"  [{dept.name}] {patient.name} (#{patient.person_id}): {patient.medical_record}")
+
+        elif choice == "9":
+            shutdown(args, hospital, store, snapshot, journal)
             print("Exiting the system. Goodbye!")
             break
 
         else:
-            print("Invalid choice. Enter a number between 1 and 8.")
+            print("Invalid choice. Enter a number between 1 and 9.")
+
+    default_bus.unsubscribe(console)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,9 @@
 # models/__init__.py
 
-from .person import Person
+from .person import Person, Status
+from .medical_record import EntryKind, MedicalRecord, RecordEntry
 from .patient import Patient
-from .staff import Staff
+from .schedule import Schedule, Shift
+from .staff import Role, Staff
 
-__all__ = ["Person", "Patient", "Staff"]
+__all__ = ["Person", "Patient", "Staff", "Role", "Schedule", "Shift", "Status", "EntryKind", "MedicalRecord", "RecordEntry"]
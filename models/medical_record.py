@@ -0,0 +1,197 @@
+from datetime import datetime
+from enum import Enum
+
+
+class EntryKind(Enum):
+    """Type of a medical record entry."""
+
+    NOTE = "Note"
+    DIAGNOSIS = "Diagnosis"
+    TREATMENT = "Treatment"
+
+
+class RecordEntry:
+    """
+    A single, immutable entry in a patient's medical record.
+
+    Attributes:
+        kind (EntryKind): Type of the entry.
+        text (str): Entry details. Cannot be empty.
+        timestamp (datetime): When the entry was written.
+        author (str | None): Name of the staff member who wrote it, if any.
+    """
+
+    __slots__ = ("kind", "text", "timestamp", "author")
+
+    def __init__(self, kind: EntryKind, text: str, timestamp: datetime, author: str | None = None) -> None:
+        """
+        Initialize a RecordEntry.
+
+        Args:
+            kind (EntryKind): Type of the entry.
+            text (str): Entry details.
+            timestamp (datetime): When the entry was written.
+            author (str | None): Name of the author.
+
+        Raises:
+            ValueError: If text is empty.
+        """
+        if not text or not text.strip():
+            raise ValueError("Record entry cannot be empty")
+        self.kind = EntryKind(kind)
+        self.text = text
+        self.timestamp = timestamp
+        self.author = author
+
+    def __str__(self) -> str:
+        """Return the entry as '<Kind>: <text>'."""
+        return f"{self.kind.value}: {self.text}"
+
+    def __repr__(self) -> str:
+        """Return a developer-friendly string for debugging."""
+        return (
+            f"RecordEntry(kind={self.kind!r}, text={self.text!r}, "
+            f"timestamp={self.timestamp!r}, author={self.author!r})"
+        )
+
+
+class MedicalRecord:
+    """
+    Append-only log of a patient's medical record entries.
+
+    Appending is O(1): entries are kept in a list and never rewritten.
+    The classic single-string form of the record is rendered lazily and
+    cached; a later render only formats entries appended since the last
+    one. Entries can be read page by page instead of all at once.
+
+    The first entry is the record the patient was registered with and is
+    rendered as-is; later entries are rendered as ' | <Kind>: <text>'.
+    """
+
+    __slots__ = ("_entries", "_rendered", "_rendered_count")
+
+    def __init__(self, initial: str, author: str | None = None, timestamp: datetime | None = None) -> None:
+        """
+        Start a record with its initial entry.
+
+        Args:
+            initial (str): The record the patient is registered with.
+            author (str | None): Name of the author.
+            timestamp (datetime | None): When it was written; defaults to now.
+
+        Raises:
+            ValueError: If initial is empty.
+        """
+        self._entries = []
+        self._rendered = ""
+        self._rendered_count = 0
+        self.append(EntryKind.NOTE, initial, author, timestamp)
+
+    @classmethod
+    def from_entries(cls, entries: list) -> "MedicalRecord":
+        """
+        Rebuild a record from previously stored entries.
+
+        Args:
+            entries (list[RecordEntry]): Entries, oldest first. The first one
+                is the initial record.
+
+        Returns:
+            MedicalRecord: The rebuilt record.
+
+        Raises:
+            ValueError: If entries is empty.
+        """
+        if not entries:
+            raise ValueError("Medical record cannot be empty")
+        record = cls.__new__(cls)
+        record._entries = list(entries)
+        record._rendered = ""
+        record._rendered_count = 0
+        return record
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self._entries)
+
+    def __iter__(self):
+        """Iterate over entries, oldest first."""
+        return iter(self._entries)
+
+    def __str__(self) -> str:
+        """Return the rendered record."""
+        return self.render()
+
+    def __repr__(self) -> str:
+        """Return a developer-friendly string for debugging."""
+        return f"MedicalRecord(entries={len(self._entries)})"
+
+    def append(self, kind: EntryKind, text: str, author: str | None = None,
+               timestamp: datetime | None = None) -> RecordEntry:
+        """
+        Append an entry to the record.
+
+        Args:
+            kind (EntryKind): Type of the entry.
+            text (str): Entry details.
+            author (str | None): Name of the author.
+            timestamp (datetime | None): When it was written; defaults to now.
+
+        Returns:
+            RecordEntry: The new entry.
+
+        Raises:
+            ValueError: If text is empty.
+        """
+        entry = RecordEntry(kind, text, timestamp or datetime.now(), author)
+        self._entries.append(entry)
+        return entry
+
+    def entries(self, offset: int = 0, limit: int | None = None) -> list:
+        """
+        Return a page of entries, oldest first.
+
+        Args:
+            offset (int): Number of entries to skip.
+            limit (int | None): Maximum number of entries; None for all.
+
+        Returns:
+            list[RecordEntry]: The requested entries.
+        """
+        end = None if limit is None else offset + limit
+        return self._entries[offset:end]
+
+    def latest(self, kind: EntryKind | None = None) -> RecordEntry | None:
+        """
+        Return the most recent entry, optionally of a given kind.
+
+        Args:
+            kind (EntryKind | None): Entry type to look for; None for any.
+
+        Returns:
+            RecordEntry | None: The entry, or None if there is none.
+        """
+        for entry in reversed(self._entries):
+            if kind is None or entry.kind is kind:
+                return entry
+        return None
+
+    def render(self) -> str:
+        """
+        Render the record as a single string.
+
+        Returns:
+            str: The initial record followed by ' | <Kind>: <text>' per entry.
+        """
+        entries = self._entries
+        if self._rendered_count < len(entries):
+            parts = [self._rendered]
+            if not self._rendered_count:
+                parts.append(entries[0].text)
+                start = 1
+            else:
+                start = self._rendered_count
+            parts.extend(f" | {entry}" for entry in entries[start:])
+            self._rendered = "".join(parts)
+            self._rendered_count = len(entries)
+        return self._rendered
@@ -1,4 +1,5 @@
-from .person import Person
+from .medical_record import MedicalRecord
+from .person import Person, Status
 
 class Patient(Person):
     """
@@ -8,13 +9,21 @@ class Patient(Person):
     Patients can view their records, check in/out of the hospital, 
     and have a status to indicate if they are currently active in the hospital.
 
+    The medical record is an append-only ``MedicalRecord`` log of typed
+    entries; ``medical_record`` renders it lazily as a single string. Until
+    the first entry is appended only the initial record text is stored,
+    so patients whose record never changes carry no log object.
+
     Attributes:
         name (str): Full name of the patient.
         date_of_birth (date): Date of birth.
-        medical_record (str): The patient's medical record. Cannot be empty.
+        record (MedicalRecord): Append-only log of the patient's record entries.
+        medical_record (str): The patient's medical record rendered as text. Cannot be empty.
         status (str): Current status of the patient, either 'in' or 'out'.
     """
 
+    __slots__ = ("_record",)
+
     def __init__(self, name, date_of_birth, medical_record):
         """
         Initialize a Patient object.
@@ -30,8 +39,59 @@ class Patient(Person):
         super().__init__(name, date_of_birth)
         if not medical_record or not medical_record.strip():
             raise ValueError("Medical record cannot be empty")
-        self.medical_record = medical_record
-        self.status = "out"  # Default status is checked out
+        self._record = medical_record
+
+    @property
+    def record(self):
+        """
+        Append-only log of the patient's record entries.
+
+        Returns:
+            MedicalRecord: The log, created from the initial record on first access.
+        """
+        if isinstance(self._record, str):
+            self._record = MedicalRecord(self._record)
+        return self._record
+
+    @record.setter
+    def record(self, value):
+        """
+        Attach an existing record log.
+
+        Args:
+            value (MedicalRecord): The log to attach.
+        """
+        self._record = value
+
+    @property
+    def medical_record(self):
+        """
+        The medical record rendered as a single string.
+
+        Returns:
+            str: The initial record followed by every later entry.
+        """
+        record = self._record
+        return record if isinstance(record, str) else record.render()
+
+    @medical_record.setter
+    def medical_record(self, value):
+        """
+        Replace the whole record with a new one.
+
+        Prefer ``add_record_entry``, which appends instead of discarding
+        the history.
+
+        Args:
+            value (str): The new medical record.
+
+        Raises:
+            ValueError: If value is empty.
+        """
+        if not value or not value.strip():
+            raise ValueError("Medical record cannot be empty")
+        self._record = value
+        self._notify_record_change(value, replace=True)
 
     def __str__(self):
         """Return a readable string including name, age, medical record, and status."""
@@ -55,28 +115,84 @@ class Patient(Person):
         """
         return f"Medical Record for {self.name}: {self.medical_record}"
 
-    def check_in(self):
+    def add_record_entry(self, kind, text, author=None):
+        """
+        Append an entry to the patient's medical record.
+
+        Args:
+            kind (EntryKind): Type of the entry.
+            text (str): Entry details.
+            author (str | None): Name of the staff member writing it.
+
+        Returns:
+            RecordEntry: The new entry.
+
+        Raises:
+            ValueError: If text is empty.
+        """
+        entry = self.record.append(kind, text, author)
+        self._notify_record_change(str(entry))
+        return entry
+
+    def _notify_record_change(self, text, replace=False):
+        """
+        Tell every department holding this patient that the record changed,
+        so the hospital's record index stays current.
+
+        Args:
+            text (str): The appended entry as rendered ('<Kind>: <text>'), or the whole new record.
+            replace (bool): True if the whole record was replaced.
+        """
+        for department in self._memberships:
+            department._on_record_change(self, text, replace)
+
+    def record_entries(self, offset=0, limit=None):
+        """
+        Read the medical record one page at a time.
+
+        Args:
+            offset (int): Number of entries to skip.
+            limit (int | None): Maximum number of entries; None for all.
+
+        Returns:
+            list[RecordEntry]: The requested entries, oldest first.
+        """
+        return self.record.entries(offset, limit)
+
+    def check_in(self, at=None):
         """
         Mark the patient as checked in.
 
+        Args:
+            at (float | datetime | None): When it happened, for back-dated
+                entries; defaults to now.
+
         Returns:
             str: Confirmation message.
         """
-        if self.status == "in":
-            return f"{self.name} is already checked in."
-        self.status = "in"
+        with self._status_lock():
+            if self._status is Status.IN:
+                return f"{self.name} is already checked in."
+            self._status = Status.IN
+            self._notify_status_change(True, at)
         return f"{self.name} has checked in."
 
-    def check_out(self):
+    def check_out(self, at=None):
         """
         Mark the patient as checked out.
 
+        Args:
+            at (float | datetime | None): When it happened, for back-dated
+                entries; defaults to now.
+
         Returns:
             str: Confirmation message.
         """
-        if self.status == "out":
-            return f"{self.name} is already checked out."
-        self.status = "out"
+        with self._status_lock():
+            if self._status is Status.OUT:
+                return f"{self.name} is already checked out."
+            self._status = Status.OUT
+            self._notify_status_change(False, at)
         return f"{self.name} has checked out."
 
     def is_active(self):
@@ -86,4 +202,4 @@ class Patient(Person):
         Returns:
             bool: True if checked in, False otherwise.
         """
-        return self.status == "in"
+        return self._status is Status.IN
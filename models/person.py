@@ -1,4 +1,18 @@
+import threading
+from contextlib import nullcontext
 from datetime import date
+from enum import Enum
+from itertools import count
+
+_NO_LOCK = nullcontext()
+
+
+class Status(Enum):
+    """Check-in state of a person; members are shared singletons."""
+
+    OUT = "out"
+    IN = "in"
+
 
 class Person:
     """
@@ -10,11 +24,23 @@ class Person:
     utility methods for accessing age, adulthood status, and
     formatted display of information.
 
+    Instances use ``__slots__`` instead of a per-instance ``__dict__`` and
+    store their check-in state as a ``Status`` member, which keeps the
+    footprint small when millions of records are resident.
+
     Attributes:
+        person_id (int): Stable identifier, unique within the running system.
         name (str): Full legal name of the person. Cannot be empty.
         date_of_birth (date): The person's date of birth.
+        status (str): Current check-in status, either 'in' or 'out'.
     """
 
+    __slots__ = ("person_id", "name", "date_of_birth", "_status", "_memberships")
+
+    _id_counter = count(1)
+    # Striped check-in locks, shared by all people; None until concurrency is enabled.
+    _status_locks = None
+
     def __init__(self, name: str, date_of_birth: date) -> None:
         """
         Initialize a Person object with name and date of birth.
@@ -27,15 +53,113 @@ class Person:
             ValueError: If the name is empty or date_of_birth is in the future.
             TypeError: If date_of_birth is not a datetime.date instance.
         """
+        Person._validate(name, date_of_birth)
+
+        self.person_id = next(Person._id_counter)
+        self.name = name
+        self.date_of_birth = date_of_birth
+        self._status = Status.OUT  # Default status is checked out
+        self._memberships = ()
+
+    @staticmethod
+    def _validate(name: str, date_of_birth: date, today: date | None = None) -> None:
+        """
+        Check a name and date of birth without creating a person.
+
+        Bulk loaders validate many rows against one shared ``today``
+        instead of reading the clock once per row.
+
+        Args:
+            name (str): Full legal name.
+            date_of_birth (date): Date of birth.
+            today (date | None): Reference date for the future check; defaults to today.
+
+        Raises:
+            ValueError: If the name is empty or date_of_birth is after ``today``.
+            TypeError: If date_of_birth is not a datetime.date instance.
+        """
         if not name or not name.strip():
             raise ValueError("Name cannot be empty")
         if not isinstance(date_of_birth, date):
             raise TypeError("date_of_birth must be a datetime.date instance")
-        if date_of_birth > date.today():
+        if date_of_birth > (today or date.today()):
             raise ValueError("Date of birth cannot be in the future")
 
-        self.name = name
-        self.date_of_birth = date_of_birth
+    @classmethod
+    def _restore(cls, person_id: int, name: str, date_of_birth: date, status="out", **fields):
+        """
+        Rebuild an already-validated person without running ``__init__``.
+
+        Used by storage backends that hand back records which were validated
+        when they were first created; the original ``person_id`` is kept and
+        no new ID is drawn. Pass ``person_id=None`` to draw a fresh ID for
+        a record that was validated by the caller (see ``_validate``).
+
+        Args:
+            person_id (int | None): The person's existing ID, or None for a new one.
+            name (str): Full legal name.
+            date_of_birth (date): Date of birth.
+            status (str | Status): Check-in status, 'in' or 'out'.
+            **fields: Subclass attributes, e.g. ``medical_record`` or ``position``.
+
+        Returns:
+            Person: Instance of ``cls`` with the given state.
+        """
+        person = cls.__new__(cls)
+        person.person_id = next(Person._id_counter) if person_id is None else person_id
+        person.name = name
+        person.date_of_birth = date_of_birth
+        person._status = Status(status)
+        person._memberships = ()
+        for attr, value in fields.items():
+            setattr(person, attr, value)
+        return person
+
+    @classmethod
+    def _reserve_ids(cls, highest: int) -> None:
+        """
+        Make sure future IDs are greater than ``highest``.
+
+        Called after loading stored people so that newly created ones never
+        reuse an existing ID.
+
+        Args:
+            highest (int): Largest ID already in use.
+        """
+        upcoming = next(Person._id_counter)
+        Person._id_counter = count(max(upcoming, highest + 1))
+
+    @property
+    def status(self) -> str:
+        """
+        Current check-in status.
+
+        Returns:
+            str: 'in' if checked in, 'out' otherwise.
+        """
+        return self._status.value
+
+    @status.setter
+    def status(self, value) -> None:
+        """
+        Set the check-in status.
+
+        A change is made under the person's status lock and reported to
+        the departments holding them, as a check-in or check-out would be,
+        so counters, history and journal stay current.
+
+        Args:
+            value (str | Status): 'in', 'out' or a Status member.
+
+        Raises:
+            ValueError: If value is not a valid status.
+        """
+        status = Status(value)
+        with self._status_lock():
+            if self._status is status:
+                return
+            self._status = status
+            self._notify_status_change(status is Status.IN)
 
     def __str__(self) -> str:
         """
@@ -56,6 +180,39 @@ class Person:
         """
         return f"Person(name={self.name!r}, date_of_birth={self.date_of_birth!r})"
 
+    @staticmethod
+    def _enable_status_locks(stripes: int = 64) -> None:
+        """
+        Make check-in and check-out atomic for callers on several threads.
+
+        People are spread over a fixed set of reentrant locks by
+        ``person_id`` instead of getting one lock each, which keeps
+        instances small.
+
+        Args:
+            stripes (int): Number of locks to spread people over.
+        """
+        if Person._status_locks is None:
+            Person._status_locks = tuple(threading.RLock() for _ in range(stripes))
+
+    def _status_lock(self):
+        """Return the lock guarding this person's check-in state, or a no-op context."""
+        locks = Person._status_locks
+        return _NO_LOCK if locks is None else locks[self.person_id % len(locks)]
+
+    def _notify_status_change(self, active: bool, at=None) -> None:
+        """
+        Tell every department holding this person that their check-in
+        state changed, so department and hospital counters and check-in
+        history stay current.
+
+        Args:
+            active (bool): True if the person just checked in, False if out.
+            at (float | datetime | None): When it happened; defaults to now.
+        """
+        for department in self._memberships:
+            department._on_member_status_change(self, active, at)
+
     def get_age(self) -> int:
         """
         Calculate the person's current age in years.
@@ -0,0 +1,289 @@
+import re
+from datetime import datetime, time
+
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+_DAY_GROUPS = {"daily": range(7), "weekdays": range(5), "weekends": range(5, 7)}
+_ENTRY = re.compile(
+    r"^(?P<days>[a-z][a-z,\- ]*?)\s+(?P<start>\d{1,2}(?::\d{2})?)\s*-\s*(?P<end>\d{1,2}(?::\d{2})?)$",
+    re.IGNORECASE,
+)
+
+
+def minute_of_week(when=None) -> float:
+    """
+    Locate a point in time within the local week.
+
+    Args:
+        when (float | int | datetime | None): Unix timestamp, local datetime
+            or None for now.
+
+    Returns:
+        float: Minutes since Monday 00:00, in ``[0, MINUTES_PER_WEEK)``.
+
+    Raises:
+        TypeError: If when is not a number, datetime or None.
+    """
+    if when is None:
+        when = datetime.now()
+    elif isinstance(when, (int, float)) and not isinstance(when, bool):
+        when = datetime.fromtimestamp(when)
+    elif not isinstance(when, datetime):
+        raise TypeError("Time must be a Unix timestamp or a datetime.")
+    return (when.weekday() * MINUTES_PER_DAY + when.hour * 60 + when.minute
+            + (when.second + when.microsecond / 1e6) / 60)
+
+
+def _minutes(value) -> int:
+    """Convert 'HH:MM', 'H' or a time to minutes after midnight; '24:00' is allowed."""
+    if isinstance(value, time):
+        return value.hour * 60 + value.minute
+    hours, _, minutes = str(value).strip().partition(":")
+    if not hours.isdigit() or (minutes and not minutes.isdigit()):
+        raise ValueError(f"Invalid time '{value}'; use HH:MM.")
+    total = int(hours) * 60 + int(minutes or 0)
+    if int(minutes or 0) >= 60 or total > MINUTES_PER_DAY:
+        raise ValueError(f"Invalid time '{value}'; use HH:MM.")
+    return total
+
+
+def _clock(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class Shift:
+    """
+    A weekly recurring shift: a start time on one weekday and a length.
+
+    A shift whose end time is not after its start time runs overnight into
+    the next day; a Sunday night shift runs into Monday.
+
+    Attributes:
+        day (int): Weekday the shift starts on, 0 for Monday to 6 for Sunday.
+        start (int): Start in minutes after midnight.
+        length (int): Duration in minutes, at most one day.
+    """
+
+    __slots__ = ("day", "start", "length")
+
+    def __init__(self, day, start, end) -> None:
+        """
+        Initialize a Shift.
+
+        Args:
+            day (int | str): Weekday index (0 = Monday) or name, e.g. 'Tue'.
+            start (str | time): Start time, e.g. '08:00'.
+            end (str | time): End time; '24:00' ends at midnight.
+
+        Raises:
+            ValueError: If the day or a time is invalid, or start equals end.
+        """
+        self.day = _day(day)
+        self.start = _minutes(start)
+        end = _minutes(end)
+        if self.start == MINUTES_PER_DAY or end == self.start:
+            raise ValueError("Shift must start before midnight and cannot be empty.")
+        self.length = end - self.start if end > self.start else end + MINUTES_PER_DAY - self.start
+
+    @property
+    def end(self) -> int:
+        """End in minutes after midnight of the start day; above a day for overnight shifts."""
+        return self.start + self.length
+
+    def week_intervals(self) -> list[tuple[int, int]]:
+        """
+        Return the shift as half-open ranges of minutes since Monday 00:00.
+
+        Returns:
+            list[tuple[int, int]]: One range, or two if the shift wraps from
+                Sunday into Monday.
+        """
+        start = self.day * MINUTES_PER_DAY + self.start
+        end = start + self.length
+        if end <= MINUTES_PER_WEEK:
+            return [(start, end)]
+        return [(start, MINUTES_PER_WEEK), (0, end - MINUTES_PER_WEEK)]
+
+    def covers(self, minute: float) -> bool:
+        """
+        Check whether the shift is running at a minute of the week.
+
+        Args:
+            minute (float): Minutes since Monday 00:00, as from ``minute_of_week``.
+
+        Returns:
+            bool: True if the minute falls within the shift.
+        """
+        return any(start <= minute < end for start, end in self.week_intervals())
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Shift):
+            return NotImplemented
+        return (self.day, self.start, self.length) == (other.day, other.start, other.length)
+
+    def __hash__(self) -> int:
+        return hash((self.day, self.start, self.length))
+
+    def __str__(self) -> str:
+        """Return the shift as e.g. 'Mon 22:00-06:00'."""
+        return f"{DAYS[self.day]} {self.times()}"
+
+    def __repr__(self) -> str:
+        """Return a developer-friendly string for debugging."""
+        start, end = self.times().split("-")
+        return f"Shift({DAYS[self.day]!r}, {start!r}, {end!r})"
+
+    def times(self) -> str:
+        """Return the start and end times as 'HH:MM-HH:MM'."""
+        end = self.end % MINUTES_PER_DAY
+        if end == 0 and self.end == MINUTES_PER_DAY:
+            end = MINUTES_PER_DAY
+        return f"{_clock(self.start)}-{_clock(end)}"
+
+
+class Schedule:
+    """
+    A staff member's weekly recurring shifts.
+
+    Schedules are written as ``;``-separated entries of days and a time
+    range, e.g. ``"Mon-Fri 08:00-16:00; Sat,Sun 20:00-08:00"``. Days can
+    be names, ranges of names, or 'daily', 'weekdays' and 'weekends'.
+    ``str()`` gives the same format back, so schedules are stored as text.
+
+    Attributes:
+        shifts (tuple[Shift, ...]): The shifts, ordered by start within the week.
+    """
+
+    __slots__ = ("shifts",)
+
+    def __init__(self, shifts=()) -> None:
+        """
+        Initialize a Schedule.
+
+        Args:
+            shifts (iterable[Shift]): The shifts; duplicates are dropped.
+
+        Raises:
+            TypeError: If an item is not a Shift.
+        """
+        shifts = set(shifts)
+        if not all(isinstance(shift, Shift) for shift in shifts):
+            raise TypeError("Schedule entries must be Shift instances.")
+        self.shifts = tuple(sorted(shifts, key=lambda s: (s.day, s.start, s.length)))
+
+    @classmethod
+    def parse(cls, text: str) -> "Schedule":
+        """
+        Build a schedule from its text form.
+
+        Args:
+            text (str): Entries such as 'Mon-Fri 08:00-16:00; Sun 22:00-06:00'.
+
+        Returns:
+            Schedule: The parsed schedule.
+
+        Raises:
+            ValueError: If an entry cannot be parsed or the text has none.
+        """
+        shifts = []
+        for entry in re.split(r"[;\n]", text):
+            entry = entry.strip()
+            if not entry:
+                continue
+            match = _ENTRY.match(entry)
+            if match is None:
+                raise ValueError(f"Invalid schedule entry '{entry}'; use e.g. 'Mon-Fri 08:00-16:00'.")
+            for day in _days(match["days"]):
+                shifts.append(Shift(day, match["start"], match["end"]))
+        if not shifts:
+            raise ValueError("Schedule must contain at least one shift.")
+        return cls(shifts)
+
+    def week_intervals(self) -> list[tuple[int, int]]:
+        """
+        Return every shift as half-open ranges of minutes since Monday 00:00.
+
+        Returns:
+            list[tuple[int, int]]: The ranges, in shift order.
+        """
+        return [interval for shift in self.shifts for interval in shift.week_intervals()]
+
+    def covers(self, when=None) -> bool:
+        """
+        Check whether any shift is running at a point in time.
+
+        Args:
+            when (float | datetime | None): Unix timestamp, local datetime or None for now.
+
+        Returns:
+            bool: True if on shift.
+        """
+        minute = minute_of_week(when)
+        return any(shift.covers(minute) for shift in self.shifts)
+
+    def __len__(self) -> int:
+        """Return the number of shifts."""
+        return len(self.shifts)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Schedule):
+            return NotImplemented
+        return self.shifts == other.shifts
+
+    def __hash__(self) -> int:
+        return hash(self.shifts)
+
+    def __str__(self) -> str:
+        """Return the text form, grouping days that share the same times."""
+        groups = {}
+        for shift in self.shifts:
+            groups.setdefault(shift.times(), []).append(shift.day)
+        return "; ".join(f"{_format_days(days)} {times}" for times, days in groups.items())
+
+    def __repr__(self) -> str:
+        """Return a developer-friendly string for debugging."""
+        return f"Schedule.parse({str(self)!r})"
+
+
+def _day(value) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        if 0 <= value < 7:
+            return value
+    elif isinstance(value, str):
+        name = value.strip()[:3].title()
+        if name in DAYS:
+            return DAYS.index(name)
+    raise ValueError(f"Invalid day '{value}'; use Mon..Sun or 0..6.")
+
+
+def _days(text: str) -> list[int]:
+    """Expand 'Mon-Fri', 'Sat,Sun', 'daily', 'weekdays' or 'weekends' into weekday indexes."""
+    days = []
+    for part in text.split(","):
+        part = part.strip().lower()
+        if part in _DAY_GROUPS:
+            days.extend(_DAY_GROUPS[part])
+            continue
+        first, dash, last = part.partition("-")
+        first = _day(first)
+        if not dash:
+            days.append(first)
+            continue
+        last = _day(last)
+        days.extend((first + offset) % 7 for offset in range((last - first) % 7 + 1))
+    return days
+
+
+def _format_days(days: list[int]) -> str:
+    """Collapse sorted weekday indexes into runs: [0, 1, 2, 4] -> 'Mon-Wed,Fri'."""
+    runs = []
+    for day in days:
+        if runs and day == runs[-1][1] + 1:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day])
+    return ",".join(
+        DAYS[first] if first == last else f"{DAYS[first]}-{DAYS[last]}" for first, last in runs
+    )
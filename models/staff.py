@@ -1,6 +1,65 @@
+import re
 from datetime import date
-from .person import Person
+from enum import Enum
+from .medical_record import EntryKind
+from .person import Person, Status
 from .patient import Patient  # Ensure correct typing
+from .schedule import Schedule
+
+
+class Role(Enum):
+    """Normalized job role of a staff member, derived from their free-text position."""
+
+    DOCTOR = "doctor"
+    NURSE = "nurse"
+    TECHNICIAN = "technician"
+    PHARMACIST = "pharmacist"
+    ADMINISTRATOR = "administrator"
+    OTHER = "other"
+
+    @classmethod
+    def from_position(cls, position: str, name: str = "") -> "Role":
+        """
+        Classify a free-text job title.
+
+        Matching is by whole word, so 'Senior Surgeon' and 'Cardiologist'
+        are doctors while 'Doctoral researcher' is not. The last role word
+        decides, as it names the job while earlier words qualify it:
+        'Resident Nurse' is a nurse and 'Physician Assistant' is not a
+        doctor. A name with a 'Dr' title marks a doctor when the position
+        alone says nothing.
+
+        Args:
+            position (str): Job title, e.g. 'Attending Physician'.
+            name (str): The staff member's name, checked for a 'Dr' title.
+
+        Returns:
+            Role: The matching role, or Role.OTHER.
+        """
+        found = None
+        for word in _WORD.findall(position.lower()):
+            role = _ROLE_WORDS.get(word)
+            if role is None and word.endswith(_DOCTOR_SUFFIXES):
+                role = cls.DOCTOR
+            if role is not None:
+                found = role
+        if found is None:
+            found = cls.DOCTOR if _DOCTOR_TITLE.match(name) else cls.OTHER
+        return found
+
+
+_WORD = re.compile(r"[a-z]+")
+_DOCTOR_TITLE = re.compile(r"\s*dr\b", re.IGNORECASE)
+_DOCTOR_SUFFIXES = ("ologist", "iatrist", "iatrician")
+_ROLE_WORDS = {
+    **dict.fromkeys(("doctor", "dr", "physician", "surgeon"), Role.DOCTOR),
+    **dict.fromkeys(("nurse", "midwife"), Role.NURSE),
+    **dict.fromkeys(("technician", "technologist", "tech", "radiographer"), Role.TECHNICIAN),
+    **dict.fromkeys(("pharmacist",), Role.PHARMACIST),
+    **dict.fromkeys(("admin", "administrator", "receptionist", "clerk", "manager"), Role.ADMINISTRATOR),
+    # Jobs that would otherwise pass for a doctor by suffix or by qualifying a doctor word.
+    **dict.fromkeys(("psychologist", "audiologist", "assistant", "aide"), Role.OTHER),
+}
 
 
 class Staff(Person):
@@ -14,9 +73,13 @@ class Staff(Person):
         name (str): Full legal name of the staff member.
         date_of_birth (date): Staff member's date of birth.
         position (str): Job title or role within the hospital.
-        schedule (str | None): Work schedule for the staff member, defaults to None.
+        role (Role): Normalized role, recomputed whenever position changes.
+        schedule (Schedule | None): Weekly recurring shifts, defaults to None.
+        status (str): Current status of the staff member, either 'in' or 'out'.
     """
 
+    __slots__ = ("_position", "role", "_schedule")
+
     def __init__(self, name: str, date_of_birth: date, position: str) -> None:
         """
         Initialize a Staff object.
@@ -35,6 +98,69 @@ class Staff(Person):
         self.position = position
         self.schedule = None
 
+    @property
+    def position(self) -> str:
+        """
+        Job title or role within the hospital.
+
+        Returns:
+            str: The position as entered.
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: str) -> None:
+        """
+        Set the position and reclassify the staff member's role.
+
+        Departments holding the staff member are told when the role
+        changes, so their role indexes stay current.
+
+        Args:
+            value (str): New job title.
+        """
+        old = getattr(self, "role", None)
+        self._position = value
+        self.role = Role.from_position(value, self.name)
+        if old is not None and old is not self.role:
+            for department in self._memberships:
+                department._on_role_change(self, old)
+
+    @property
+    def schedule(self) -> Schedule | None:
+        """
+        Weekly recurring shifts.
+
+        Returns:
+            Schedule | None: The schedule, or None if not set.
+        """
+        return self._schedule
+
+    @schedule.setter
+    def schedule(self, value) -> None:
+        """
+        Set the schedule, parsing its text form if given a string.
+
+        Departments holding the staff member are told, so their shift
+        indexes stay current.
+
+        Args:
+            value (Schedule | str | None): Shifts such as 'Mon-Fri 08:00-16:00', or None.
+
+        Raises:
+            ValueError: If a string cannot be parsed.
+            TypeError: If value is not a Schedule, str or None.
+        """
+        if isinstance(value, str):
+            value = Schedule.parse(value) if value.strip() else None
+        elif value is not None and not isinstance(value, Schedule):
+            raise TypeError("schedule must be a Schedule, a string or None")
+        changed = getattr(self, "_schedule", None) != value
+        self._schedule = value
+        if changed:
+            for department in self._memberships:
+                department._on_schedule_change(self)
+
     def __str__(self) -> str:
         """Return a user-friendly string representation of the staff member."""
         return f"Staff Name: {self.name}, Age: {self.get_age()}, Position: {self.position}"
@@ -43,7 +169,7 @@ class Staff(Person):
         """Return a detailed string representation of the staff member for debugging."""
         return (
             f"Staff(name={self.name!r}, date_of_birth={self.date_of_birth!r}, "
-            f"position={self.position!r}, schedule={self.schedule!r})"
+            f"position={self.position!r}, schedule={self.schedule and str(self.schedule)!r})"
         )
 
     def view_info(self) -> str:
@@ -55,12 +181,16 @@ class Staff(Person):
         """
         return str(self)
 
-    def set_schedule(self, schedule: str) -> None:
+    def set_schedule(self, schedule: Schedule | str | None) -> None:
         """
         Assign a work schedule to the staff member.
 
         Args:
-            schedule (str): Schedule description.
+            schedule (Schedule | str | None): Weekly shifts, e.g.
+                'Mon-Fri 08:00-16:00; Sat 20:00-08:00', or None to clear.
+
+        Raises:
+            ValueError: If a string cannot be parsed.
         """
         self.schedule = schedule
 
@@ -73,35 +203,55 @@ class Staff(Person):
         """
         return f"{self.name}'s Schedule: {self.schedule or 'Not set'}"
 
+    def is_on_shift(self, when=None) -> bool:
+        """
+        Check whether the staff member's schedule has them working at a given time.
+
+        Args:
+            when (float | datetime | None): Unix timestamp, local datetime or None for now.
+
+        Returns:
+            bool: True if a scheduled shift covers ``when``; False without a schedule.
+        """
+        return self._schedule is not None and self._schedule.covers(when)
+
     def diagnose_patient(self, patient: Patient, diagnosis: str) -> str:
         """
-        Record a diagnosis for a patient.
+        Record a diagnosis in the patient's medical record.
 
         Args:
             patient (Patient): The patient being diagnosed.
             diagnosis (str): The diagnosis details.
 
+        Raises:
+            ValueError: If the diagnosis is empty.
+
         Returns:
             str: Confirmation message.
         """
+        patient.add_record_entry(EntryKind.DIAGNOSIS, diagnosis, self.name)
         return f"{self.name} diagnosed {patient.name} with: {diagnosis}"
 
     def prescribe_treatment(self, patient: Patient, treatment: str) -> str:
         """
-        Prescribe treatment for a patient.
+        Prescribe treatment for a patient and record it in their medical record.
 
         Args:
             patient (Patient): The patient receiving treatment.
             treatment (str): Treatment description.
 
+        Raises:
+            ValueError: If the treatment is empty.
+
         Returns:
             str: Confirmation message.
         """
+        patient.add_record_entry(EntryKind.TREATMENT, treatment, self.name)
         return f"{self.name} prescribed {treatment} to {patient.name}"
 
     def update_patient_record(self, patient: Patient, new_record: str) -> str:
         """
-        Update a patient's medical record.
+        Update a patient's medical record by appending a note.
 
         Args:
             patient (Patient): The patient whose record is updated.
@@ -115,13 +265,50 @@ class Staff(Person):
         """
         if not new_record or not new_record.strip():
             raise ValueError("Medical record cannot be empty")
-        patient.medical_record = new_record
+        patient.add_record_entry(EntryKind.NOTE, new_record, self.name)
         return f"Medical record updated for {patient.name}"
 
-    def check_in(self) -> str:
-        """Mark the staff member as checked in."""
+    def check_in(self, at=None) -> str:
+        """
+        Mark the staff member as checked in.
+
+        Args:
+            at (float | datetime | None): When it happened, for back-dated
+                entries; defaults to now.
+
+        Returns:
+            str: Confirmation message.
+        """
+        with self._status_lock():
+            if self._status is Status.IN:
+                return f"{self.name} is already checked in."
+            self._status = Status.IN
+            self._notify_status_change(True, at)
         return f"{self.name} has checked in."
 
-    def check_out(self) -> str:
-        """Mark the staff member as checked out."""
+    def check_out(self, at=None) -> str:
+        """
+        Mark the staff member as checked out.
+
+        Args:
+            at (float | datetime | None): When it happened, for back-dated
+                entries; defaults to now.
+
+        Returns:
+            str: Confirmation message.
+        """
+        with self._status_lock():
+            if self._status is Status.OUT:
+                return f"{self.name} is already checked out."
+            self._status = Status.OUT
+            self._notify_status_change(False, at)
         return f"{self.name} has checked out."
+
+    def is_active(self) -> bool:
+        """
+        Check if the staff member is currently on site (checked in).
+
+        Returns:
+            bool: True if checked in, False otherwise.
+        """
+        return self._status is Status.IN
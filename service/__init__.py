@@ -0,0 +1,16 @@
+# service/__init__.py
+
+from .api import HospitalAPI, ServiceError, person_summary
+from .client import ServiceClient
+from .server import DEFAULT_HOST, DEFAULT_PORT, HospitalServer, serve
+
+__all__ = [
+    "DEFAULT_HOST",
+    "DEFAULT_PORT",
+    "HospitalAPI",
+    "HospitalServer",
+    "ServiceClient",
+    "ServiceError",
+    "person_summary",
+    "serve",
+]
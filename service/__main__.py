@@ -0,0 +1,66 @@
+# service/__main__.py
+"""
+Run the hospital service from the command line:
+
+    python -m service --db hospital.db [--port 8765]
+
+The hospital is loaded from the SQLite file at startup (if present) and
+saved back on Ctrl+C.
+"""
+import argparse
+import asyncio
+
+from core.hospital import Hospital
+from storage import SQLiteStore
+
+from .api import HospitalAPI
+from .server import DEFAULT_HOST, DEFAULT_PORT, HospitalServer
+
+
+def parse_args(argv=None):
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(prog="python -m service", description="Local JSON service for a hospital")
+    parser.add_argument("--db", help="SQLite file to load the hospital from and save it to on exit")
+    parser.add_argument("--hospital", nargs=2, metavar=("NAME", "LOCATION"),
+                        help="create the hospital if none is stored yet")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"loopback address to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port to bind (default: {DEFAULT_PORT})")
+    parser.add_argument("--max-connections", type=int, default=10_000, help="refuse connections beyond this many")
+    return parser.parse_args(argv)
+
+
+async def run(server):
+    await server.start()
+    host, port = server.address
+    print(f"Serving on {host}:{port} (Ctrl+C to stop).")
+    await server.serve_forever()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = SQLiteStore(args.db) if args.db else None
+    hospital = store.load() if store else None
+    if hospital:
+        print(f"Loaded hospital '{hospital.name}' from {args.db}.")
+    elif args.hospital:
+        hospital = Hospital(*args.hospital)
+    api = HospitalAPI(hospital)
+    try:
+        server = HospitalServer(api, args.host, args.port, max_connections=args.max_connections)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    try:
+        asyncio.run(run(server))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if store:
+            if api.hospital:
+                store.save(api.hospital)
+                print(f"Hospital saved to {args.db}.")
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
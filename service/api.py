@@ -0,0 +1,461 @@
+# service/api.py
+"""
+Operations the service exposes, as plain methods over a Hospital.
+
+``HospitalAPI`` offers what the menus of ``main.py`` offer: create a
+hospital, add departments, patients and staff, check people in and out,
+discharge, diagnose and prescribe, view information and search. Each
+operation takes JSON-compatible keyword arguments and returns a
+JSON-compatible value, so the API knows nothing about sockets and can be
+called directly. Failures raise ``ServiceError`` with a short machine-
+readable code next to the message.
+
+The API itself does no locking: the server calls it from its event loop
+thread only. A hospital that other threads also use must have
+``enable_concurrency`` switched on.
+"""
+import inspect
+from datetime import datetime
+
+from core.department import Department
+from core.hospital import Hospital
+from core.triage import ACUITY_LEVELS
+from models.patient import Patient
+from models.staff import Staff
+
+# Error codes carried in responses.
+BAD_REQUEST = "bad_request"
+NOT_FOUND = "not_found"
+CONFLICT = "conflict"
+INVALID = "invalid"
+
+
+class ServiceError(Exception):
+    """
+    Failure of a service operation.
+
+    Attributes:
+        code (str): One of 'bad_request', 'not_found', 'conflict' or 'invalid'.
+        message (str): Human-readable description.
+    """
+
+    def __init__(self, code, message):
+        """
+        Initialize a ServiceError.
+
+        Args:
+            code (str): Machine-readable error code.
+            message (str): Human-readable description.
+        """
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+def person_summary(member):
+    """
+    Describe a patient or staff member as a JSON-compatible dict.
+
+    Args:
+        member (Patient | PatientView | Staff): The person.
+
+    Returns:
+        dict: ``id``, ``kind``, ``name``, ``date_of_birth`` (ISO), ``age`` and
+            ``status``, plus ``medical_record`` for patients or ``position``,
+            ``role`` and ``schedule`` for staff.
+    """
+    summary = {
+        "id": member.person_id,
+        "name": member.name,
+        "date_of_birth": member.date_of_birth.isoformat(),
+        "age": member.get_age(),
+        "status": member.status,
+    }
+    if isinstance(member, Staff):
+        summary["kind"] = "staff"
+        summary["position"] = member.position
+        summary["role"] = member.role.value
+        summary["schedule"] = member.schedule and str(member.schedule)
+    else:
+        summary["kind"] = "patient"
+        summary["medical_record"] = member.medical_record
+    return summary
+
+
+class HospitalAPI:
+    """
+    JSON-compatible operations over one hospital.
+
+    Attributes:
+        hospital (Hospital | None): The hospital, or None until ``create_hospital``.
+    """
+
+    # Public operations, by the name clients send in a request's "op" field.
+    OPERATIONS = (
+        "ping",
+        "create_hospital",
+        "hospital_info",
+        "add_department",
+        "department_info",
+        "add_patient",
+        "add_staff",
+        "check_in",
+        "check_out",
+        "discharge",
+        "diagnose",
+        "search_records",
+        "search_names",
+    )
+
+    def __init__(self, hospital=None):
+        """
+        Initialize the API.
+
+        Args:
+            hospital (Hospital | None): Hospital to serve; None lets a client create one.
+        """
+        self.hospital = hospital
+        self._signatures = {op: inspect.signature(getattr(self, op)) for op in self.OPERATIONS}
+
+    def call(self, op, params=None):
+        """
+        Run an operation by name.
+
+        Args:
+            op (str): Operation name, one of ``OPERATIONS``.
+            params (dict | None): Keyword arguments of the operation.
+
+        Returns:
+            object: The JSON-compatible result.
+
+        Raises:
+            ServiceError: If the operation is unknown, the arguments do not
+                fit it, or the operation itself fails.
+        """
+        signature = self._signatures.get(op)
+        if signature is None:
+            raise ServiceError(BAD_REQUEST, f"Unknown operation {op!r}.")
+        params = params or {}
+        if not isinstance(params, dict):
+            raise ServiceError(BAD_REQUEST, "params must be an object.")
+        try:
+            signature.bind(**params)
+        except TypeError as e:
+            raise ServiceError(BAD_REQUEST, f"{op}: {e}") from None
+        try:
+            return getattr(self, op)(**params)
+        except (ValueError, TypeError) as e:
+            raise ServiceError(INVALID, str(e)) from None
+
+    def ping(self):
+        """Return 'pong'; lets clients check the connection."""
+        return "pong"
+
+    def create_hospital(self, name, location):
+        """
+        Create the hospital the service manages.
+
+        Args:
+            name (str): Name of the hospital.
+            location (str): Location of the hospital.
+
+        Returns:
+            dict: As ``hospital_info``.
+
+        Raises:
+            ServiceError: If a hospital already exists.
+        """
+        if self.hospital is not None:
+            raise ServiceError(CONFLICT, "Hospital already created.")
+        self.hospital = Hospital(name, location)
+        return self.hospital_info()
+
+    def hospital_info(self):
+        """
+        Summarize the hospital and every department.
+
+        Returns:
+            dict: ``name``, ``location``, the four hospital-wide totals and
+                ``departments``, a list of per-department counts.
+        """
+        hospital = self._hospital()
+        patients, staff, checked_in_patients, checked_in_staff = hospital.totals()
+        return {
+            "name": hospital.name,
+            "location": hospital.location,
+            "patients": patients,
+            "staff": staff,
+            "checked_in_patients": checked_in_patients,
+            "checked_in_staff": checked_in_staff,
+            "departments": [_department_counts(dept) for dept in hospital.departments],
+        }
+
+    def add_department(self, name):
+        """
+        Add a department.
+
+        Args:
+            name (str): Name of the new department.
+
+        Returns:
+            dict: The department's counts.
+
+        Raises:
+            ServiceError: If a department with that name exists.
+        """
+        hospital = self._hospital()
+        if isinstance(name, str) and name.strip() and hospital.find_department(name.strip()) is not None:
+            raise ServiceError(CONFLICT, f"Department '{name.strip()}' already exists.")
+        department = Department(name)
+        hospital.add_department(department)
+        return _department_counts(department)
+
+    def department_info(self, department, offset=0, limit=100):
+        """
+        Describe a department: counts, triage queue and a page of its members.
+
+        Args:
+            department (str): Name of the department.
+            offset (int): Number of patients and staff to skip.
+            limit (int): Maximum number of patients and of staff to list.
+
+        Returns:
+            dict: The department's counts plus ``triage`` statistics and
+                ``patients`` and ``staff`` lists of person summaries.
+        """
+        dept = self._department(department)
+        if not _is_count(offset) or not _is_count(limit):
+            raise ServiceError(BAD_REQUEST, "offset and limit must be non-negative integers.")
+        info = _department_counts(dept)
+        info["triage"] = dept.triage.stats()
+        info["patients"] = [person_summary(p) for p in dept.patients[offset:offset + limit]]
+        info["staff"] = [person_summary(s) for s in dept.staff[offset:offset + limit]]
+        return info
+
+    def add_patient(self, department, name, date_of_birth, medical_record):
+        """
+        Add a patient to a department.
+
+        Args:
+            department (str): Name of the department.
+            name (str): Full name of the patient.
+            date_of_birth (str): Date of birth as YYYY-MM-DD.
+            medical_record (str): Initial medical record.
+
+        Returns:
+            dict: Summary of the new patient.
+        """
+        dept = self._department(department)
+        patient = Patient(name, _parse_date(date_of_birth), medical_record)
+        dept.add_patient(patient)
+        return person_summary(patient)
+
+    def add_staff(self, department, name, date_of_birth, position, schedule=None):
+        """
+        Add a staff member to a department.
+
+        Args:
+            department (str): Name of the department.
+            name (str): Full name of the staff member.
+            date_of_birth (str): Date of birth as YYYY-MM-DD.
+            position (str): Job title.
+            schedule (str | None): Weekly schedule, e.g. 'Mon-Fri 08:00-16:00'.
+
+        Returns:
+            dict: Summary of the new staff member.
+        """
+        dept = self._department(department)
+        staff_member = Staff(name, _parse_date(date_of_birth), position)
+        staff_member.set_schedule(schedule or None)
+        dept.add_staff(staff_member)
+        return person_summary(staff_member)
+
+    def check_in(self, department, person_id, acuity=None):
+        """
+        Check a patient or staff member in.
+
+        Args:
+            department (str): Name of the department.
+            person_id (int): ID of the patient or staff member.
+            acuity (int | None): Triage acuity 1-5 for a patient who is not queued yet.
+
+        Returns:
+            dict: ``message`` and the ``person``'s summary.
+        """
+        dept = self._department(department)
+        member = self._member(dept, person_id)
+        if acuity is not None and not _is_int(acuity):
+            raise ServiceError(BAD_REQUEST, "acuity must be an integer.")
+        if acuity is not None and acuity not in ACUITY_LEVELS:
+            raise ServiceError(INVALID, "Acuity must be an integer from 1 (most urgent) to 5.")
+        message = member.check_in()
+        if acuity is not None and not isinstance(member, Staff) and member.person_id not in dept.triage:
+            dept.enqueue_patient(member.person_id, acuity)
+        return {"message": message, "person": person_summary(member)}
+
+    def check_out(self, department, person_id):
+        """
+        Check a patient or staff member out.
+
+        Args:
+            department (str): Name of the department.
+            person_id (int): ID of the patient or staff member.
+
+        Returns:
+            dict: ``message`` and the ``person``'s summary.
+        """
+        member = self._member(self._department(department), person_id)
+        return {"message": member.check_out(), "person": person_summary(member)}
+
+    def discharge(self, department, person_id):
+        """
+        Check a patient out and remove them from a department.
+
+        Args:
+            department (str): Name of the department.
+            person_id (int): ID of the patient.
+
+        Returns:
+            dict: Summary of the discharged patient.
+        """
+        dept = self._department(department)
+        _check_id(person_id, "person_id")
+        patient = dept.discharge_patient(person_id)
+        if patient is None:
+            raise ServiceError(NOT_FOUND, f"Patient #{person_id} not found in {department}.")
+        return person_summary(patient)
+
+    def diagnose(self, department, patient_id, diagnosis=None, treatment=None, doctor_id=None):
+        """
+        Record a diagnosis and/or treatment for a patient.
+
+        The doctor is ``doctor_id`` if given; otherwise a checked-in patient
+        is assigned to the least loaded eligible doctor, as in the menus.
+
+        Args:
+            department (str): Name of the department.
+            patient_id (int): ID of the patient.
+            diagnosis (str | None): Diagnosis to record.
+            treatment (str | None): Treatment to prescribe.
+            doctor_id (int | None): ID of the staff member acting as doctor.
+
+        Returns:
+            dict: ``doctor`` (ID) and ``messages``, one per recorded entry.
+        """
+        dept = self._department(department)
+        _check_id(patient_id, "patient_id")
+        if doctor_id is not None:
+            _check_id(doctor_id, "doctor_id")
+        patient = dept.get_patient(patient_id)
+        if patient is None:
+            raise ServiceError(NOT_FOUND, f"Patient #{patient_id} not found in {dept.name}.")
+        if doctor_id is not None:
+            doctor = dept.get_staff(doctor_id)
+            if doctor is None:
+                raise ServiceError(NOT_FOUND, f"Staff #{doctor_id} not found in {dept.name}.")
+            if not doctor.is_active():
+                raise ServiceError(CONFLICT, f"{doctor.name} is not checked in.")
+        else:
+            doctor = dept.assign_patient(patient_id) if patient.is_active() else None
+            if doctor is None:
+                raise ServiceError(CONFLICT, "No doctor available; check the patient in or pass doctor_id.")
+        messages = []
+        if diagnosis:
+            messages.append(doctor.diagnose_patient(patient, diagnosis))
+        if treatment:
+            messages.append(doctor.prescribe_treatment(patient, treatment))
+        return {"doctor": doctor.person_id, "messages": messages}
+
+    def search_records(self, query, limit=50):
+        """
+        Full-text search over medical records.
+
+        Args:
+            query (str): Search terms (AND by default; OR, -term, prefix*).
+            limit (int): Maximum number of matches returned.
+
+        Returns:
+            list[dict]: ``department`` and ``patient`` summary per match.
+        """
+        if not isinstance(query, str):
+            raise ServiceError(BAD_REQUEST, "query must be a string.")
+        if not _is_count(limit):
+            raise ServiceError(BAD_REQUEST, "limit must be a non-negative integer.")
+        matches = self._hospital().search_records(query)
+        return [{"department": dept.name, "patient": person_summary(p)} for dept, p in matches[:limit]]
+
+    def search_names(self, query, k=10, staff=False):
+        """
+        Type-ahead name search across departments.
+
+        Args:
+            query (str): Part of a name.
+            k (int): Maximum number of matches.
+            staff (bool): Search staff instead of patients.
+
+        Returns:
+            list[dict]: ``department`` and ``person`` summary per match, best first.
+        """
+        if not isinstance(query, str):
+            raise ServiceError(BAD_REQUEST, "query must be a string.")
+        if not _is_count(k):
+            raise ServiceError(BAD_REQUEST, "k must be a non-negative integer.")
+        if not isinstance(staff, bool):
+            raise ServiceError(BAD_REQUEST, "staff must be true or false.")
+        matches = self._hospital().search_names(query, k, staff=staff)
+        return [{"department": dept.name, "person": person_summary(m)} for dept, m in matches]
+
+    def _hospital(self):
+        if self.hospital is None:
+            raise ServiceError(NOT_FOUND, "Create a hospital first.")
+        return self.hospital
+
+    def _department(self, name):
+        if not isinstance(name, str) or not name:
+            raise ServiceError(BAD_REQUEST, "department must be a non-empty string.")
+        department = self._hospital().find_department(name)
+        if department is None:
+            raise ServiceError(NOT_FOUND, f"Department '{name}' not found.")
+        return department
+
+    def _member(self, department, person_id):
+        _check_id(person_id, "person_id")
+        member = department.get_patient(person_id)
+        if member is None:
+            member = department.get_staff(person_id)
+        if member is None:
+            raise ServiceError(NOT_FOUND, f"Person #{person_id} not found in {department.name}.")
+        return member
+
+
+def _department_counts(department):
+    return {
+        "name": department.name,
+        "patients": department.get_patient_count(),
+        "staff": department.get_staff_count(),
+        "checked_in_patients": department.get_checked_in_patient_count(),
+        "checked_in_staff": department.get_checked_in_staff_count(),
+    }
+
+
+def _is_int(value):
+    # bool is an int subclass, but JSON true/false are never meant as numbers.
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_count(value):
+    return _is_int(value) and value >= 0
+
+
+def _check_id(value, name):
+    if not _is_int(value):
+        raise ServiceError(BAD_REQUEST, f"{name} must be an integer.")
+
+
+def _parse_date(text):
+    if not isinstance(text, str):
+        raise ServiceError(BAD_REQUEST, "date_of_birth must be a YYYY-MM-DD string.")
+    try:
+        return datetime.strptime(text, "%Y-%m-%d").date()
+    except ValueError:
+        raise ServiceError(INVALID, "Invalid date format. Use YYYY-MM-DD.") from None
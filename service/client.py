@@ -0,0 +1,124 @@
+# service/client.py
+"""
+Minimal asyncio client for the hospital service.
+
+``call`` sends one request and waits for its answer; ``pipeline`` sends
+a whole batch before reading any answers, which saves a round trip per
+request. A client is one connection and expects one caller at a time.
+"""
+import asyncio
+import json
+
+from .api import ServiceError
+from .server import DEFAULT_HOST, DEFAULT_PORT
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class ServiceClient:
+    """
+    Connection to a running hospital service.
+
+    Usable as an async context manager that closes the connection.
+    """
+
+    def __init__(self, reader, writer):
+        """
+        Wrap an open connection; use ``connect`` to open one.
+
+        Args:
+            reader (asyncio.StreamReader): Stream of response lines.
+            writer (asyncio.StreamWriter): Stream the requests are written to.
+        """
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT, limit=1 << 24):
+        """
+        Open a connection to a service.
+
+        Args:
+            host (str): Address of the service.
+            port (int): Port of the service.
+            limit (int): Longest response line accepted, in bytes.
+
+        Returns:
+            ServiceClient: The connected client.
+        """
+        reader, writer = await asyncio.open_connection(host, port, limit=limit)
+        return cls(reader, writer)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    async def call(self, op, **params):
+        """
+        Run one operation and wait for its result.
+
+        Args:
+            op (str): Operation name.
+            **params: Arguments of the operation.
+
+        Returns:
+            object: The operation's result.
+
+        Raises:
+            ServiceError: If the service reports an error.
+        """
+        result = (await self.pipeline([(op, params)]))[0]
+        if isinstance(result, ServiceError):
+            raise result
+        return result
+
+    async def pipeline(self, requests):
+        """
+        Send several requests at once, then collect every answer.
+
+        Args:
+            requests (iterable[tuple[str, dict]]): (operation, params) pairs.
+
+        Returns:
+            list: One result per request, in order; failed requests give
+                their ``ServiceError`` instead of raising it.
+
+        Raises:
+            ConnectionError: If the service closes the connection early or
+                answers out of order.
+        """
+        first = self._next_id
+        lines = []
+        for op, params in requests:
+            lines.append(_encode({"id": self._next_id, "op": op, "params": params}))
+            self._next_id += 1
+        if not lines:
+            return []
+        self._writer.write(("\n".join(lines) + "\n").encode())
+        await self._writer.drain()
+        results = []
+        for expected in range(first, self._next_id):
+            line = await self._reader.readline()
+            if not line:
+                raise ConnectionError("The service closed the connection.")
+            response = json.loads(line)
+            if response.get("id") != expected:
+                error = response.get("error") or {}
+                raise ConnectionError(error.get("message") or f"Response {response.get('id')} out of order.")
+            if response["ok"]:
+                results.append(response["result"])
+            else:
+                results.append(ServiceError(response["error"]["code"], response["error"]["message"]))
+        return results
+
+    async def close(self):
+        """Close the connection."""
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
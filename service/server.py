@@ -0,0 +1,310 @@
+# service/server.py
+"""
+Asyncio server speaking newline-delimited JSON over TCP.
+
+Each request is one JSON object on one line::
+
+    {"id": 7, "op": "check_in", "params": {"department": "ER", "person_id": 12}}
+
+and each response is one line carrying the same ``id``::
+
+    {"id": 7, "ok": true, "result": {...}}
+    {"id": 7, "ok": false, "error": {"code": "not_found", "message": "..."}}
+
+Connections are kept open for any number of requests (keep-alive) and
+clients may send many requests without waiting for the answers
+(pipelining); responses always come back in request order. Every request
+that arrived in one read is answered with as few writes as possible.
+
+Backpressure works in both directions. A client that stops reading its
+responses fills the connection's write buffer; past the transport's
+high-water mark the server stops answering and stops reading that
+client's requests until the buffer drains, so a slow client costs a
+bounded amount of memory however many requests it has pipelined.
+A request line longer than ``max_line`` bytes, complete or not, gets an
+error after the answers to the requests before it and the connection is
+closed, and connections beyond ``max_connections`` are
+refused with an error. Idle connections are closed after ``idle_timeout``
+seconds.
+
+The model is called on the event loop thread, one request at a time, so
+no locking is needed unless other threads share the hospital. The
+service has no authentication and only binds to loopback addresses.
+"""
+import asyncio
+import ipaddress
+import json
+
+from .api import BAD_REQUEST, ServiceError
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Error codes the server adds to those of the API.
+BUSY = "busy"
+TOO_LARGE = "too_large"
+INTERNAL = "internal"
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+# Responses are joined into writes of about this many bytes.
+_WRITE_CHUNK = 64 * 1024
+
+
+class HospitalServer:
+    """
+    Serves a ``HospitalAPI`` to local clients.
+
+    Usable as an async context manager that starts and closes it.
+
+    Attributes:
+        api (HospitalAPI): Operations being served.
+        host (str): Loopback address to bind.
+        port (int): Port to bind; 0 picks a free one (see ``address`` once started).
+        max_connections (int): Open connections beyond which new ones are refused.
+        max_line (int): Longest accepted request line in bytes.
+        idle_timeout (float | None): Seconds without a request before a connection is closed.
+    """
+
+    def __init__(self, api, host=DEFAULT_HOST, port=DEFAULT_PORT, max_connections=10_000,
+                 max_line=1 << 20, idle_timeout=300.0):
+        """
+        Initialize a server; nothing is bound until ``start``.
+
+        Args:
+            api (HospitalAPI): Operations to serve.
+            host (str): Loopback address or 'localhost'.
+            port (int): TCP port; 0 picks a free one.
+            max_connections (int): Limit on simultaneously open connections.
+            max_line (int): Limit on the size of one request line in bytes.
+            idle_timeout (float | None): Seconds before an idle connection is closed; None keeps it.
+
+        Raises:
+            ValueError: If host is not a loopback address or a limit is not positive.
+        """
+        if host != "localhost":
+            try:
+                loopback = ipaddress.ip_address(host).is_loopback
+            except ValueError:
+                loopback = False
+            if not loopback:
+                raise ValueError(f"The service has no authentication; bind it to a loopback address, not {host!r}.")
+        if max_connections <= 0 or max_line <= 0:
+            raise ValueError("max_connections and max_line must be positive.")
+        self.api = api
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.max_line = max_line
+        self.idle_timeout = idle_timeout
+        self._server = None
+        self._connections = set()
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return f"HospitalServer(host={self.host!r}, port={self.port}, connections={len(self._connections)})"
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        return False
+
+    @property
+    def address(self):
+        """tuple[str, int]: Host and port actually bound, once started."""
+        if self._server is None:
+            return self.host, self.port
+        return self._server.sockets[0].getsockname()[:2]
+
+    @property
+    def connections(self):
+        """int: Number of open connections."""
+        return len(self._connections)
+
+    async def start(self):
+        """Bind the listening socket and start accepting connections."""
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            lambda: _Connection(self), self.host, self.port, backlog=min(self.max_connections, 4096)
+        )
+
+    async def serve_forever(self):
+        """Start if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting connections and close the open ones."""
+        if self._server is None:
+            return
+        self._server.close()
+        for connection in list(self._connections):
+            connection.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    def handle(self, line):
+        """
+        Answer one request line.
+
+        Args:
+            line (bytes): The request, without its newline.
+
+        Returns:
+            bytes: The response line, including its newline.
+        """
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise ServiceError(BAD_REQUEST, "Request is not valid JSON.") from None
+            if isinstance(request, dict):
+                request_id = request.get("id")
+            if not isinstance(request, dict) or not isinstance(request.get("op"), str):
+                raise ServiceError(BAD_REQUEST, "Request must be an object with an 'op' string.")
+            result = self.api.call(request["op"], request.get("params"))
+            return _encode({"id": request_id, "ok": True, "result": result}).encode() + b"\n"
+        except ServiceError as e:
+            return _error(request_id, e.code, e.message)
+        except Exception as e:  # a bug must not take the connection down with it
+            return _error(request_id, INTERNAL, f"{type(e).__name__}: {e}")
+
+
+class _Connection(asyncio.Protocol):
+    """One client connection: splits requests into lines and writes responses back."""
+
+    def __init__(self, server):
+        self._server = server
+        self._transport = None
+        self._loop = None
+        self._buffer = bytearray()
+        self._paused = False
+        self._eof = False
+        self._timer = None
+        self._last_active = 0.0
+
+    def connection_made(self, transport):
+        self._transport = transport
+        self._loop = asyncio.get_running_loop()
+        server = self._server
+        if len(server._connections) >= server.max_connections:
+            transport.write(_error(None, BUSY, "Too many connections; try again later."))
+            transport.close()
+            return
+        server._connections.add(self)
+        if server.idle_timeout is not None:
+            self._last_active = self._loop.time()
+            self._timer = self._loop.call_later(server.idle_timeout, self._check_idle)
+
+    def data_received(self, data):
+        self._buffer += data
+        self._last_active = self._loop.time()
+        self._process()
+
+    def eof_received(self):
+        self._eof = True
+        # Keep the transport open while answers to buffered requests are pending.
+        return self._paused
+
+    def pause_writing(self):
+        # The client is not reading its responses: stop answering and stop reading.
+        self._paused = True
+        self._transport.pause_reading()
+
+    def resume_writing(self):
+        self._paused = False
+        if not self._eof:
+            self._transport.resume_reading()
+        self._process()
+
+    def connection_lost(self, exc):
+        self._server._connections.discard(self)
+        self._buffer.clear()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+
+    def _process(self):
+        """Answer complete request lines until the buffer runs dry or writing pauses."""
+        transport = self._transport
+        if transport.is_closing():
+            return
+        buffer = self._buffer
+        handle = self._server.handle
+        max_line = self._server.max_line
+        start = 0
+        responses = []
+        pending = 0
+        oversized = False
+        while not self._paused:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                break
+            if end - start > max_line:
+                oversized = True
+                break
+            if buffer[start:end].strip():
+                response = handle(buffer[start:end])
+            else:
+                response = None
+            start = end + 1
+            if response is not None:
+                responses.append(response)
+                pending += len(response)
+                if pending >= _WRITE_CHUNK:
+                    # May call pause_writing, which ends the loop.
+                    transport.write(b"".join(responses))
+                    responses = []
+                    pending = 0
+        if oversized:
+            responses.append(_error(None, TOO_LARGE, f"Request line exceeds {max_line} bytes."))
+        if responses:
+            transport.write(b"".join(responses))
+        del buffer[:start]
+        if oversized:
+            buffer.clear()
+            transport.close()
+            return
+        if self._paused:
+            return
+        if len(buffer) > max_line:
+            buffer.clear()
+            transport.write(_error(None, TOO_LARGE, f"Request line exceeds {max_line} bytes."))
+            transport.close()
+        elif self._eof:
+            transport.close()
+
+    def _check_idle(self):
+        remaining = self._last_active + self._server.idle_timeout - self._loop.time()
+        if remaining > 0:
+            self._timer = self._loop.call_later(remaining, self._check_idle)
+        else:
+            self._timer = None
+            self._transport.close()
+
+
+def _error(request_id, code, message):
+    return _encode({"id": request_id, "ok": False, "error": {"code": code, "message": message}}).encode() + b"\n"
+
+
+async def serve(api, host=DEFAULT_HOST, port=DEFAULT_PORT, **options):
+    """
+    Serve an API until cancelled.
+
+    Args:
+        api (HospitalAPI): Operations to serve.
+        host (str): Loopback address to bind.
+        port (int): TCP port.
+        **options: Further ``HospitalServer`` options.
+    """
+    async with HospitalServer(api, host, port, **options) as server:
+        await server.serve_forever()
@@ -0,0 +1,19 @@
+# storage/__init__.py
+
+from .bulk_import import ImportReport, import_people
+from .exporter import export_records
+from .journal import EventJournal
+from .snapshot import Snapshot, SnapshotError, write_snapshot
+from .sqlite_store import ConnectionPool, SQLiteStore
+
+__all__ = [
+    "ConnectionPool",
+    "EventJournal",
+    "ImportReport",
+    "Snapshot",
+    "SnapshotError",
+    "SQLiteStore",
+    "export_records",
+    "import_people",
+    "write_snapshot",
+]
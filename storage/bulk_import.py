@@ -0,0 +1,210 @@
+# storage/bulk_import.py
+"""
+Streaming bulk import of patients and staff from CSV or JSON Lines files.
+
+Every row describes one person::
+
+    kind           'patient' or 'staff'
+    department     name of the department the person joins
+    name           full name
+    date_of_birth  YYYY-MM-DD
+    medical_record initial record text (patients)
+    position       job title (staff)
+    schedule       optional weekly shifts, e.g. "Mon-Fri 08:00-16:00" (staff)
+    status         optional 'in' or 'out', default 'out'
+
+Rows are read lazily and handled ``batch_size`` at a time: a batch is
+validated against one reference date, grouped by department and added
+with ``Department.add_patients``/``add_staff_members``, so counters are
+updated once per batch and nothing is printed per row. Invalid rows are
+skipped and reported with their line number instead of aborting the run.
+"""
+import csv
+import json
+import os
+import time
+from datetime import date
+from itertools import islice
+
+from core.department import Department
+from models.patient import Patient
+from models.person import Person, Status
+from models.staff import Staff
+
+FORMATS = ("csv", "jsonl")
+REQUIRED_COLUMNS = ("kind", "department", "name", "date_of_birth")
+
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class ImportReport:
+    """
+    Outcome of a bulk import.
+
+    Attributes:
+        imported (int): Number of people added.
+        rejected (list[tuple[int, str]]): Line number and reason for every skipped row.
+        departments_created (list[str]): Names of departments created on the fly.
+        elapsed (float): Wall-clock duration in seconds.
+    """
+
+    def __init__(self):
+        """Initialize an empty report."""
+        self.imported = 0
+        self.rejected = []
+        self.departments_created = []
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        """
+        Import throughput over all rows read, valid or not.
+
+        Returns:
+            float: Rows handled per second.
+        """
+        rows = self.imported + len(self.rejected)
+        return rows / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        """Return a short human-readable summary."""
+        lines = [
+            f"Imported {self.imported} people, rejected {len(self.rejected)} "
+            f"in {self.elapsed:.2f}s ({self.rows_per_second:,.0f} rows/s)."
+        ]
+        if self.departments_created:
+            lines.append(f"Created departments: {', '.join(self.departments_created)}")
+        lines.extend(f"  line {line}: {reason}" for line, reason in self.rejected[:20])
+        if len(self.rejected) > 20:
+            lines.append(f"  ... and {len(self.rejected) - 20} more")
+        return "\n".join(lines)
+
+    def __repr__(self):
+        """Return a developer-friendly string for debugging."""
+        return (
+            f"ImportReport(imported={self.imported}, rejected={len(self.rejected)}, "
+            f"elapsed={self.elapsed:.3f})"
+        )
+
+
+def import_people(hospital, path, format=None, batch_size=5000, create_departments=True):
+    """
+    Import patients and staff from a CSV or JSON Lines file into ``hospital``.
+
+    Args:
+        hospital (Hospital): Hospital to import into.
+        path (str): File to read.
+        format (str | None): 'csv' or 'jsonl'; inferred from the extension if None.
+        batch_size (int): Rows validated and inserted together.
+        create_departments (bool): Create departments that do not exist yet;
+            otherwise rows naming an unknown department are rejected.
+
+    Returns:
+        ImportReport: Counts, rejected rows and throughput.
+
+    Raises:
+        ValueError: If the format is unknown, batch_size is not positive or a
+            CSV file lacks a required column.
+    """
+    if not isinstance(batch_size, int) or batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer.")
+    format = format or _EXTENSIONS.get(os.path.splitext(str(path))[1].lower())
+    if format not in FORMATS:
+        raise ValueError(f"Unknown import format for {path}; use one of {', '.join(FORMATS)}.")
+
+    report = ImportReport()
+    start = time.perf_counter()
+    with open(path, newline="", encoding="utf-8") as source:
+        rows = _csv_rows(source) if format == "csv" else _jsonl_rows(source)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            _import_batch(hospital, batch, date.today(), create_departments, report)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def _csv_rows(source):
+    """Yield (line number, row dict or error message) pairs from a CSV file."""
+    reader = csv.DictReader(source)
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"CSV file is missing column(s): {', '.join(missing)}")
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _jsonl_rows(source):
+    """Yield (line number, row dict or error message) pairs from a JSON Lines file."""
+    for line_num, line in enumerate(source, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield line_num, f"Invalid JSON: {exc.msg}"
+            continue
+        yield line_num, row if isinstance(row, dict) else "Row must be a JSON object"
+
+
+def _import_batch(hospital, batch, today, create_departments, report):
+    """Validate one batch, then add it per department in bulk."""
+    grouped = {}
+    for line_num, row in batch:
+        try:
+            if isinstance(row, str):
+                raise ValueError(row)
+            dept_name, member = _build_member(row, today)
+        except (ValueError, TypeError) as exc:
+            report.rejected.append((line_num, str(exc)))
+            continue
+        patients, staff = grouped.setdefault(dept_name, ([], []))
+        (patients if isinstance(member, Patient) else staff).append((line_num, member))
+
+    for dept_name, (patients, staff) in grouped.items():
+        dept = hospital.find_department(dept_name)
+        if dept is None:
+            if not create_departments:
+                reason = f"Department '{dept_name}' does not exist"
+                report.rejected.extend((line_num, reason) for line_num, _ in patients + staff)
+                continue
+            dept = Department(dept_name)
+            hospital.add_departments([dept])
+            report.departments_created.append(dept_name)
+        report.imported += dept.add_patients(member for _, member in patients)
+        report.imported += dept.add_staff_members(member for _, member in staff)
+
+
+def _build_member(row, today):
+    """Validate a row against ``today`` and return (department name, new Patient or Staff)."""
+    kind = _text(row, "kind").lower()
+    dept_name = _text(row, "department")
+    if not dept_name:
+        raise ValueError("Department cannot be empty")
+    name = _text(row, "name")
+    try:
+        dob = date.fromisoformat(_text(row, "date_of_birth"))
+    except ValueError:
+        raise ValueError("date_of_birth must be YYYY-MM-DD") from None
+    Person._validate(name, dob, today)
+    status = Status(_text(row, "status") or "out")
+
+    if kind == "patient":
+        record = _text(row, "medical_record")
+        if not record:
+            raise ValueError("Medical record cannot be empty")
+        return dept_name, Patient._restore(None, name, dob, status, _record=record)
+    if kind == "staff":
+        position = _text(row, "position")
+        if not position:
+            raise ValueError("Position cannot be empty")
+        schedule = _text(row, "schedule") or None
+        return dept_name, Staff._restore(None, name, dob, status, position=position, schedule=schedule)
+    raise ValueError(f"Unknown kind '{kind}'; expected 'patient' or 'staff'")
+
+
+def _text(row, field):
+    """Return a row field as stripped text; missing or null fields are ''."""
+    value = row.get(field)
+    return "" if value is None else str(value).strip()
@@ -0,0 +1,127 @@
+# storage/exporter.py
+"""
+Streaming export of patients' medical records to CSV or JSON Lines.
+
+Rows are produced by a generator that walks ``Hospital.departments`` and
+each department's patients one at a time, and are written out in chunks
+of ``chunk_size`` rows through a buffered (optionally gzip-compressed)
+file. Only the current chunk is held in memory, so memory use does not
+grow with the size of the hospital.
+
+Each row has the columns in ``COLUMNS``; a patient who belongs to several
+departments is exported once per department.
+"""
+import csv
+import gzip
+import io
+import json
+import os
+
+FORMATS = ("csv", "jsonl")
+COLUMNS = ("department", "person_id", "name", "date_of_birth", "status", "medical_record")
+
+_EXTENSIONS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def record_rows(hospital, departments=None, status=None):
+    """
+    Return a generator of one export row per patient and department.
+
+    Filters are checked immediately; rows are produced lazily.
+
+    Args:
+        hospital (Hospital): Hospital to export.
+        departments (iterable[str] | None): Department names to include; None for all.
+        status (str | None): Only patients with this status, 'in' or 'out'; None for all.
+
+    Returns:
+        iterator[tuple]: Values in ``COLUMNS`` order.
+
+    Raises:
+        ValueError: If status is not 'in', 'out' or None, or a department does not exist.
+    """
+    if status not in (None, "in", "out"):
+        raise ValueError("status must be 'in', 'out' or None.")
+    if departments is None:
+        selected = hospital.departments
+    else:
+        selected = []
+        for name in departments:
+            dept = hospital.find_department(name)
+            if dept is None:
+                raise ValueError(f"Department '{name}' does not exist.")
+            selected.append(dept)
+    return _rows(selected, status)
+
+
+def _rows(departments, status):
+    for dept in departments:
+        for patient in dept.patients:
+            if status is not None and patient.status != status:
+                continue
+            yield (
+                dept.name, patient.person_id, patient.name, patient.date_of_birth.isoformat(),
+                patient.status, patient.medical_record,
+            )
+
+
+def export_records(hospital, path, format=None, compress=None, departments=None, status=None,
+                   chunk_size=10_000):
+    """
+    Export patients' medical records to a file.
+
+    Args:
+        hospital (Hospital): Hospital to export.
+        path (str): Destination file.
+        format (str | None): 'csv' or 'jsonl'; inferred from the extension
+            (ignoring a trailing '.gz') if None.
+        compress (bool | None): Write gzip; None means only if path ends in '.gz'.
+        departments (iterable[str] | None): Department names to include; None for all.
+        status (str | None): Only patients with this status, 'in' or 'out'.
+        chunk_size (int): Rows formatted and written per write call.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ValueError: If the format is unknown, chunk_size is not positive or a
+            filter is invalid.
+    """
+    path = str(path)
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    stem, extension = os.path.splitext(path)
+    if compress is None:
+        compress = extension.lower() == ".gz"
+    if extension.lower() == ".gz":
+        extension = os.path.splitext(stem)[1]
+    format = format or _EXTENSIONS.get(extension.lower())
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format for {path}; use one of {', '.join(FORMATS)}.")
+
+    rows = record_rows(hospital, departments, status)
+    opener = gzip.open if compress else open
+    written = 0
+    with opener(path, "wt", encoding="utf-8", newline="") as out:
+        buffer = io.StringIO()
+        if format == "csv":
+            writer = csv.writer(buffer)
+            writer.writerow(COLUMNS)
+            emit = writer.writerow
+        else:
+            def emit(row):
+                buffer.write(json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False))
+                buffer.write("\n")
+        pending = 0
+        for row in rows:
+            emit(row)
+            pending += 1
+            if pending == chunk_size:
+                out.write(buffer.getvalue())
+                buffer.seek(0)
+                buffer.truncate()
+                written += pending
+                pending = 0
+        out.write(buffer.getvalue())
+        written += pending
+    return written
@@ -0,0 +1,279 @@
+# storage/journal.py
+import atexit
+import os
+import threading
+import time
+
+IN = "in"
+OUT = "out"
+
+
+class EventJournal:
+    """
+    Durable, append-only journal of check-in/check-out events.
+
+    Each event is one text line ``<seq> <timestamp> <person_id> <in|out>``.
+    Appends only queue the line in memory; a background writer thread
+    collects everything queued since its last write and commits it with a
+    single ``write`` + ``fsync`` (group commit). Many concurrent events
+    therefore share one fsync instead of paying for one each.
+
+    ``append(..., wait=True)`` blocks until the event is on disk; without
+    it an event becomes durable within ``flush_interval`` seconds.
+
+    On restart ``replay`` reads the journal back into the latest status of
+    every person, and ``apply`` checks those people in or out again.
+
+    Attributes:
+        path (str): Path of the journal file.
+    """
+
+    def __init__(self, path, batch_size=1024, flush_interval=0.005):
+        """
+        Open (and if needed create) a journal.
+
+        A torn final line left by a crash is cut off before appending.
+
+        Args:
+            path (str): Path of the journal file.
+            batch_size (int): Queue length that triggers a commit immediately.
+            flush_interval (float): Longest time, in seconds, an event waits
+                for other events to share its commit.
+
+        Raises:
+            ValueError: If batch_size or flush_interval is not positive.
+        """
+        if batch_size <= 0 or flush_interval <= 0:
+            raise ValueError("batch_size and flush_interval must be positive.")
+        self.path = str(path)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+
+        last_seq, valid_length = _scan(self.path)
+        self._file = open(self.path, "ab")
+        if self._file.tell() != valid_length:
+            self._file.truncate(valid_length)
+            self._file.seek(valid_length)
+
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._pending = []
+        self._appended = last_seq
+        self._durable = last_seq
+        self._waiters = 0
+        self._closing = False
+        self._error = None
+        self._writer = threading.Thread(target=self._run, name="event-journal", daemon=True)
+        self._writer.start()
+        # Commit whatever is still queued if the process exits without close().
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def append(self, person_id, active, timestamp=None, wait=False):
+        """
+        Queue a check-in or check-out event.
+
+        Args:
+            person_id (int): ID of the person whose status changed.
+            active (bool): True for check-in, False for check-out.
+            timestamp (float | None): Event time as a Unix timestamp; defaults to now.
+            wait (bool): Block until the event has been committed to disk.
+
+        Returns:
+            int: Sequence number of the event.
+
+        Raises:
+            RuntimeError: If the journal is closed or the writer has failed.
+        """
+        stamp = time.time() if timestamp is None else timestamp
+        with self._cond:
+            self._check()
+            self._appended += 1
+            seq = self._appended
+            self._pending.append(f"{seq} {stamp:.6f} {person_id} {IN if active else OUT}\n")
+            if len(self._pending) == 1 or len(self._pending) >= self._batch_size:
+                self._cond.notify_all()
+        if wait:
+            self.wait_durable(seq)
+        return seq
+
+    def wait_durable(self, seq, timeout=None):
+        """
+        Block until every event up to ``seq`` is on disk.
+
+        Args:
+            seq (int): Sequence number returned by ``append``.
+            timeout (float | None): Maximum time to wait, in seconds.
+
+        Returns:
+            bool: True if the event is durable, False on timeout.
+
+        Raises:
+            RuntimeError: If the writer has failed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._durable < seq:
+                    if self._error is not None:
+                        raise RuntimeError("Journal writer failed.") from self._error
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._waiters -= 1
+
+    def sync(self):
+        """Commit every queued event and wait until it is on disk."""
+        with self._cond:
+            seq = self._appended
+        self.wait_durable(seq)
+
+    def checkpoint(self):
+        """
+        Discard all journaled events.
+
+        Call after the full hospital state has been saved elsewhere (for
+        example with ``SQLiteStore.save``), so only later events remain to
+        be replayed. Events appended while the checkpoint runs may be
+        discarded with the rest, so call it when no check-ins are in flight.
+        """
+        self.sync()
+        with self._io_lock:
+            self._file.truncate(0)
+            self._file.seek(0)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Commit queued events, stop the writer thread and close the file."""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._writer.join()
+        self._file.close()
+        atexit.unregister(self.close)
+
+    def _check(self):
+        if self._error is not None:
+            raise RuntimeError("Journal writer failed.") from self._error
+        if self._closing:
+            raise RuntimeError("Journal is closed.")
+
+    def _run(self):
+        """Writer thread: commit queued events in groups, one fsync per group."""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # Give other writers a moment to join this commit unless the
+                # batch is already full or someone is blocked waiting on it.
+                if len(self._pending) < self._batch_size and not self._waiters and not self._closing:
+                    self._cond.wait(self._flush_interval)
+                batch, self._pending = self._pending, []
+                last = self._appended
+            try:
+                with self._io_lock:
+                    self._file.write("".join(batch).encode("ascii"))
+                    self._file.flush()
+                    os.fsync(self._file.fileno())
+            except OSError as exc:
+                with self._cond:
+                    self._error = exc
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._durable = last
+                self._cond.notify_all()
+
+    @staticmethod
+    def replay(path):
+        """
+        Read a journal back into each person's latest status.
+
+        Args:
+            path (str): Path of the journal file.
+
+        Returns:
+            dict[int, bool]: Latest state per person_id; True means checked in.
+        """
+        return {person_id: active for person_id, (active, _) in _latest(path).items()}
+
+    @classmethod
+    def apply(cls, path, hospital):
+        """
+        Restore check-in state in ``hospital`` from a journal.
+
+        Call before attaching a journal to the hospital, so the replayed
+        transitions are not journaled a second time. Department and
+        hospital counters are updated as for any other check-in/out, and
+        check-in history records the journaled time of each transition.
+
+        Args:
+            path (str): Path of the journal file.
+            hospital (Hospital): Hospital whose members are updated.
+
+        Returns:
+            int: Number of people whose status changed.
+        """
+        states = _latest(path)
+        groups = [members for dept in hospital.departments for members in (dept.patients, dept.staff)]
+        # person_id -> first group holding them; filled back to front so earlier groups win.
+        holders = {}
+        for members in reversed(groups):
+            holders.update(dict.fromkeys(members.ids(), members))
+        changed = 0
+        for person_id, (active, at) in states.items():
+            members = holders.get(person_id)
+            if members is None:
+                continue
+            member = members.get(person_id)
+            if member.is_active() != active:
+                if active:
+                    member.check_in(at)
+                else:
+                    member.check_out(at)
+                changed += 1
+        return changed
+
+
+def _latest(path):
+    """Return ``{person_id: (checked in, timestamp)}`` of each person's last journaled event."""
+    states = {}
+    if not os.path.exists(path):
+        return states
+    with open(path, "rb") as journal:
+        for line in journal:
+            if not line.endswith(b"\n"):
+                break
+            _, stamp, person_id, state = line.split()
+            states[int(person_id)] = (state == b"in", float(stamp))
+    return states
+
+
+def _scan(path):
+    """Return (last sequence number, length of the intact prefix) of a journal file."""
+    if not os.path.exists(path):
+        return 0, 0
+    last_seq = 0
+    length = 0
+    with open(path, "rb") as journal:
+        for line in journal:
+            if not line.endswith(b"\n"):
+                break
+            last_seq = int(line.split(b" ", 1)[0])
+            length += len(line)
+    return last_seq, length
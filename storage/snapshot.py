@@ -0,0 +1,471 @@
+# storage/snapshot.py
+"""
+Versioned binary snapshot of a whole Hospital, loaded through mmap.
+
+File layout (all integers little-endian)::
+
+    header           64 bytes, see HEADER
+    person records   per department: patients, then staff
+                       record header  RECORD (32 bytes)
+                       record entries ENTRY (20 bytes) x entry_count
+    offset tables    per department and member kind: uint64 file offset of
+                     every record, 8-byte aligned
+    department table DEPARTMENT (56 bytes) x department count
+    string index     uint64 x (string count + 1), offsets into string data
+    string data      UTF-8 bytes of every distinct string
+
+Every name, position, schedule and record text is stored once in the
+string table and referenced by index. Loading reads only the header and
+the department table; each department's patients or staff are decoded
+the first time they are accessed, straight from the mapped file.
+"""
+import mmap
+import os
+import struct
+from array import array
+from datetime import date, datetime
+
+from core.department import Department, MemberIndex
+from core.hospital import Hospital
+from core.occupancy import timestamp
+from core.patient_table import PatientTable
+from models.medical_record import EntryKind, MedicalRecord, RecordEntry
+from models.patient import Patient
+from models.person import Person, Status
+from models.staff import Staff
+
+MAGIC = b"HMSNAP\x00\x00"
+VERSION = 1
+
+HEADER = struct.Struct("<8sHHIIIQIIQQQ")
+DEPARTMENT = struct.Struct("<IIQQQQQQ")
+RECORD = struct.Struct("<qIiBBHIII")
+ENTRY = struct.Struct("<BxxxIId")
+
+NO_REF = 0xFFFFFFFF
+COLUMNAR = 1
+PATIENT = 0
+STAFF = 1
+
+_ENTRY_KINDS = list(EntryKind)
+_ENTRY_CODES = {kind: code for code, kind in enumerate(_ENTRY_KINDS)}
+
+
+class SnapshotError(ValueError):
+    """Raised when a file is not a readable hospital snapshot."""
+
+
+def write_snapshot(hospital, path):
+    """
+    Write ``hospital`` to a snapshot file.
+
+    The snapshot is written to a temporary file and moved into place, so a
+    snapshot that is currently memory-mapped can be overwritten safely.
+
+    Args:
+        hospital (Hospital): Hospital to write.
+        path (str): Destination file.
+
+    Returns:
+        int: Size of the snapshot in bytes.
+    """
+    path = str(path)
+    strings = _StringTable()
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(bytes(HEADER.size))
+        pos = HEADER.size
+        max_person_id = 0
+        departments = []
+
+        for dept in hospital.departments:
+            tables = []
+            for members, kind in ((dept.patients, PATIENT), (dept.staff, STAFF)):
+                offsets = array("Q")
+                for member in members:
+                    offsets.append(pos)
+                    data = _encode_person(member, kind, strings)
+                    out.write(data)
+                    pos += len(data)
+                    max_person_id = max(max_person_id, member.person_id)
+                tables.append(offsets)
+            departments.append((dept, tables))
+
+        table_positions = []
+        for dept, tables in departments:
+            positions = []
+            for offsets in tables:
+                pos = _pad(out, pos)
+                positions.append(pos)
+                out.write(offsets.tobytes())
+                pos += len(offsets) * 8
+            table_positions.append(positions)
+
+        pos = _pad(out, pos)
+        department_table = pos
+        for (dept, tables), (patient_table, staff_table) in zip(departments, table_positions):
+            flags = COLUMNAR if isinstance(dept.patients, PatientTable) else 0
+            patients, staff, checked_in_patients, checked_in_staff = dept._counts()
+            out.write(DEPARTMENT.pack(
+                strings.ref(dept.name), flags, patients, staff,
+                checked_in_patients, checked_in_staff, patient_table, staff_table,
+            ))
+            pos += DEPARTMENT.size
+
+        name_ref = strings.ref(hospital.name)
+        location_ref = strings.ref(hospital.location)
+        string_index = pos
+        index, data = strings.encode()
+        out.write(index.tobytes())
+        pos += len(index) * 8
+        string_data = pos
+        out.write(data)
+        pos += len(data)
+
+        out.seek(0)
+        out.write(HEADER.pack(
+            MAGIC, VERSION, 0, len(departments), len(index) - 1, 0, max_person_id,
+            name_ref, location_ref, department_table, string_index, string_data,
+        ))
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp_path, path)
+    return pos
+
+
+class Snapshot:
+    """
+    Read-only, memory-mapped hospital snapshot.
+
+    ``load`` rebuilds the Hospital and its departments from the header and
+    department table only; department and hospital counters come straight
+    from the file. Patients and staff are decoded per department on first
+    access, and the file stays mapped until ``close``.
+
+    Attributes:
+        path (str): Path of the snapshot file.
+    """
+
+    def __init__(self, path):
+        """
+        Map a snapshot file.
+
+        Args:
+            path (str): Path of the snapshot file.
+
+        Raises:
+            SnapshotError: If the file is not a snapshot or has an unsupported version.
+        """
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as exc:
+            self._file.close()
+            raise SnapshotError(f"{self.path} is empty.") from exc
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise SnapshotError(f"{self.path} is not a hospital snapshot.")
+        (magic, version, _, self._department_count, string_count, _, self._max_person_id,
+         self._name_ref, self._location_ref, self._department_table,
+         string_index, self._string_data) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise SnapshotError(f"{self.path} is not a hospital snapshot.")
+        if version != VERSION:
+            self.close()
+            raise SnapshotError(f"Unsupported snapshot version {version}.")
+        self._string_index = self._uint64s(string_index, string_count + 1)
+        self._strings = {}
+        self._people = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Release the mapping. Departments not yet accessed can no longer load."""
+        string_index = getattr(self, "_string_index", None)
+        if string_index is not None:
+            string_index.release()
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def load(self):
+        """
+        Rebuild the hospital with lazily loaded departments.
+
+        Returns:
+            Hospital: The hospital stored in the snapshot.
+        """
+        hospital = Hospital(self._string(self._name_ref), self._string(self._location_ref))
+        Person._reserve_ids(self._max_person_id)
+        # Check-in history of members stored as checked in starts here, as
+        # it would for a hospital loaded from SQLite now.
+        self._loaded_at = timestamp()
+        departments = []
+        for i in range(self._department_count):
+            (name_ref, flags, patients, staff, checked_in_patients, checked_in_staff,
+             patient_table, staff_table) = DEPARTMENT.unpack_from(
+                self._map, self._department_table + i * DEPARTMENT.size)
+            columnar = bool(flags & COLUMNAR)
+            dept = Department(self._string(name_ref), columnar=columnar)
+            patient_loader = self._loader(dept, patient_table, patients, PATIENT, columnar)
+            if columnar:
+                dept.patients = _LazyPatientTable(dept, patient_loader, patients)
+            else:
+                dept.patients = _LazyMemberIndex(patient_loader, patients)
+            dept.staff = _LazyMemberIndex(self._loader(dept, staff_table, staff, STAFF, False), staff)
+            dept._checked_in_patients = checked_in_patients
+            dept._checked_in_staff = checked_in_staff
+            departments.append(dept)
+        hospital.add_departments(departments)
+        return hospital
+
+    def _uint64s(self, start, count):
+        """Return a zero-copy uint64 view of ``count`` values at ``start``; release it after use."""
+        with memoryview(self._map) as whole:
+            return whole[start:start + count * 8].cast("Q")
+
+    def _string(self, ref):
+        if ref == NO_REF:
+            return None
+        text = self._strings.get(ref)
+        if text is None:
+            base = self._string_data
+            start, end = self._string_index[ref], self._string_index[ref + 1]
+            text = self._strings[ref] = self._map[base + start:base + end].decode("utf-8")
+        return text
+
+    def _loader(self, dept, table, count, kind, columnar):
+        """Return a callback that decodes one department's patients or staff into a container."""
+        def load(container):
+            if self._map.closed:
+                raise SnapshotError(f"Snapshot {self.path} was closed before {dept.name} was loaded.")
+            offsets = self._uint64s(table, count)
+            history = dept.patient_history if kind == PATIENT else dept.staff_history
+            drift = 0
+            for offset in offsets:
+                if columnar:
+                    person_id, active = self._decode_row(container, offset)
+                else:
+                    member, changed = self._decode_person(offset, kind)
+                    container._members[member.person_id] = member
+                    member._memberships += (dept,)
+                    drift += changed
+                    person_id, active = member.person_id, member.is_active()
+                if active:
+                    history.open(person_id, self._loaded_at)
+            offsets.release()
+            if drift:
+                # People shared with a department loaded earlier may have
+                # checked in or out since; this department was not told.
+                if kind == PATIENT:
+                    dept._checked_in_patients += drift
+                    dept._propagate(checked_in_patients=drift)
+                else:
+                    dept._checked_in_staff += drift
+                    dept._propagate(checked_in_staff=drift)
+        return load
+
+    def _decode_person(self, offset, kind):
+        """
+        Return the person stored at ``offset`` and how their status changed since the snapshot.
+
+        The change is +1 or -1 for a person already decoded for another
+        department who checked in or out since, otherwise 0.
+        """
+        (person_id, name_ref, dob, status, _, _, ref_a, ref_b, entry_count) = RECORD.unpack_from(self._map, offset)
+        person = self._people.get(person_id)
+        if person is not None:
+            return person, int(person.is_active()) - int(bool(status))
+        status = Status.IN if status else Status.OUT
+        if kind == PATIENT:
+            person = Patient._restore(
+                person_id, self._string(name_ref), date.fromordinal(dob), status,
+                record=self._decode_record(offset, ref_a, entry_count),
+            )
+        else:
+            person = Staff._restore(
+                person_id, self._string(name_ref), date.fromordinal(dob), status,
+                position=self._string(ref_a), schedule=self._string(ref_b),
+            )
+        self._people[person_id] = person
+        return person, 0
+
+    def _decode_row(self, table, offset):
+        """Append the patient stored at ``offset`` to a table; return their ID and whether they are checked in."""
+        (person_id, name_ref, dob, status, _, _, ref_a, _, entry_count) = RECORD.unpack_from(self._map, offset)
+        record = self._decode_record(offset, ref_a, entry_count)
+        text = record if isinstance(record, str) else record.entries(0, 1)[0].text
+        table.add_row(self._string(name_ref), date.fromordinal(dob), text, bool(status), person_id)
+        if not isinstance(record, str):
+            table._logs[person_id] = record
+        return person_id, bool(status)
+
+    def _decode_record(self, offset, text_ref, entry_count):
+        if not entry_count:
+            return self._string(text_ref)
+        entries = []
+        pos = offset + RECORD.size
+        for _ in range(entry_count):
+            code, text_ref, author_ref, stamp = ENTRY.unpack_from(self._map, pos)
+            timestamp = None if stamp != stamp else datetime.fromtimestamp(stamp)  # NaN: no timestamp
+            entries.append(RecordEntry(_ENTRY_KINDS[code], self._string(text_ref), timestamp,
+                                       self._string(author_ref)))
+            pos += ENTRY.size
+        return MedicalRecord.from_entries(entries)
+
+
+class _LazyMemberIndex(MemberIndex):
+    """MemberIndex whose members are decoded from a snapshot on first access."""
+
+    def __init__(self, loader, count):
+        super().__init__()
+        self._loader = loader
+        self._count = count
+
+    def _ensure(self):
+        loader = self._loader
+        if loader is not None:
+            self._loader = None
+            loader(self)
+
+    def __len__(self):
+        return self._count if self._loader is not None else len(self._members)
+
+    def __contains__(self, item):
+        self._ensure()
+        return super().__contains__(item)
+
+    def _snapshot(self):
+        self._ensure()
+        return super()._snapshot()
+
+    def add(self, member):
+        self._ensure()
+        super().add(member)
+
+    def get(self, person_id, default=None):
+        self._ensure()
+        return super().get(person_id, default)
+
+    def pop(self, person_id, default=None):
+        self._ensure()
+        return super().pop(person_id, default)
+
+    def ids(self):
+        self._ensure()
+        return super().ids()
+
+
+class _LazyPatientTable(PatientTable):
+    """PatientTable whose rows are decoded from a snapshot on first access."""
+
+    def __init__(self, department, loader, count):
+        super().__init__(department)
+        self._loader = loader
+        self._count = count
+
+    def _ensure(self):
+        loader = self._loader
+        if loader is not None:
+            self._loader = None
+            loader(self)
+
+    def __len__(self):
+        return self._count if self._loader is not None else len(self._row_of)
+
+    def __contains__(self, item):
+        self._ensure()
+        return super().__contains__(item)
+
+    def add_row(self, *args, **kwargs):
+        self._ensure()
+        return super().add_row(*args, **kwargs)
+
+    def get(self, person_id, default=None):
+        self._ensure()
+        return super().get(person_id, default)
+
+    def pop(self, person_id, default=None):
+        self._ensure()
+        return super().pop(person_id, default)
+
+    def ids(self):
+        self._ensure()
+        return super().ids()
+
+    def count_checked_in(self):
+        self._ensure()
+        return super().count_checked_in()
+
+    def dob_keys(self):
+        self._ensure()
+        return super().dob_keys()
+
+    def _live(self):
+        self._ensure()
+        return super()._live()
+
+
+class _StringTable:
+    """Interns strings while a snapshot is written."""
+
+    def __init__(self):
+        self._refs = {}
+
+    def ref(self, text):
+        if text is None:
+            return NO_REF
+        ref = self._refs.get(text)
+        if ref is None:
+            ref = self._refs[text] = len(self._refs)
+        return ref
+
+    def encode(self):
+        """Return (uint64 offset index with a trailing end offset, UTF-8 data)."""
+        index = array("Q")
+        data = bytearray()
+        for text in self._refs:
+            index.append(len(data))
+            data += text.encode("utf-8")
+        index.append(len(data))
+        return index, bytes(data)
+
+
+def _encode_person(member, kind, strings):
+    status = 1 if member.is_active() else 0
+    dob = member.date_of_birth.toordinal()
+    if kind == STAFF:
+        return RECORD.pack(
+            member.person_id, strings.ref(member.name), dob, status, kind, 0,
+            strings.ref(member.position), strings.ref(member.schedule and str(member.schedule)), 0,
+        )
+    record = member._record
+    if isinstance(record, str):
+        return RECORD.pack(
+            member.person_id, strings.ref(member.name), dob, status, kind, 0,
+            strings.ref(record), NO_REF, 0,
+        )
+    parts = [RECORD.pack(
+        member.person_id, strings.ref(member.name), dob, status, kind, 0,
+        NO_REF, NO_REF, len(record),
+    )]
+    for entry in record:
+        stamp = entry.timestamp.timestamp() if entry.timestamp else float("nan")
+        parts.append(ENTRY.pack(
+            _ENTRY_CODES[entry.kind], strings.ref(entry.text), strings.ref(entry.author), stamp,
+        ))
+    return b"".join(parts)
+
+
+def _pad(out, pos):
+    """Pad the output to an 8-byte boundary and return the new position."""
+    padding = -pos % 8
+    if padding:
+        out.write(bytes(padding))
+    return pos + padding
@@ -0,0 +1,337 @@
+# storage/sqlite_store.py
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from core.department import Department
+from core.hospital import Hospital
+from core.patient_table import PatientTable
+from models.medical_record import EntryKind, MedicalRecord, RecordEntry
+from models.patient import Patient
+from models.person import Person
+from models.staff import Staff
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hospital (
+    id       INTEGER PRIMARY KEY CHECK (id = 1),
+    name     TEXT NOT NULL,
+    location TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS department (
+    id       INTEGER PRIMARY KEY,
+    name     TEXT NOT NULL UNIQUE,
+    columnar INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS person (
+    person_id     INTEGER PRIMARY KEY,
+    kind          TEXT NOT NULL CHECK (kind IN ('patient', 'staff')),
+    name          TEXT NOT NULL,
+    date_of_birth TEXT NOT NULL,
+    status        TEXT NOT NULL CHECK (status IN ('in', 'out')),
+    position      TEXT,
+    schedule      TEXT
+);
+CREATE TABLE IF NOT EXISTS membership (
+    department_id INTEGER NOT NULL REFERENCES department (id) ON DELETE CASCADE,
+    person_id     INTEGER NOT NULL REFERENCES person (person_id) ON DELETE CASCADE,
+    seq           INTEGER NOT NULL,
+    PRIMARY KEY (department_id, person_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS record_entry (
+    person_id INTEGER NOT NULL REFERENCES person (person_id) ON DELETE CASCADE,
+    seq       INTEGER NOT NULL,
+    kind      TEXT NOT NULL,
+    text      TEXT NOT NULL,
+    timestamp TEXT,
+    author    TEXT,
+    PRIMARY KEY (person_id, seq)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS membership_by_department ON membership (department_id, seq);
+CREATE INDEX IF NOT EXISTS membership_by_person ON membership (person_id);
+CREATE INDEX IF NOT EXISTS person_by_name ON person (name);
+"""
+
+# Statements are constants so sqlite3's per-connection statement cache
+# prepares each one once and reuses it for every execute/executemany.
+_INSERT_HOSPITAL = "INSERT INTO hospital (id, name, location) VALUES (1, ?, ?)"
+_INSERT_DEPARTMENT = "INSERT INTO department (id, name, columnar) VALUES (?, ?, ?)"
+_INSERT_PERSON = (
+    "INSERT OR REPLACE INTO person (person_id, kind, name, date_of_birth, status, position, schedule) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_INSERT_MEMBERSHIP = "INSERT INTO membership (department_id, person_id, seq) VALUES (?, ?, ?)"
+_INSERT_ENTRY = (
+    "INSERT OR REPLACE INTO record_entry (person_id, seq, kind, text, timestamp, author) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SELECT_HOSPITAL = "SELECT name, location FROM hospital WHERE id = 1"
+_SELECT_DEPARTMENTS = "SELECT id, name, columnar FROM department ORDER BY id"
+_SELECT_PEOPLE = "SELECT person_id, kind, name, date_of_birth, status, position, schedule FROM person"
+_SELECT_MEMBERSHIPS = "SELECT department_id, person_id FROM membership ORDER BY department_id, seq"
+_SELECT_ENTRIES = "SELECT person_id, kind, text, timestamp, author FROM record_entry ORDER BY person_id, seq"
+_CLEAR = (
+    "DELETE FROM record_entry",
+    "DELETE FROM membership",
+    "DELETE FROM person",
+    "DELETE FROM department",
+    "DELETE FROM hospital",
+)
+
+BATCH_SIZE = 10_000
+
+
+class ConnectionPool:
+    """
+    Small pool of reusable SQLite connections to one database file.
+
+    Every connection is opened in WAL mode with foreign keys enabled, so
+    readers never block the writer. Connections are handed out through
+    ``connection()`` and returned to the pool afterwards.
+
+    Attributes:
+        path (str): Path of the database file.
+    """
+
+    def __init__(self, path, size=4):
+        """
+        Initialize the pool.
+
+        Args:
+            path (str): Path of the database file.
+            size (int): Maximum number of open connections.
+
+        Raises:
+            ValueError: If size is not a positive integer.
+        """
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError("Pool size must be a positive integer.")
+        self.path = str(path)
+        self._size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrow a connection for the duration of a ``with`` block.
+
+        Yields:
+            sqlite3.Connection: An open connection.
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed.")
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self._opened < self._size
+                if grow:
+                    self._opened += 1
+            conn = self._open() if grow else self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        """Close every idle connection and refuse further use."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class SQLiteStore:
+    """
+    Persist a Hospital, its departments, patients and staff to SQLite.
+
+    ``save`` writes the whole object graph in one transaction using
+    ``executemany`` batches; ``load`` rebuilds it directly from rows via
+    ``Person._restore``, so stored people are not re-validated through
+    their constructors and keep their IDs.
+
+    Attributes:
+        path (str): Path of the database file.
+    """
+
+    def __init__(self, path, pool_size=4):
+        """
+        Open (and if needed create) a hospital database.
+
+        Args:
+            path (str): Path of the database file.
+            pool_size (int): Number of pooled connections.
+        """
+        self.path = str(path)
+        self.pool = ConnectionPool(self.path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(_SCHEMA)
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),),
+            )
+            conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close all pooled connections."""
+        self.pool.close()
+
+    def save(self, hospital):
+        """
+        Replace the stored hospital with ``hospital``.
+
+        Args:
+            hospital (Hospital): Hospital to store.
+        """
+        with self.pool.connection() as conn:
+            with conn:
+                for statement in _CLEAR:
+                    conn.execute(statement)
+                conn.execute(_INSERT_HOSPITAL, (hospital.name, hospital.location))
+                conn.executemany(
+                    _INSERT_DEPARTMENT,
+                    (
+                        (dept_id, dept.name, int(isinstance(dept.patients, PatientTable)))
+                        for dept_id, dept in enumerate(hospital.departments, 1)
+                    ),
+                )
+                # A person may belong to several departments but is stored once.
+                people = {}
+                for dept in hospital.departments:
+                    for members in (dept.patients, dept.staff):
+                        for member in members:
+                            people.setdefault(member.person_id, member)
+                _executemany_batched(conn, _INSERT_PERSON, (_person_row(p) for p in people.values()))
+                _executemany_batched(conn, _INSERT_ENTRY, _entry_rows(people.values()))
+                _executemany_batched(conn, _INSERT_MEMBERSHIP, _membership_rows(hospital))
+
+    def load(self):
+        """
+        Rebuild the stored hospital.
+
+        Returns:
+            Hospital | None: The hospital, or None if nothing is stored yet.
+        """
+        with self.pool.connection() as conn:
+            row = conn.execute(_SELECT_HOSPITAL).fetchone()
+            if row is None:
+                return None
+            hospital = Hospital(*row)
+
+            records = {}
+            for person_id, kind, text, timestamp, author in conn.execute(_SELECT_ENTRIES):
+                stamp = datetime.fromisoformat(timestamp) if timestamp else None
+                records.setdefault(person_id, []).append(RecordEntry(EntryKind(kind), text, stamp, author))
+
+            people = {}
+            highest = 0
+            for person_id, kind, name, dob, status, position, schedule in conn.execute(_SELECT_PEOPLE):
+                dob = date.fromisoformat(dob)
+                if kind == "patient":
+                    people[person_id] = Patient._restore(
+                        person_id, name, dob, status, record=_record_from_entries(records.get(person_id))
+                    )
+                else:
+                    people[person_id] = Staff._restore(
+                        person_id, name, dob, status, position=position, schedule=schedule
+                    )
+                highest = max(highest, person_id)
+            Person._reserve_ids(highest)
+
+            departments = {}
+            for dept_id, name, columnar in conn.execute(_SELECT_DEPARTMENTS):
+                departments[dept_id] = (Department(name, columnar=bool(columnar)), [], [])
+            for dept_id, person_id in conn.execute(_SELECT_MEMBERSHIPS):
+                member = people[person_id]
+                departments[dept_id][1 if isinstance(member, Patient) else 2].append(member)
+
+        for dept, patients, staff in departments.values():
+            dept.add_patients(patients)
+            dept.add_staff_members(staff)
+        hospital.add_departments(dept for dept, _, _ in departments.values())
+        return hospital
+
+
+def _executemany_batched(conn, statement, rows):
+    """Run ``executemany`` in fixed-size batches to bound memory use."""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            conn.executemany(statement, batch)
+            batch.clear()
+    if batch:
+        conn.executemany(statement, batch)
+
+
+def _membership_rows(hospital):
+    for dept_id, dept in enumerate(hospital.departments, 1):
+        seq = 0
+        for members in (dept.patients, dept.staff):
+            for member in members:
+                yield (dept_id, member.person_id, seq)
+                seq += 1
+
+
+def _person_row(member):
+    if isinstance(member, Staff):
+        return (
+            member.person_id, "staff", member.name, member.date_of_birth.isoformat(),
+            member.status, member.position, member.schedule and str(member.schedule),
+        )
+    return (
+        member.person_id, "patient", member.name, member.date_of_birth.isoformat(),
+        member.status, None, None,
+    )
+
+
+def _entry_rows(people):
+    """Yield record_entry rows; a record never appended to is stored as one untimed note."""
+    for member in people:
+        if isinstance(member, Staff):
+            continue
+        record = member._record
+        if isinstance(record, str):
+            yield (member.person_id, 0, EntryKind.NOTE.value, record, None, None)
+            continue
+        for seq, entry in enumerate(record):
+            stamp = entry.timestamp.isoformat() if entry.timestamp else None
+            yield (member.person_id, seq, entry.kind.value, entry.text, stamp, entry.author)
+
+
+def _record_from_entries(entries):
+    """Turn stored entries back into a plain initial record or a MedicalRecord log."""
+    if not entries:
+        raise ValueError("Stored patient has no medical record.")
+    first = entries[0]
+    if len(entries) == 1 and first.timestamp is None:
+        return first.text
+    return MedicalRecord.from_entries(entries)